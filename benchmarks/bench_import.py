@@ -0,0 +1,79 @@
+"""Cold-start import cost of the hoshi_workflow entry points.
+
+Every entry point is imported in a fresh interpreter (several times; the best
+time is kept) and the heavy third-party packages it pulled in are recorded::
+
+    python benchmarks/bench_import.py
+    python benchmarks/bench_import.py --repeat 10 --output import_time.json
+
+The result is a JSON list with one record per entry point: ``entry``,
+``seconds`` (best wall time of the import statement) and ``loaded`` (which
+of numpy, pandas, matplotlib and scipy were imported).
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+
+# statement executed for every entry point
+ENTRY_POINTS = {
+    "hoshi_workflow": "import hoshi_workflow",
+    "hoshi_workflow.parse_name": "import hoshi_workflow; hoshi_workflow.parse_name",
+    "hoshi_workflow.file_name_convention": "import hoshi_workflow.file_name_convention",
+    "hoshi_workflow.initial_composition": "import hoshi_workflow.initial_composition",
+    "hoshi_workflow.make_initial_models": "import hoshi_workflow.make_initial_models",
+    "hoshi_workflow.hoshi_reader": "import hoshi_workflow.hoshi_reader",
+    "hoshi_workflow.hoshi_reader.fixed_width": "import hoshi_workflow.hoshi_reader.fixed_width",
+}
+HEAVY = ("numpy", "pandas", "matplotlib", "scipy")
+
+_CHILD = """
+import json, sys, time
+t0 = time.perf_counter()
+exec({stmt!r})
+elapsed = time.perf_counter() - t0
+print(json.dumps({{"seconds": elapsed, "loaded": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def measure(stmt: str, repeat: int = 5) -> dict:
+    """Import ``stmt`` in ``repeat`` fresh interpreters; returns the best run."""
+    best = None
+    for _ in range(repeat):
+        out = subprocess.run(
+            [sys.executable, "-c", _CHILD.format(stmt=stmt, heavy=HEAVY)],
+            check=True,
+            capture_output=True,
+            text=True,
+        )
+        run = json.loads(out.stdout.strip().splitlines()[-1])
+        if best is None or run["seconds"] < best["seconds"]:
+            best = run
+    return best
+
+
+def main(argv=None) -> list:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5, help="fresh interpreters per entry point")
+    parser.add_argument("--output", help="write the JSON results to this file")
+    parser.add_argument("entries", nargs="*", help=f"entry points to measure (default: {', '.join(ENTRY_POINTS)})")
+    args = parser.parse_args(argv)
+
+    results = []
+    for entry in args.entries or ENTRY_POINTS:
+        run = measure(ENTRY_POINTS.get(entry, f"import {entry}"), repeat=args.repeat)
+        results.append({"entry": entry, **run})
+        print(f"{entry:45s} {run['seconds'] * 1e3:8.1f} ms  {', '.join(run['loaded']) or '-'}", file=sys.stderr)
+
+    text = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    return results
+
+
+if __name__ == "__main__":
+    main()
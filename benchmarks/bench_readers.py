@@ -0,0 +1,159 @@
+"""Throughput and peak memory of the HOSHI readers on synthetic models.
+
+For every size a synthetic model is generated (see ``synthetic.py``) in a
+temporary directory and every reader case is timed (best of ``--repeat``)
+and run once more under ``tracemalloc`` for its peak memory::
+
+    python benchmarks/bench_readers.py --sizes small medium --output bench.json
+    python benchmarks/bench_readers.py --sizes medium --compare bench.json
+
+The JSON output holds the environment and one record per (case, size) with
+``rows``, ``seconds``, ``rows_per_s`` and ``peak_mb``. With ``--compare`` the
+results are checked against an earlier output and cases slower by more than
+``--tolerance`` are reported (exit status 1).
+"""
+
+from pathlib import Path
+import argparse
+import json
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import synthetic  # noqa: E402
+import hoshi_workflow.hoshi_reader as hr  # noqa: E402
+
+# model parameters of every size (see synthetic.make_model)
+SIZES = {
+    "small": {"rows": 20_000, "runs": 3, "restart": 100, "profiles": 4, "zones": 1024},
+    "medium": {"rows": 200_000, "runs": 5, "restart": 500, "profiles": 8, "zones": 4096},
+    "large": {"rows": 1_000_000, "runs": 10, "restart": 1000, "profiles": 8, "zones": 16384},
+}
+
+
+def _cases(root: Path, info: dict) -> dict:
+    """Return ``{case: (callable, rows processed)}`` for one model."""
+    stg = info["profiles"][len(info["profiles"]) // 2]
+    last_run = hr.HoshiHistory(root).list_runs()[-1]
+    last_rows = last_run["end_line"] - last_run["start_line"]
+    return {
+        "read_run": (lambda: hr.HoshiHistory(root).read_run(-1), last_rows),
+        "generate_combined": (lambda: hr.HoshiHistory(root)._generate_combined_data(), info["rows"]),
+        "combined_full": (lambda: hr.HoshiHistoryCombined(root), info["rows"]),
+        "combined_quick_data": (
+            lambda: hr.HoshiHistoryCombined(root, quick=True).data(["stg", "time", "Lsurf"]),
+            info["rows"],
+        ),
+        "profile_full": (lambda: hr.HoshiProfile(root, stg), info["zones"]),
+        "profile_quick_data": (lambda: hr.HoshiProfile(root, stg, quick=True).data("Mr"), info["zones"]),
+    }
+
+
+def _time(func, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def _peak_mb(func) -> float:
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1] / 1e6
+    finally:
+        tracemalloc.stop()
+
+
+def run(sizes: list, repeat: int = 3, seed: int = 0, cases: list | None = None) -> dict:
+    """Run the benchmark cases on every size; returns the JSON-ready results."""
+    results = []
+    for size in sizes:
+        params = SIZES[size]
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp) / "model"
+            t0 = time.perf_counter()
+            info = synthetic.make_model(root, seed=seed, **params)
+            # the combined readers load an existing summary_combined.txt
+            hr.HoshiHistoryCombined(root, save_flag=True)
+            print(f"[{size}] generated {info['lines']} summary lines in {time.perf_counter() - t0:.1f} s", file=sys.stderr)
+            for case, (func, rows) in _cases(root, info).items():
+                if cases and case not in cases:
+                    continue
+                seconds = _time(func, repeat)
+                record = {
+                    "case": case,
+                    "size": size,
+                    "rows": int(rows),
+                    "seconds": seconds,
+                    "rows_per_s": rows / seconds if seconds > 0 else float("inf"),
+                    "peak_mb": _peak_mb(func),
+                }
+                results.append(record)
+                print(
+                    f"[{size}] {case:22s} {seconds * 1e3:10.1f} ms {record['rows_per_s']:14.0f} rows/s {record['peak_mb']:9.1f} MB",
+                    file=sys.stderr,
+                )
+    return {
+        "environment": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+            "platform": platform.platform(),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "sizes": {size: SIZES[size] for size in sizes},
+        "results": results,
+    }
+
+
+def compare(current: dict, baseline: dict, tolerance: float = 0.2) -> list:
+    """Return the cases of ``current`` slower than ``baseline`` by more than ``tolerance``."""
+    before = {(r["case"], r["size"]): r for r in baseline["results"]}
+    slower = []
+    for r in current["results"]:
+        old = before.get((r["case"], r["size"]))
+        if old is not None and r["seconds"] > old["seconds"] * (1 + tolerance):
+            slower.append({**r, "baseline_seconds": old["seconds"], "ratio": r["seconds"] / old["seconds"]})
+    return slower
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", nargs="+", default=["small"], choices=list(SIZES))
+    parser.add_argument("--cases", nargs="+", help="cases to run (default: all)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the JSON results to this file")
+    parser.add_argument("--compare", help="earlier JSON output to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed slowdown (fraction)")
+    args = parser.parse_args(argv)
+
+    results = run(args.sizes, repeat=args.repeat, seed=args.seed, cases=args.cases)
+    text = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+    if args.compare:
+        with open(args.compare) as f:
+            slower = compare(results, json.load(f), args.tolerance)
+        for r in slower:
+            print(f"REGRESSION [{r['size']}] {r['case']}: {r['ratio']:.2f}x slower", file=sys.stderr)
+        return 1 if slower else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
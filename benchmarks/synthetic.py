@@ -0,0 +1,181 @@
+"""Deterministic synthetic HOSHI outputs for the reader benchmarks.
+
+Writes ``summary/summary.txt`` and ``writestr/strXXXXX.txt`` files in the
+layout HOSHI produces (Fortran ``I``/``ES`` fields, right-aligned ``N:name``
+header labels, ``#`` run headers and the profile metadata line), with the
+column sets of the ``fake_model`` example::
+
+    python benchmarks/synthetic.py /tmp/model --rows 200000 --runs 5 --profiles 20
+
+The same arguments and ``seed`` always produce byte-identical files.
+"""
+
+from pathlib import Path
+import argparse
+import io
+
+import numpy as np
+
+from hoshi_workflow.hoshi_reader.fixed_width import format_fixed_width
+
+# (name, width, decimals); decimals None for integer fields
+SUMMARY_COLUMNS = (
+    [("stg", 7, None), ("jcma", 7, None), ("nmlo", 7, None), ("ndv", 7, None)]
+    + [(name, 15, 6) for name in ("time", "dtime", "Mtot", "Etot", "Jtot")]
+    + [
+        (name, 12, 3)
+        for name in (
+            "dMdt", "frot", "dens_c", "temp_c", "Rsurf", "Lsurf", "Teff", "vrot", "[N/H]", "Gedd",
+            "gam_ave", "mach_max", "Brad", "fconf", "fbrak", "eta_B", "omgs[d-1]", "omgc[d-1]",
+            "Lnuc", "Lnu", "Lrad",
+        )
+    ]
+)
+PROFILE_COLUMNS = [("j", 6, None), ("cv", 6, None), ("EOS", 6, None)] + [
+    (name, 15, 6)
+    for name in (
+        "Mr", "dMr", "dMr*frq", "Radius", "Lum", "Vel", "Pres", "Dens", "Temp", "entropy", "gamma",
+        "sound", "eint", "Yi", "Ye", "X(D)", "X(p)", "X(He)", "X(C)", "X(N)", "X(O)", "X(Ne)",
+        "X(Mg)", "X(Si)", "X(Fe)", "ang.mom.", "ang.vel.", "epg", "epn", "epnu", "opacity", "n_ad",
+        "n_rad", "n_cv", "n_mu", "Dthm", "Dchem", "gam_rad", "Brad", "Bphi", "vcv", "lcv", "alpha", "Beq",
+    )
+]
+
+
+def header_line(columns: list) -> str:
+    """Return the ``#  1:j  2:cv ...`` header of ``columns`` (labels right-aligned)."""
+    labels = "".join(f"{i}:{name}".rjust(width) for i, (name, width, _) in enumerate(columns, 1))
+    return "#" + labels[1:]
+
+
+def format_rows(columns: list, block: np.ndarray) -> bytes:
+    """Format a ``(ncols, nrows)`` block as HOSHI fixed-width records."""
+    fmts = []
+    for k, (_, width, decimals) in enumerate(columns):
+        # format_fixed_width separates fields with one space: it is part of the field
+        width = width if k == 0 else width - 1
+        fmts.append(f"%{width}d" if decimals is None else f"%{width}.{decimals}e")
+    values = [block[k].astype(np.int64) if c[2] is None else block[k] for k, c in enumerate(columns)]
+    body = format_fixed_width(values, fmts)
+    if body is None:
+        # formats the column-wise writer does not take: let numpy write row by row
+        buf = io.BytesIO()
+        np.savetxt(buf, np.column_stack(values), fmt=fmts)
+        body = buf.getvalue()
+        if len(body) != block.shape[1] * (sum(c[1] for c in columns) + 1):
+            raise ValueError("a value does not fit its field")
+    # HOSHI writes Fortran ES fields with an upper-case exponent letter
+    return body.replace(b"e", b"E")
+
+
+def summary_block(rng: np.random.Generator, stg: np.ndarray, t0: float = 0.0) -> np.ndarray:
+    """Return plausible summary values for the stages ``stg``."""
+    n = stg.size
+    block = np.empty((len(SUMMARY_COLUMNS), n))
+    dtime = 1e9 * np.exp(stg / max(stg.max(), 1) * 10.0) * rng.uniform(0.5, 1.5, n)
+    block[0] = stg
+    block[1] = rng.integers(0, 50, n)
+    block[2] = 0
+    block[3] = 1024
+    block[4] = t0 + np.cumsum(dtime)
+    block[5] = dtime
+    block[6] = 20.0 - 1e-6 * stg
+    block[7] = -1.75e50 * rng.uniform(0.9, 1.1, n)
+    block[8] = 3.6e44 * rng.uniform(0.0, 1.0, n)
+    block[9:] = rng.lognormal(0.0, 3.0, (len(SUMMARY_COLUMNS) - 9, n)) * rng.choice([-1.0, 1.0], (len(SUMMARY_COLUMNS) - 9, n))
+    return block
+
+
+def write_summary(path: str | Path, rows: int = 10000, runs: int = 1, restart: int = 100, seed: int = 0) -> dict:
+    """Write a ``summary.txt`` of ``runs`` runs with ``rows`` stages in total.
+
+    Every run after the first restarts ``restart`` stages before the end of
+    the previous one (those stages are written again, as after an ``evol``
+    restart), so the file has ``rows + (runs - 1) * restart`` data lines.
+
+    Returns:
+        dict with ``rows`` (stages of the stitched history), ``lines`` (data
+        lines in the file) and ``runs``.
+    """
+    rng = np.random.default_rng(seed)
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    header = (header_line(SUMMARY_COLUMNS) + "\n").encode()
+    bounds = np.linspace(0, rows, runs + 1).astype(np.int64)
+    lines = 0
+    t0 = 0.0
+    with open(path, "wb") as f:
+        for r in range(runs):
+            start = max(bounds[r] - (restart if r else 0), 0) + 1
+            stg = np.arange(start, bounds[r + 1] + 1)
+            block = summary_block(rng, stg, t0)
+            t0 = block[4][-1]
+            f.write(header)
+            f.write(format_rows(SUMMARY_COLUMNS, block))
+            lines += stg.size
+    return {"rows": int(rows), "lines": lines, "runs": runs}
+
+
+def write_profile(path: str | Path, stg: int, zones: int = 1024, columns: int = len(PROFILE_COLUMNS), seed: int = 0) -> None:
+    """Write one ``strXXXXX.txt`` with ``zones`` zones and the first ``columns`` columns."""
+    rng = np.random.default_rng((seed, stg))
+    cols = PROFILE_COLUMNS[: max(columns, 4)]
+    j = np.arange(1, zones + 1)
+    block = np.empty((len(cols), zones))
+    block[0] = j
+    block[1] = (np.sin(j / zones * 12.0 + stg) > 0.3).astype(int)
+    block[2] = rng.integers(-1, 3, zones)
+    dm = rng.uniform(1e-6, 1e-2, zones)
+    block[3] = np.cumsum(dm)
+    block[4:] = rng.lognormal(0.0, 4.0, (len(cols) - 4, zones))
+    block[4] = dm
+    meta = f"# nstg={stg:7d}  ndv={zones:5d} time={1e10 * stg:13.4E} dtime={1e9:13.4E}\n"
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(meta.encode())
+        f.write(b"\n")
+        f.write((header_line(cols) + "\n").encode())
+        f.write(format_rows(cols, block))
+
+
+def make_model(
+    root: str | Path,
+    rows: int = 10000,
+    runs: int = 1,
+    restart: int = 100,
+    profiles: int = 1,
+    zones: int = 1024,
+    columns: int = len(PROFILE_COLUMNS),
+    seed: int = 0,
+) -> dict:
+    """Write a synthetic model directory (``summary``, ``writestr`` and ``evol``).
+
+    Profiles are written for ``profiles`` stages spread evenly over the history.
+    """
+    root = Path(root)
+    (root / "evol").mkdir(parents=True, exist_ok=True)
+    info = write_summary(root / "summary" / "summary.txt", rows=rows, runs=runs, restart=restart, seed=seed)
+    stages = np.unique(np.linspace(1, rows, profiles).astype(np.int64)) if profiles else np.array([], dtype=np.int64)
+    for stg in stages:
+        write_profile(root / "writestr" / f"str{stg:05d}.txt", int(stg), zones=zones, columns=columns, seed=seed)
+    info.update(profiles=stages.tolist(), zones=zones, columns=min(max(columns, 4), len(PROFILE_COLUMNS)))
+    return info
+
+
+def main(argv=None) -> dict:
+    parser = argparse.ArgumentParser(description="Write a synthetic HOSHI model directory.")
+    parser.add_argument("root")
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--runs", type=int, default=1)
+    parser.add_argument("--restart", type=int, default=100)
+    parser.add_argument("--profiles", type=int, default=1)
+    parser.add_argument("--zones", type=int, default=1024)
+    parser.add_argument("--columns", type=int, default=len(PROFILE_COLUMNS))
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    return make_model(**vars(args))
+
+
+if __name__ == "__main__":
+    print(main())
@@ -4,13 +4,12 @@ This module provides a thin aggregation layer so users can import
 submodules under the `hoshi_workflow` namespace while keeping the
 existing top-level packages available for backward compatibility.
 
-It intentionally performs safe imports and avoids hard failures at
-import time if optional subpackages are missing.
+Subpackages are imported lazily (PEP 562 module ``__getattr__``) on first
+attribute access, so ``import hoshi_workflow`` stays cheap and a job that
+only needs ``parse_name`` does not pay for pandas or matplotlib.
 """
 from importlib import import_module
 
-__all__ = []
-
 _subpackages = [
     "file_name_convention",
     "hoshi_reader",
@@ -18,26 +17,37 @@ _subpackages = [
     "make_initial_models",
 ]
 
-for _mod in _subpackages:
-    try:
-        # Prefer importing as a submodule of this package, fall back to top-level.
-        try:
-            mod = import_module(f"hoshi_workflow.{_mod}")
-        except Exception:
-            mod = import_module(_mod)
-
-        globals()[_mod] = mod
-        __all__.append(_mod)
-    except Exception:
-        # ignore import errors here to keep import-time robust
-        pass
-
-# Provide a few convenient re-exports for common APIs when available.
-try:
-    _fnc = globals().get("file_name_convention")
-    if _fnc is not None:
-        generate_name = _fnc.generate_name
-        parse_name = _fnc.parse_name
-        __all__.extend(["generate_name", "parse_name"])
-except Exception:
-    pass
+# convenient re-exports of common APIs: name -> subpackage
+_reexports = {
+    "generate_name": "file_name_convention",
+    "parse_name": "file_name_convention",
+}
+
+__all__ = [
+    "file_name_convention",
+    "generate_name",
+    "hoshi_reader",
+    "initial_composition",
+    "make_initial_models",
+    "parse_name",
+]
+
+
+def _import_subpackage(name: str):
+    # errors raised while importing the subpackage (e.g. a missing dependency) propagate as is
+    return import_module(f"{__name__}.{name}")
+
+
+def __getattr__(name: str):
+    if name in _subpackages:
+        mod = _import_subpackage(name)
+    elif name in _reexports:
+        mod = getattr(_import_subpackage(_reexports[name]), name)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = mod
+    return mod
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -12,21 +12,54 @@ from .hoshi_reader import (
     HoshiHistory,
     HoshiHistoryCombined,
     HoshiProfile,
+    stitch_runs,
     # some search functions
     find_nearest,
     find_all_within,
     find_first_greater,
     find_first_less,
-
+    find_nearest_rows,
+    find_first_greater_rows,
+    find_first_less_rows,
 )  # noqa: F401
+from .cache import SidecarCache  # noqa: F401
+from .catalog import ProfileCatalog  # noqa: F401
+from .series import HoshiProfileSeries, iter_profiles  # noqa: F401
+from .kippenhahn import KippenhahnRaster, kippenhahn  # noqa: F401
+from .convection import ConvectiveZones, run_length_intervals  # noqa: F401
+from .lookup import ModelIndex  # noqa: F401
+from .pack import ProfilePack, pack_writestr  # noqa: F401
+from .compression import benchmark_codecs  # noqa: F401
+from .instrument import InstrumentReport, environment_report, instrument  # noqa: F401
+from .schema import SchemaRegistry  # noqa: F401
 
 __all__ = [
     "HoshiModel",
     "HoshiHistory",
     "HoshiHistoryCombined",
     "HoshiProfile",
+    "HoshiProfileSeries",
+    "InstrumentReport",
+    "ConvectiveZones",
+    "KippenhahnRaster",
+    "ModelIndex",
+    "ProfileCatalog",
+    "ProfilePack",
+    "SchemaRegistry",
+    "SidecarCache",
+    "stitch_runs",
+    "iter_profiles",
+    "kippenhahn",
+    "pack_writestr",
+    "benchmark_codecs",
+    "environment_report",
+    "instrument",
+    "run_length_intervals",
     "find_nearest",
     "find_all_within",
     "find_first_greater",
     "find_first_less",
+    "find_nearest_rows",
+    "find_first_greater_rows",
+    "find_first_less_rows",
 ]
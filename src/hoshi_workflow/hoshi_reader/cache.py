@@ -0,0 +1,303 @@
+"""On-disk columnar cache of decoded HOSHI text files.
+
+Parsing a large ``summary_combined.txt`` or a writestr ``strXXXXX.txt`` file
+costs far more than reading the same numbers back in binary form. A
+``SidecarCache`` stores the decoded ``(ncols, nrows)`` float block of a file
+as a ``.npy`` array plus a small JSON description, and later loads it with
+``np.load(mmap_mode="c")`` so only the columns actually used are paged in.
+
+Entries are keyed on the resolved source path, its size and modification
+time and the parser version, so an edited or regenerated source file is
+never served from a stale entry.
+
+Location:
+    By default entries live in a ``.hoshi_cache`` directory next to the source
+    file. For read-only (shared) model trees pass an explicit directory, or set
+    the ``HOSHI_CACHE_DIR`` environment variable; entries are then named after a
+    hash of the source path. If the directory next to the source is not
+    writable the user cache directory (``$XDG_CACHE_HOME/hoshi_workflow``) is
+    used instead.
+
+Eviction:
+    With ``max_bytes`` set (or ``HOSHI_CACHE_MAX_BYTES``), the least recently
+    used entries of a cache directory are removed after each store until the
+    directory fits in the budget. Only entries whose metadata carries the
+    cache's format marker are counted and removed, so other files in a shared
+    directory are left alone.
+"""
+
+from pathlib import Path
+import hashlib
+import json
+import logging
+import os
+import tempfile
+
+import numpy as np
+
+from .fixed_width import PARSER_VERSION
+
+SIDECAR_DIRNAME = ".hoshi_cache"
+# marker of the metadata files written by SidecarCache; eviction only touches these
+CACHE_FORMAT = "hoshi_workflow.SidecarCache"
+
+
+def user_cache_dir() -> Path:
+    """Return the per-user cache directory used for read-only model trees."""
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "hoshi_workflow"
+
+
+class SidecarCache:
+    """Store and memory-map decoded float blocks of HOSHI text files.
+
+    Args:
+        root: cache directory shared by all sources. ``None`` keeps entries in a
+            ``.hoshi_cache`` directory next to each source file (or in
+            ``HOSHI_CACHE_DIR`` when that environment variable is set).
+        max_bytes: total size budget of a cache directory; ``None`` disables
+            eviction (or uses ``HOSHI_CACHE_MAX_BYTES`` when set).
+    """
+
+    def __init__(self, root: str | Path | None = None, max_bytes: int | None = None):
+        if root is None and os.environ.get("HOSHI_CACHE_DIR"):
+            root = os.environ["HOSHI_CACHE_DIR"]
+        if max_bytes is None and os.environ.get("HOSHI_CACHE_MAX_BYTES"):
+            max_bytes = int(os.environ["HOSHI_CACHE_MAX_BYTES"])
+        self.root = Path(root).expanduser() if root is not None else None
+        self.max_bytes = max_bytes
+
+    def __repr__(self) -> str:
+        return f"SidecarCache(root={self.root!r}, max_bytes={self.max_bytes!r})"
+
+    def _entry_dir(self, source: Path) -> Path:
+        if self.root is not None:
+            return self.root
+        sidecar = source.parent / SIDECAR_DIRNAME
+        if os.access(source.parent, os.W_OK) or sidecar.is_dir():
+            return sidecar
+        return user_cache_dir()
+
+    def _entry_stem(self, source: Path, tag: str, shared: bool) -> str:
+        stem = source.name + (f".{tag}" if tag else "")
+        if shared:
+            digest = hashlib.sha1(str(source).encode()).hexdigest()[:16]
+            stem = f"{digest}-{stem}"
+        return stem
+
+    def entry_paths(self, source: str | Path, tag: str = "") -> tuple[Path, Path]:
+        """Return the ``(array, metadata)`` paths of the entry for ``source``."""
+        source = Path(source).resolve()
+        directory = self._entry_dir(source)
+        shared = directory != source.parent / SIDECAR_DIRNAME
+        stem = self._entry_stem(source, tag, shared)
+        return directory / f"{stem}.npy", directory / f"{stem}.json"
+
+    @staticmethod
+    def _key(source: Path) -> dict:
+        st = source.stat()
+        return {
+            "source": str(source),
+            "size": st.st_size,
+            "mtime_ns": st.st_mtime_ns,
+            "parser_version": PARSER_VERSION,
+        }
+
+    def load(self, source: str | Path, tag: str = "", mmap: bool = True):
+        """Return ``(names, block)`` for ``source`` or None on a miss.
+
+        ``block`` is the ``(ncols, nrows)`` float array. With ``mmap`` it is a
+        copy-on-write memory map: pages are read lazily and modifications stay
+        in memory, never reaching the cache file.
+        """
+        source = Path(source).resolve()
+        array_path, meta_path = self.entry_paths(source, tag)
+        try:
+            with open(meta_path, "r") as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if meta.get("format") != CACHE_FORMAT or meta.get("key") != self._key(source):
+            logging.debug(f"Cache entry {meta_path} is stale.")
+            return None
+        try:
+            block = np.load(array_path, mmap_mode="c" if mmap else None)
+        except (OSError, ValueError) as exc:
+            logging.debug(f"Could not load cache entry {array_path}: {exc}")
+            return None
+        if block.shape != tuple(meta["shape"]):
+            return None
+        try:
+            # mark the entry as recently used for the eviction policy
+            os.utime(meta_path)
+        except OSError:
+            pass
+        return meta["names"], block
+
+    def store(self, source: str | Path, names: list, block: np.ndarray, tag: str = "") -> Path | None:
+        """Write the decoded ``block`` of ``source``; returns the array path.
+
+        Failures (for example a read-only location) are logged and ignored, as
+        the cache is only an accelerator.
+        """
+        source = Path(source).resolve()
+        array_path, meta_path = self.entry_paths(source, tag)
+        block = np.ascontiguousarray(block, dtype=np.float64)
+        meta = {
+            "format": CACHE_FORMAT,
+            "key": self._key(source),
+            "array": array_path.name,
+            "names": list(names),
+            "shape": list(block.shape),
+        }
+        try:
+            array_path.parent.mkdir(parents=True, exist_ok=True)
+            # write to temporary files then atomically replace; the metadata is
+            # written last so a half-written entry is never considered valid
+            with tempfile.NamedTemporaryFile(dir=array_path.parent, suffix=".npy", delete=False) as tmp:
+                np.save(tmp, block)
+            os.chmod(tmp.name, 0o644)
+            os.replace(tmp.name, array_path)
+            with tempfile.NamedTemporaryFile("w", dir=array_path.parent, suffix=".json", delete=False) as tmp:
+                json.dump(meta, tmp)
+            os.chmod(tmp.name, 0o644)
+            os.replace(tmp.name, meta_path)
+        except OSError as exc:
+            logging.warning(f"Could not write cache entry for {source}: {exc}")
+            return None
+        logging.debug(f"Cached {source} at {array_path}")
+        if self.max_bytes is not None:
+            self.evict(array_path.parent)
+        return array_path
+
+    def store_arrays(self, source: str | Path, arrays: dict, tag: str) -> Path | None:
+        """Write several named arrays derived from ``source`` as one ``.npz`` entry.
+
+        Used for results computed from a file (and its tag-encoded parameters)
+        rather than a decoded table; the entry is keyed like ``store``.
+        """
+        source = Path(source).resolve()
+        npy_path, meta_path = self.entry_paths(source, tag)
+        array_path = npy_path.with_suffix(".npz")
+        try:
+            array_path.parent.mkdir(parents=True, exist_ok=True)
+            with tempfile.NamedTemporaryFile(dir=array_path.parent, suffix=".npz", delete=False) as tmp:
+                np.savez(tmp, **arrays)
+            os.chmod(tmp.name, 0o644)
+            os.replace(tmp.name, array_path)
+            with tempfile.NamedTemporaryFile("w", dir=array_path.parent, suffix=".json", delete=False) as tmp:
+                meta = {"format": CACHE_FORMAT, "key": self._key(source), "array": array_path.name, "names": sorted(arrays)}
+                json.dump(meta, tmp)
+            os.chmod(tmp.name, 0o644)
+            os.replace(tmp.name, meta_path)
+        except OSError as exc:
+            logging.warning(f"Could not write cache entry for {source}: {exc}")
+            return None
+        if self.max_bytes is not None:
+            self.evict(array_path.parent)
+        return array_path
+
+    def load_arrays(self, source: str | Path, tag: str) -> dict | None:
+        """Return the arrays stored by ``store_arrays`` or None on a miss."""
+        source = Path(source).resolve()
+        npy_path, meta_path = self.entry_paths(source, tag)
+        try:
+            with open(meta_path, "r") as f:
+                meta = json.load(f)
+            if meta.get("format") != CACHE_FORMAT or meta.get("key") != self._key(source):
+                return None
+            with np.load(npy_path.with_suffix(".npz")) as data:
+                arrays = {name: data[name] for name in data.files}
+        except (OSError, ValueError):
+            return None
+        try:
+            os.utime(meta_path)
+        except OSError:
+            pass
+        return arrays
+
+    @staticmethod
+    def _owned_array(meta_path: Path) -> Path | None:
+        """Return the array file of a cache entry, or None if ``meta_path`` is not one.
+
+        Only metadata written by ``store``/``store_arrays`` (with the cache
+        format marker, a parser-versioned key and the array name) counts, so
+        other files in a shared directory are never evicted.
+        """
+        try:
+            with open(meta_path, "r") as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(meta, dict) or meta.get("format") != CACHE_FORMAT:
+            return None
+        key, array = meta.get("key"), meta.get("array")
+        if not isinstance(key, dict) or "parser_version" not in key or not isinstance(array, str):
+            return None
+        array_path = meta_path.with_name(array)
+        if array_path.suffix not in (".npy", ".npz") or array_path.stem != meta_path.stem:
+            return None
+        return array_path
+
+    @classmethod
+    def _entries(cls, directory: Path) -> list:
+        entries = []
+        for meta_path in directory.glob("*.json"):
+            array_path = cls._owned_array(meta_path)
+            if array_path is None:
+                continue
+            try:
+                st = meta_path.stat()
+                size = st.st_size + (array_path.stat().st_size if array_path.exists() else 0)
+            except OSError:
+                continue
+            entries.append((st.st_mtime_ns, size, meta_path, [array_path]))
+        return entries
+
+    def evict(self, directory: str | Path | None = None, max_bytes: int | None = None) -> int:
+        """Remove least recently used entries until ``directory`` fits the budget.
+
+        Only entries written by the cache are counted and removed. Returns the
+        number of bytes freed.
+        """
+        directory = Path(directory) if directory is not None else self.root
+        max_bytes = self.max_bytes if max_bytes is None else max_bytes
+        if directory is None or max_bytes is None or not directory.is_dir():
+            return 0
+        entries = sorted(self._entries(directory))
+        total = sum(size for _, size, _, _ in entries)
+        freed = 0
+        for _, size, meta_path, data_paths in entries:
+            if total <= max_bytes:
+                break
+            for path in [meta_path] + data_paths:
+                try:
+                    path.unlink()
+                except FileNotFoundError:
+                    pass
+            total -= size
+            freed += size
+        if freed:
+            logging.info(f"Evicted {freed} bytes from cache {directory}")
+        return freed
+
+    def clear(self, directory: str | Path | None = None) -> None:
+        """Remove every entry of ``directory`` (default: ``root``)."""
+        self.evict(directory, max_bytes=0)
+
+
+def resolve_cache(cache) -> SidecarCache | None:
+    """Turn the ``cache=`` argument of the readers into a ``SidecarCache``.
+
+    ``False``/``None`` disables caching, ``True`` uses the default location,
+    a path selects a shared cache directory and a ``SidecarCache`` is used as is.
+    """
+    if cache is None or cache is False:
+        return None
+    if cache is True:
+        return SidecarCache()
+    if isinstance(cache, SidecarCache):
+        return cache
+    if isinstance(cache, (str, os.PathLike)):
+        return SidecarCache(cache)
+    raise TypeError(f"cache must be a bool, a path or a SidecarCache, not {type(cache).__name__}")
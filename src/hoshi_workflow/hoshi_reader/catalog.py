@@ -0,0 +1,252 @@
+"""Header-only index of the writestr profiles of a model.
+
+Every ``writestr/strXXXXX.txt`` starts with a metadata line::
+
+    # nstg=   2468  ndv= 1024 time=   2.8321E+14 dtime=   1.0351E-01
+
+followed by a blank line and the column header. ``ProfileCatalog`` reads only
+these first lines of every file (in parallel) and keeps stage, age, time step,
+number of zones and column schema as arrays sorted by stage, so the profile
+closest to an age or all profiles in a stage range can be found without
+opening the profiles themselves.
+
+The catalog is saved as a small JSON file (``.profile_catalog.json`` in the
+writestr directory); rebuilding it only reads the headers of files that were
+added or changed since. Profiles packed into a ``writestr.pack`` container
+(see ``hoshi_workflow.hoshi_reader.pack``) are listed from its index.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import json
+import logging
+import os
+import re
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from .compression import open_source, source_name, variant_rank
+from .fixed_width import header_spans
+from .hoshi_reader import HoshiModel, find_nearest
+
+CATALOG_NAME = ".profile_catalog.json"
+CATALOG_VERSION = 1
+
+_PROFILE_NAME = re.compile(r"str(\d+)\.txt(?:\.gz|\.xz|\.bz2)?")
+_META_FIELD = re.compile(r"(\w+)=\s*(\S+)")
+
+
+def read_profile_header(path: str | Path, n_lines: int = 3, nbytes: int = 4096) -> dict:
+    """Read the metadata line and column names of one profile.
+
+    Only the first ``nbytes`` bytes are read (more if the header lines are
+    longer).
+
+    Returns:
+        dict with ``stg``, ``ndv``, ``time``, ``dtime`` (NaN/-1 when missing)
+        and ``columns`` (list of column names).
+    """
+    with open_source(path, "rb") as f:
+        head = f.read(nbytes)
+        while head.count(b"\n") < n_lines:
+            more = f.read(nbytes)
+            if not more:
+                break
+            head += more
+    lines = head.decode(errors="replace").splitlines()
+    meta = dict(_META_FIELD.findall(lines[0])) if lines else {}
+    header = lines[n_lines - 1] if len(lines) >= n_lines else ""
+    columns = header_spans(header)[0]
+
+    def number(key, cast, default):
+        try:
+            return cast(float(meta[key].replace("D", "E")))
+        except (KeyError, ValueError):
+            return default
+
+    return {
+        "stg": number("nstg", int, -1),
+        "ndv": number("ndv", int, -1),
+        "time": number("time", float, np.nan),
+        "dtime": number("dtime", float, np.nan),
+        "columns": columns,
+    }
+
+
+class ProfileCatalog:
+    """Sorted index of the ``strXXXXX.txt`` profiles of a model.
+
+    Args:
+        model: a ``HoshiModel`` (or subclass), a model directory or a writestr
+            directory.
+        workers: threads used to read the headers.
+        persist: load and save the index file next to the profiles.
+
+    Attributes:
+        stg, time, dtime, ndv: arrays sorted by stage.
+        schema: per-profile index into ``schemas`` (list of column name lists).
+        names: file names of the profiles.
+        sizes, mtime_ns: size and modification time of every profile file
+            (as recorded in the container for packed profiles).
+    """
+
+    def __init__(self, model, workers: int | None = None, persist: bool = True):
+        if isinstance(model, HoshiModel):
+            writestr_dir = model.writestr_dir
+        else:
+            p = Path(model)
+            writestr_dir = p if p.name == "writestr" else p / "writestr"
+        self.writestr_dir = writestr_dir
+        self.index_path = writestr_dir / CATALOG_NAME
+        self.persist = persist
+        self.refresh(workers=workers)
+
+    def __len__(self) -> int:
+        return self.stg.size
+
+    def __repr__(self) -> str:
+        return f"ProfileCatalog({str(self.writestr_dir)!r}, {len(self)} profiles)"
+
+    def _load_index(self) -> dict:
+        try:
+            with open(self.index_path, "r") as f:
+                saved = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if saved.get("version") != CATALOG_VERSION:
+            return {}
+        return {entry["name"]: entry for entry in saved.get("entries", [])}
+
+    def _save_index(self, entries: list) -> None:
+        try:
+            with tempfile.NamedTemporaryFile("w", dir=self.writestr_dir, suffix=".json", delete=False) as tmp:
+                json.dump({"version": CATALOG_VERSION, "entries": entries}, tmp)
+            os.chmod(tmp.name, 0o644)
+            os.replace(tmp.name, self.index_path)
+        except OSError as exc:
+            logging.warning(f"Could not write profile catalog {self.index_path}: {exc}")
+
+    def refresh(self, workers: int | None = None) -> int:
+        """Rescan the writestr directory; returns the number of headers read."""
+        from .pack import find_pack
+
+        files, variants = {}, {}
+        if self.writestr_dir.is_dir():
+            for entry in os.scandir(self.writestr_dir):
+                if _PROFILE_NAME.fullmatch(entry.name):
+                    # one file per profile: the plain file, else the first codec (as find_variant)
+                    key = source_name(entry.name)
+                    kept = variants.get(key)
+                    if kept is not None and variant_rank(kept) <= variant_rank(entry.name):
+                        continue
+                    files.pop(kept, None)
+                    variants[key] = entry.name
+                    st = entry.stat()
+                    files[entry.name] = (st.st_size, st.st_mtime_ns)
+        pack = find_pack(self.writestr_dir)
+        if not self.writestr_dir.is_dir() and pack is None:
+            logging.info("No writestr directory found")
+
+        saved = self._load_index() if self.persist else {}
+        entries, todo = [], []
+        for name, (size, mtime_ns) in files.items():
+            entry = saved.get(name)
+            if entry is not None and entry["size"] == size and entry["mtime_ns"] == mtime_ns:
+                entries.append(entry)
+            else:
+                todo.append(name)
+
+        def scan(name):
+            entry = read_profile_header(self.writestr_dir / name)
+            size, mtime_ns = files[name]
+            entry.update(name=name, size=size, mtime_ns=mtime_ns)
+            if entry["stg"] < 0:
+                # fall back to the stage in the file name
+                entry["stg"] = int(_PROFILE_NAME.fullmatch(name).group(1))
+            return entry
+
+        if todo:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                entries.extend(pool.map(scan, todo))
+            logging.info(f"Read the headers of {len(todo)} profiles in {self.writestr_dir}.")
+        if self.persist and (todo or len(saved) != len(entries)) and self.writestr_dir.is_dir():
+            self._save_index(entries)
+        if pack is not None:
+            # packed profiles whose text file is gone or unchanged
+            served = {source_name(e["name"]) for e in entries if pack.serves(self.writestr_dir / e["name"])}
+            on_disk = {source_name(name) for name in files}
+            entries = [e for e in entries if source_name(e["name"]) not in served]
+            entries.extend(e for e in pack.entries if e["name"] not in on_disk or e["name"] in served)
+        self._set_entries(entries)
+        return len(todo)
+
+    def _set_entries(self, entries: list) -> None:
+        entries = sorted(entries, key=lambda e: (e["stg"], e["name"]))
+        self.names = [e["name"] for e in entries]
+        self.stg = np.array([e["stg"] for e in entries], dtype=np.int64)
+        self.ndv = np.array([e["ndv"] for e in entries], dtype=np.int64)
+        self.time = np.array([e["time"] for e in entries], dtype=np.float64)
+        self.dtime = np.array([e["dtime"] for e in entries], dtype=np.float64)
+        self.sizes = np.array([e["size"] for e in entries], dtype=np.int64)
+        self.mtime_ns = np.array([e["mtime_ns"] for e in entries], dtype=np.int64)
+        self.schemas = []
+        schema_ids = {}
+        schema = []
+        for e in entries:
+            key = tuple(e["columns"])
+            if key not in schema_ids:
+                schema_ids[key] = len(self.schemas)
+                self.schemas.append(list(key))
+            schema.append(schema_ids[key])
+        self.schema = np.array(schema, dtype=np.int64)
+
+    def path(self, stg: int) -> Path:
+        """Return the path of the profile of stage ``stg``."""
+        i = int(np.searchsorted(self.stg, stg))
+        if i >= self.stg.size or self.stg[i] != stg:
+            raise KeyError(f"No profile for stage {stg} in {self.writestr_dir}")
+        return self.writestr_dir / self.names[i]
+
+    def columns(self, stg: int) -> list:
+        """Return the column names of the profile of stage ``stg``."""
+        self.path(stg)
+        return self.schemas[self.schema[np.searchsorted(self.stg, stg)]]
+
+    def nearest_stage(self, stg: int) -> int:
+        """Return the catalogued stage closest to ``stg``."""
+        _, values = find_nearest(self.stg, stg)
+        return int(values[0])
+
+    def nearest_time(self, t: float) -> int:
+        """Return the stage of the profile whose age is closest to ``t``.
+
+        Ages increase with the stage within an evolution, so ``time`` is
+        searched as a sorted array.
+        """
+        idxs, _ = find_nearest(self.time, t)
+        return int(self.stg[idxs[0]])
+
+    def between_stages(self, stg_min: int, stg_max: int) -> np.ndarray:
+        """Return the catalogued stages with ``stg_min <= stg <= stg_max``."""
+        lo = np.searchsorted(self.stg, stg_min, side="left")
+        hi = np.searchsorted(self.stg, stg_max, side="right")
+        return self.stg[lo:hi]
+
+    def between_times(self, t_min: float, t_max: float) -> np.ndarray:
+        """Return the stages of the profiles with ``t_min <= time <= t_max``."""
+        return self.stg[(self.time >= t_min) & (self.time <= t_max)]
+
+    def to_frame(self) -> pd.DataFrame:
+        """Return the catalog as a DataFrame indexed by stage."""
+        return pd.DataFrame(
+            {
+                "time": self.time,
+                "dtime": self.dtime,
+                "ndv": self.ndv,
+                "schema": self.schema,
+                "name": self.names,
+            },
+            index=pd.Index(self.stg, name="stg"),
+        )
@@ -0,0 +1,139 @@
+"""Transparent access to compressed HOSHI outputs.
+
+Archived models often keep ``summary.txt`` and the writestr profiles as
+``summary.txt.gz``, ``str02468.txt.xz``, ... The readers resolve their file
+names with ``find_variant``, which falls back to a compressed variant when the
+plain file is missing, and open them with ``open_source``. The stdlib codecs
+(``gzip``, ``lzma``, ``bz2``) decompress in streaming fashion, so whole-file
+reads go through ``read_source`` (fixed-size chunks into one buffer that is
+handed to the fast parser) and seeks within a file still work, at the cost
+of decompressing up to the target offset.
+
+``benchmark_codecs`` compares the decode throughput of the codecs with plain
+text for a given file.
+"""
+
+from pathlib import Path
+import bz2
+import gzip
+import lzma
+import os
+import tempfile
+import time
+
+CODECS = {".gz": gzip.open, ".xz": lzma.open, ".bz2": bz2.open}
+_WRITERS = {".gz": gzip.compress, ".xz": lzma.compress, ".bz2": bz2.compress}
+
+CHUNK_SIZE = 1 << 20
+
+
+def is_compressed(path: str | Path) -> bool:
+    """True if ``path`` has one of the codec suffixes (``.gz``, ``.xz``, ``.bz2``)."""
+    return Path(path).suffix in CODECS
+
+
+def source_name(path: str | Path) -> str:
+    """Return the file name of ``path`` without a codec suffix."""
+    path = Path(path)
+    return path.stem if path.suffix in CODECS else path.name
+
+
+def variant_rank(path: str | Path) -> int:
+    """Return the preference of a file among the variants of one source.
+
+    The plain file ranks first (0), then the codecs in ``CODECS`` order, the
+    order in which ``find_variant`` looks for them.
+    """
+    suffix = Path(path).suffix
+    return list(CODECS).index(suffix) + 1 if suffix in CODECS else 0
+
+
+def find_variant(path: str | Path) -> Path:
+    """Return ``path`` if it exists, else its first existing compressed variant.
+
+    Returns ``path`` unchanged when neither exists, so callers report the
+    missing plain file as before.
+    """
+    path = Path(path)
+    if path.exists() or is_compressed(path):
+        return path
+    for suffix in CODECS:
+        candidate = path.with_name(path.name + suffix)
+        if candidate.exists():
+            return candidate
+    return path
+
+
+def open_source(path: str | Path, mode: str = "rb"):
+    """Open a plain or compressed file for reading (``"rb"`` or ``"r"``)."""
+    path = Path(path)
+    opener = CODECS.get(path.suffix)
+    if opener is None:
+        return open(path, mode)
+    return opener(path, "rt" if mode == "r" else mode)
+
+
+def read_source(path: str | Path, chunk_size: int = CHUNK_SIZE) -> bytes:
+    """Return the (decompressed) bytes of a file.
+
+    Compressed files are decompressed ``chunk_size`` bytes at a time into one
+    growing buffer, so memory stays close to the size of the decompressed
+    data.
+    """
+    path = Path(path)
+    if not is_compressed(path):
+        with open(path, "rb") as f:
+            return f.read()
+    buf = bytearray()
+    with open_source(path, "rb") as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            buf += chunk
+    return bytes(buf)
+
+
+def benchmark_codecs(path: str | Path, codecs=(".gz", ".xz", ".bz2"), repeat: int = 3, decode=None) -> list:
+    """Compare reading ``path`` as plain text and in each compressed format.
+
+    The plain file is compressed with every codec into a temporary directory
+    and read back with ``read_source``; ``decode(raw_bytes)`` (e.g. a fixed
+    width parse) is included in the timing when given.
+
+    Returns:
+        One dict per format with ``codec``, ``bytes`` (on disk), ``ratio``
+        (plain size / size on disk), ``seconds`` (best of ``repeat``) and
+        ``mb_per_s`` (plain megabytes decoded per second).
+    """
+    path = Path(path)
+    raw = read_source(path)
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        files = {"": path}
+        if is_compressed(path):
+            files[""] = Path(tmp) / source_name(path)
+            files[""].write_bytes(raw)
+        for suffix in codecs:
+            target = Path(tmp) / (source_name(path) + suffix)
+            target.write_bytes(_WRITERS[suffix](raw))
+            files[suffix] = target
+        for suffix, target in files.items():
+            best = float("inf")
+            for _ in range(repeat):
+                t0 = time.perf_counter()
+                data = read_source(target)
+                if decode is not None:
+                    decode(data)
+                best = min(best, time.perf_counter() - t0)
+            size = os.path.getsize(target)
+            results.append(
+                {
+                    "codec": suffix or "plain",
+                    "bytes": size,
+                    "ratio": len(raw) / size if size else float("nan"),
+                    "seconds": best,
+                    "mb_per_s": len(raw) / 1e6 / best if best > 0 else float("inf"),
+                }
+            )
+    return results
@@ -0,0 +1,235 @@
+"""Convective zones of every profile as run-length encoded intervals.
+
+The ``cv`` column of the writestr profiles flags convective zones (``cv == 1``,
+as in the khd scripts). ``ConvectiveZones`` stores the runs of convective zones
+of all stages in CSR layout: the intervals of stage ``i`` are the entries
+``indptr[i]:indptr[i + 1]`` of flat arrays of zone indices and of boundary
+masses and radii. Quantities such as the convective core mass against time
+are then array operations over these few numbers, without reading the
+profiles again.
+"""
+
+import hashlib
+import json
+import logging
+
+import numpy as np
+import pandas as pd
+
+from .cache import resolve_cache
+from .catalog import ProfileCatalog
+from .series import _select_stages, iter_profiles
+
+# values of ``cv`` counted as convective
+CONVECTIVE = (1,)
+
+
+def run_length_intervals(flags: np.ndarray, ndv=None):
+    """Return the runs of True values of every row of ``flags``.
+
+    Args:
+        flags: ``(n_rows, n_zones)`` boolean array.
+        ndv: number of valid zones of every row (zones beyond are ignored).
+
+    Returns:
+        ``(indptr, lo, hi)``: the runs of row ``i`` are the zone ranges
+        ``lo[k]:hi[k]`` for ``k`` in ``indptr[i]:indptr[i + 1]``.
+    """
+    flags = np.atleast_2d(np.asarray(flags, dtype=bool))
+    n_rows, n_zones = flags.shape
+    if ndv is not None:
+        flags = flags & (np.arange(n_zones) < np.asarray(ndv)[:, None])
+    padded = np.zeros((n_rows, n_zones + 2), dtype=np.int8)
+    padded[:, 1:-1] = flags
+    step = np.diff(padded, axis=1)
+    # nonzero walks the rows in order, so starts and ends pair up
+    rows, lo = np.nonzero(step == 1)
+    _, hi = np.nonzero(step == -1)
+    indptr = np.zeros(n_rows + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=n_rows), out=indptr[1:])
+    return indptr, lo.astype(np.int64), hi.astype(np.int64)
+
+
+class ConvectiveZones:
+    """Convective intervals of many stages in CSR layout.
+
+    Attributes:
+        stages, time, ndv: per-stage arrays.
+        indptr: ``(n_stages + 1,)`` offsets into the interval arrays.
+        zone_lo, zone_hi: zone range ``[zone_lo, zone_hi)`` of every interval.
+        m_bot, m_top, r_bot, r_top: mass (``Mr``) and radius (``Radius``) at
+            the lower and upper boundary of every interval.
+        m_surf, r_surf: per-stage total mass and surface radius.
+    """
+
+    _fields = ("stages", "time", "ndv", "indptr", "zone_lo", "zone_hi", "m_bot", "m_top", "r_bot", "r_top", "m_surf", "r_surf")
+
+    def __init__(self, **arrays):
+        for name in self._fields:
+            setattr(self, name, np.asarray(arrays[name]))
+
+    def __len__(self) -> int:
+        return self.stages.size
+
+    def __repr__(self) -> str:
+        return f"ConvectiveZones({len(self)} stages, {self.zone_lo.size} intervals)"
+
+    @classmethod
+    def from_profiles(cls, stages, time, cv, mass, radius, ndv, convective=CONVECTIVE) -> "ConvectiveZones":
+        """Extract the intervals from ``(n_stages, n_zones)`` profile arrays.
+
+        ``mass`` and ``radius`` are the outer-boundary coordinates of the zones,
+        so zone ``j`` spans ``(mass[j - 1], mass[j]]`` (from 0 for ``j = 0``).
+        """
+        ndv = np.asarray(ndv, dtype=np.int64)
+        indptr, lo, hi = run_length_intervals(np.isin(cv, convective), ndv)
+        row = np.repeat(np.arange(len(ndv)), np.diff(indptr))
+
+        def bounds(coord):
+            coord = np.asarray(coord, dtype=np.float64)
+            bot = np.where(lo > 0, coord[row, np.maximum(lo - 1, 0)], 0.0)
+            return bot, coord[row, hi - 1]
+
+        m_bot, m_top = bounds(mass)
+        r_bot, r_top = bounds(radius)
+        last = np.maximum(ndv - 1, 0)
+        rows = np.arange(len(ndv))
+        return cls(
+            stages=np.asarray(stages, dtype=np.int64),
+            time=np.asarray(time, dtype=np.float64),
+            ndv=ndv,
+            indptr=indptr,
+            zone_lo=lo,
+            zone_hi=hi,
+            m_bot=m_bot,
+            m_top=m_top,
+            r_bot=r_bot,
+            r_top=r_top,
+            m_surf=np.asarray(mass, dtype=np.float64)[rows, last],
+            r_surf=np.asarray(radius, dtype=np.float64)[rows, last],
+        )
+
+    @classmethod
+    def from_model(
+        cls,
+        model,
+        stages=None,
+        convective=CONVECTIVE,
+        prefetch: int = 4,
+        catalog: ProfileCatalog | None = None,
+        cache=False,
+    ) -> "ConvectiveZones":
+        """Extract the intervals of the profiles of a model.
+
+        The profiles are streamed with ``iter_profiles`` (only ``cv``, ``Mr``
+        and ``Radius`` are decoded), so memory does not grow with their number.
+        With ``cache`` the result is stored keyed on the profile catalog.
+        """
+        catalog = catalog if catalog is not None else ProfileCatalog(model)
+        sel = _select_stages(catalog, stages)
+        store = resolve_cache(cache)
+        tag = None
+        if store is not None and catalog.index_path.exists():
+            key = json.dumps([catalog.stg[sel].tolist(), list(convective)])
+            tag = f"convection-{hashlib.sha1(key.encode()).hexdigest()[:16]}"
+            hit = store.load_arrays(catalog.index_path, tag)
+            if hit is not None:
+                logging.info("Loaded convective zones from cache.")
+                return cls(**hit)
+
+        parts = []
+        for stg, profile in iter_profiles(
+            model, stages=catalog.stg[sel], columns=["cv", "Mr", "Radius"], prefetch=prefetch, catalog=catalog
+        ):
+            cols = profile.data(["cv", "Mr", "Radius"])
+            n = cols["cv"].size
+            time = catalog.time[np.searchsorted(catalog.stg, stg)]
+            parts.append(
+                cls.from_profiles(
+                    [stg], [time], cols["cv"][None, :], cols["Mr"][None, :], cols["Radius"][None, :], [n],
+                    convective=convective,
+                )
+            )
+        zones = cls.concatenate(parts)
+        if tag is not None:
+            store.store_arrays(catalog.index_path, zones.to_arrays(), tag)
+        return zones
+
+    @classmethod
+    def concatenate(cls, parts: list) -> "ConvectiveZones":
+        """Join the intervals of several ``ConvectiveZones`` (in the given order)."""
+        if not parts:
+            empty = {name: np.array([], dtype=np.int64) for name in cls._fields}
+            empty["indptr"] = np.zeros(1, dtype=np.int64)
+            return cls(**empty)
+        arrays = {name: np.concatenate([getattr(p, name) for p in parts]) for name in cls._fields if name != "indptr"}
+        counts = np.concatenate([np.diff(p.indptr) for p in parts])
+        arrays["indptr"] = np.concatenate([[0], np.cumsum(counts)])
+        return cls(**arrays)
+
+    def to_arrays(self) -> dict:
+        return {name: getattr(self, name) for name in self._fields}
+
+    def save(self, path) -> None:
+        """Write the intervals to an ``.npz`` file."""
+        np.savez(path, **self.to_arrays())
+
+    @classmethod
+    def load(cls, path) -> "ConvectiveZones":
+        with np.load(path) as data:
+            return cls(**{name: data[name] for name in cls._fields})
+
+    def intervals(self, stg: int) -> pd.DataFrame:
+        """Return the convective intervals of one stage."""
+        i = int(np.searchsorted(self.stages, stg))
+        if i >= self.stages.size or self.stages[i] != stg:
+            raise KeyError(f"Stage {stg} was not extracted")
+        part = slice(self.indptr[i], self.indptr[i + 1])
+        return pd.DataFrame(
+            {
+                "zone_lo": self.zone_lo[part],
+                "zone_hi": self.zone_hi[part],
+                "m_bot": self.m_bot[part],
+                "m_top": self.m_top[part],
+                "r_bot": self.r_bot[part],
+                "r_top": self.r_top[part],
+            }
+        )
+
+    def to_frame(self) -> pd.DataFrame:
+        """Return all intervals as one DataFrame with a ``stg`` column."""
+        counts = np.diff(self.indptr)
+        return pd.DataFrame(
+            {
+                "stg": np.repeat(self.stages, counts),
+                "time": np.repeat(self.time, counts),
+                "zone_lo": self.zone_lo,
+                "zone_hi": self.zone_hi,
+                "m_bot": self.m_bot,
+                "m_top": self.m_top,
+                "r_bot": self.r_bot,
+                "r_top": self.r_top,
+            }
+        )
+
+    def core_mass(self) -> np.ndarray:
+        """Mass of the convective core of every stage (0 without one)."""
+        has = np.diff(self.indptr) > 0
+        first = self.indptr[:-1][has]
+        out = np.zeros(self.stages.size)
+        out[has] = np.where(self.zone_lo[first] == 0, self.m_top[first], 0.0)
+        return out
+
+    def envelope_mass(self) -> np.ndarray:
+        """Mass of the convective envelope (interval reaching the surface) of every stage."""
+        has = np.diff(self.indptr) > 0
+        last = self.indptr[1:][has] - 1
+        out = np.zeros(self.stages.size)
+        out[has] = np.where(self.zone_hi[last] == self.ndv[has], self.m_top[last] - self.m_bot[last], 0.0)
+        return out
+
+    def convective_mass(self) -> np.ndarray:
+        """Total mass in convective zones of every stage."""
+        per_interval = self.m_top - self.m_bot
+        row = np.repeat(np.arange(self.stages.size), np.diff(self.indptr))
+        return np.bincount(row, weights=per_interval, minlength=self.stages.size)
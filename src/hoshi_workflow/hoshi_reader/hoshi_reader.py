@@ -4,22 +4,55 @@ Copied from original HoshiReader implementation; module filename uses
 lowercase with underscore to follow PEP8 module naming.
 """
 
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import TYPE_CHECKING
+import io
+import json
 import logging
+import os
 import re
+import tempfile
+import time
 
-import matplotlib.pyplot as plt
-import matplotlib.ticker as ticker
 import numpy as np
 import pandas as pd
 from pandas.api.types import is_integer_dtype, is_float_dtype, is_string_dtype
 
+if TYPE_CHECKING:
+    import matplotlib.axes
+
+from .cache import resolve_cache
+from .compression import find_variant, is_compressed, open_source, read_source, source_name
+from .fixed_width import (
+    PARSER_VERSION,
+    FixedWidthError,
+    _clean_text,
+    _decode,
+    _decode_plain,
+    decode_numbers,
+    format_fixed_width,
+    header_spans,
+    parse_fixed_width,
+)
+from .instrument import instrumented, phase
+from .schema import resolve_schema
+
 # Constants
 G_GRAV = 6.67428e-8  # in cm^3/g/s^2
 R_SUN = 6.9566e10  # in cm
 M_SUN = 1.9891e33  # in g
 L_SUN = 3.839e33  # in erg/
 
+# columns that are always integers in HOSHI outputs
+INT_COLS = ("stg", "jcma", "nmlo", "ndv")
+ENGINES = ("fast", "legacy")
+
+
+def _check_engine(engine: str) -> None:
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown engine {engine!r}; expected one of {ENGINES}")
+
 
 def _clean_series_and_cast(s: pd.Series, dtype):
     """Clean a string Series (remove commas, fix Fortran 'D' exponents and missing 'E')
@@ -28,33 +61,34 @@ def _clean_series_and_cast(s: pd.Series, dtype):
     This mirrors the cleaning done in `_coerce_dtypes` so single-column reads behave
     the same as full-DataFrame coercion.
     """
-    missing_vals = {"": np.nan, "NaN": np.nan, "nan": np.nan, "---": np.nan, "NA": np.nan, "N/A": np.nan}
-
-    s_clean = s.astype(str).str.strip()
-    s_clean = s_clean.replace(missing_vals)
-    s_clean = s_clean.str.replace(",", "", regex=True)
-    s_clean = s_clean.str.replace(r"[dD]", "E", regex=True)
-    s_clean = s_clean.str.replace(
-        r"(?P<mant>[+-]?(?:\d+\.\d*|\d*\.\d+|\d+))(?P<exp>[+-]\d{1,3})$",
-        r"\g<mant>E\g<exp>",
-        regex=True,
-    )
-
-    converted = pd.to_numeric(s_clean, errors="coerce")
+    converted, _, cleaned = _decode(s.astype(str).to_numpy(dtype=str))
 
     if dtype in (float, "float", "float64"):
-        return converted.astype("float64").to_numpy()
+        return converted
     elif dtype in (int, "int", "int64"):
         # Follow _coerce_dtypes behavior: use nullable Int64 if there are NaNs
-        if converted.isna().any():
-            return converted.astype("Int64").to_numpy()
+        if np.isnan(converted).any():
+            return pd.array(converted, dtype="Int64").to_numpy()
         else:
-            return converted.astype("int64").to_numpy()
+            return converted.astype("int64")
     else:
-        return s_clean.where(s_clean.notna(), "").to_numpy()
+        return cleaned.astype(object)
+
+
+def _sample_is_numeric(cleaned: np.ndarray, min_convert_frac: float, size: int = 256) -> bool:
+    """True if a column recorded as text may now be numeric (or is empty).
+
+    Only an evenly spaced sample of at most ``size`` filled entries is decoded.
+    """
+    filled = np.flatnonzero(cleaned != cleaned[:0].dtype.type())
+    if filled.size == 0:
+        return True
+    values, nonempty = decode_numbers(cleaned[filled[:: max(1, filled.size // size)]])
+    n_nonempty = int(nonempty.sum())
+    return n_nonempty == 0 or int((~np.isnan(values[nonempty])).sum()) >= min_convert_frac * n_nonempty
 
 
-def coerce_dtypes(df: pd.DataFrame, dtype=float, min_convert_frac: float = 0.99) -> pd.DataFrame:
+def coerce_dtypes(df: pd.DataFrame, dtype=float, min_convert_frac: float = 0.99, schema=True) -> pd.DataFrame:
     """Clean and coerce a DataFrame's columns to appropriate dtypes.
 
     This is the module-level version of the former class method. It applies the same
@@ -62,57 +96,304 @@ def coerce_dtypes(df: pd.DataFrame, dtype=float, min_convert_frac: float = 0.99)
     coerce to numeric) and returns a DataFrame with columns cast to numeric types
     where the fraction of convertible entries meets ``min_convert_frac``.
 
+    The cleaning is done by ``fixed_width.decode_numbers`` on whole columns of
+    character codes, so no per-element regex is involved. Columns that parse
+    as plain numbers skip the cleaning.
+
     Args:
         df: DataFrame with raw string columns to coerce.
         dtype: preferred numeric dtype for floats/ints.
         min_convert_frac: minimum fraction of non-empty entries that must be
             convertible to consider the column numeric.
+        schema: reuse the column decisions taken for the same columns before
+            (``True``: the module-wide registry, a ``SchemaRegistry``, or
+            ``False`` to infer every column again). See
+            ``hoshi_workflow.hoshi_reader.schema``. Only the ``read_csv``
+            paths (``engine="legacy"`` and the fallbacks of the fast engine)
+            go through ``coerce_dtypes``; the fast fixed-width decoder does
+            not use the registry.
     """
-    int_cols = ["stg", "jcma", "nmlo", "ndv"]
-    missing_vals = {"": np.nan, "NaN": np.nan, "nan": np.nan, "---": np.nan, "NA": np.nan, "N/A": np.nan}
-
-    df_out = df.copy()
-    for col in df_out.columns:
-        s = df_out[col]
-        s_clean = s.astype(str).str.strip()
-        s_clean = s_clean.replace(missing_vals)
-        s_clean = s_clean.str.replace(",", "", regex=True)
-        s_clean = s_clean.str.replace(r"[dD]", "E", regex=True)
-        s_clean = s_clean.str.replace(
-            r"(?P<mant>[+-]?(?:\d+\.\d*|\d*\.\d+|\d+))(?P<exp>[+-]\d{1,3})$",
-            r"\g<mant>E\g<exp>",
-            regex=True,
-        )
-
-        non_empty_mask = s_clean.notna()
-        n_non_empty = int(non_empty_mask.sum())
-        if n_non_empty == 0:
-            df_out[col] = pd.Series([np.nan] * len(df_out), index=df_out.index)
-            continue
+    int_cols = INT_COLS
+    registry = resolve_schema(schema)
+    known = registry.lookup(df.columns, min_convert_frac) if registry is not None else None
+    decisions = {}
+
+    with phase("coerce_dtypes", rows=len(df)):
+        df_out = df.copy()
+        for col in df_out.columns:
+            kind, plain = known.get(col, (None, True)) if known else (None, True)
+            if kind == "str":
+                # known text column: clean it, unless a sample now parses as numbers
+                cleaned = _clean_text(df_out[col].astype(str).to_numpy(dtype=str))
+                if not _sample_is_numeric(cleaned, min_convert_frac):
+                    decisions[col] = ("str", False)
+                    df_out[col] = cleaned.astype(object)
+                    continue
+                kind, plain = None, True
+
+            decoded = _decode_plain(df_out[col]) if plain else None
+            raw = df_out[col].astype(str).to_numpy(dtype=str) if decoded is None else None
+            if kind is not None and not plain:
+                # known to need the Fortran rewriting, but not the cleaned text
+                decoded = decode_numbers(raw)
+            if decoded is None:
+                plain = False
+                converted, non_empty_mask, cleaned = _decode(raw)
+            else:
+                (converted, non_empty_mask), cleaned = decoded, None
 
-        converted = pd.to_numeric(s_clean, errors="coerce")
-        n_converted = int((~converted[non_empty_mask].isna()).sum())
-        frac = n_converted / n_non_empty
+            n_non_empty = int(non_empty_mask.sum())
+            if n_non_empty == 0:
+                df_out[col] = pd.Series([np.nan] * len(df_out), index=df_out.index)
+                continue
 
-        if frac >= min_convert_frac:
-            if col in int_cols:
-                if converted.isna().any():
-                    df_out[col] = converted.astype("Int64")
-                else:
-                    df_out[col] = converted.astype("int64")
-            else:
-                if dtype in (int, "int", "int64") and not converted.isna().any():
+            isnan = np.isnan(converted)
+            n_converted = int((~isnan[non_empty_mask]).sum())
+            frac = n_converted / n_non_empty
+
+            if frac >= min_convert_frac:
+                if kind is None:
+                    kind = "int" if col in int_cols else "float"
+                decisions[col] = (kind, plain)
+                if kind == "int":
+                    if isnan.any():
+                        df_out[col] = pd.array(converted, dtype="Int64")
+                    else:
+                        df_out[col] = converted.astype("int64")
+                elif dtype in (int, "int", "int64") and not isnan.any():
                     df_out[col] = converted.astype("int64")
                 else:
-                    df_out[col] = converted.astype("float64")
+                    df_out[col] = converted
+            else:
+                decisions[col] = ("str", False)
+                if cleaned is None:
+                    raw = df_out[col].astype(str).to_numpy(dtype=str) if raw is None else raw
+                    cleaned = _clean_text(raw)
+                df_out[col] = cleaned.astype(object)
+
+    if registry is not None and (known is None or any(known.get(c) != d for c, d in decisions.items())):
+        registry.record(df.columns, min_convert_frac, decisions)
+    return df_out
+
+
+def _cast_decoded(values: np.ndarray, dtype) -> np.ndarray:
+    """Cast a decoded float column like ``_clean_series_and_cast`` does."""
+    if dtype in (int, "int", "int64"):
+        if np.isnan(values).any():
+            return pd.array(values, dtype="Int64").to_numpy()
+        return values.astype("int64")
+    return values
+
+
+def _frame_from_decoded(names: list, block: np.ndarray, dtype=float) -> pd.DataFrame:
+    """Build a DataFrame from decoded float columns with ``coerce_dtypes`` dtypes.
+
+    Float columns share memory with ``block``; only integer columns are copied.
+    """
+    with phase("build_frame") as rec:
+        columns = {}
+        for name, values in zip(names, block):
+            isnan = np.isnan(values)
+            if isnan.all():
+                columns[name] = values
+            elif name in INT_COLS:
+                columns[name] = pd.array(values, dtype="Int64") if isnan.any() else values.astype("int64")
+            elif dtype in (int, "int", "int64") and not isnan.any():
+                columns[name] = values.astype("int64")
+            else:
+                columns[name] = values
+        df = pd.DataFrame(columns, columns=names, copy=False)
+        rec["rows"] = len(df)
+    return df
+
+
+_NUMERIC_DTYPES = (float, "float", "float64", int, "int", "int64")
+
+
+def _block_column(block: np.ndarray, idx: int, dtype=float) -> np.ndarray:
+    """Return column ``idx`` of a decoded block as ``data()`` does.
+
+    For float dtypes this is a read-only view into ``block`` (no copy); integer
+    dtypes are cast like ``_clean_series_and_cast``.
+    """
+    col = block[idx]
+    if dtype in (float, "float", "float64"):
+        view = col.view(np.ndarray)
+        view.flags.writeable = False
+        return view
+    return _cast_decoded(np.asarray(col), dtype)
+
+
+def _parse_fixed_width_block(buf: bytes, header: str, var_names: list, usecols: list | None = None):
+    """Decode ``buf`` with the fixed-width engine, or return None to fall back.
+
+    The column spans are taken from ``header``; ``var_names`` must describe the
+    same number of columns. Returns the ``(ncols, nrows)`` float block.
+    """
+    names, spans = header_spans(header)
+    if len(names) != len(var_names):
+        logging.debug(f"Header has {len(names)} columns but {len(var_names)} names; using legacy engine.")
+        return None
+    with phase("parse_fixed_width", bytes=len(buf)) as rec:
+        try:
+            block = parse_fixed_width(buf, spans, usecols=usecols)
+        except FixedWidthError as exc:
+            logging.debug(f"Fixed-width parsing failed ({exc}); using legacy engine.")
+            return None
+        rec["rows"] = block.shape[1]
+    return block
+
+
+def _check_columns(columns, var_names):
+    """Validate a ``columns=`` projection; returns a list of names or None.
+
+    ``var_names`` is a list of names or a name -> index mapping.
+    """
+    if columns is None:
+        return None
+    if isinstance(columns, str):
+        columns = [columns]
+    columns = list(columns)
+    unknown = [c for c in columns if c not in var_names]
+    if unknown:
+        raise ValueError(f"Unknown column(s) {unknown}; available columns are {list(var_names)}")
+    return columns
+
+
+def _frame_to_block(df: pd.DataFrame):
+    """Return a numeric DataFrame as a ``(ncols, nrows)`` float block, or None."""
+    if not all(pd.api.types.is_numeric_dtype(df[c]) for c in df.columns):
+        return None
+    return df.to_numpy(dtype=np.float64, na_value=np.nan).T
+
+
+def _block_to_records(names: list, block: np.ndarray) -> np.ndarray:
+    """Return a decoded block as a NumPy structured array (one record per row).
+
+    Fields are float64, except the integer columns of ``INT_COLS`` which are
+    int64 when they have no missing values.
+    """
+    nrows = block.shape[1] if block.ndim == 2 else 0
+    dtypes = []
+    for name, values in zip(names, block):
+        is_int = name in INT_COLS and not np.isnan(values).any()
+        dtypes.append((name, np.int64 if is_int else np.float64))
+    out = np.empty(nrows, dtype=dtypes)
+    for name, values in zip(names, block):
+        out[name] = values
+    return out
+
+
+def stitch_runs(stg: np.ndarray, run_id: np.ndarray, start_stg: int = 1) -> dict:
+    """Resolve restarts in concatenated run data, last writer wins on ``stg``.
+
+    A run that (re)starts at stage ``s`` supersedes every row of the earlier
+    runs with ``stg >= s``; among rows with the same ``stg`` that survive, the
+    one written last in the file wins. Everything is done with array
+    operations, so the cost is linear in the number of rows (plus a sort).
+
+    Args:
+        stg: stage number of every row, all runs concatenated in file order.
+        run_id: run number of every row (rows of one run are contiguous).
+        start_stg: rows with ``stg < start_stg`` are dropped.
+
+    Returns:
+        dict of arrays: ``rows`` (indices of the kept rows, ordered by stage),
+        ``stg`` (their stages), ``missing`` (stages absent between the first
+        and the last kept stage), ``overlap`` (kept stages that were written
+        more than once) and ``runs`` (run ids that contribute rows).
+    """
+    stg = np.asarray(stg, dtype=np.int64)
+    run_id = np.asarray(run_id)
+    empty = np.array([], dtype=np.int64)
+    if stg.size == 0:
+        return {"rows": empty, "stg": empty, "missing": empty, "overlap": empty, "runs": empty}
+
+    new_run = np.r_[True, run_id[1:] != run_id[:-1]]
+    segment = np.cumsum(new_run) - 1
+    first_stg = stg[new_run]
+    # smallest restart stage among the strictly later runs
+    later_min = np.minimum.accumulate(first_stg[::-1])[::-1]
+    limit = np.r_[later_min[1:], np.iinfo(np.int64).max]
+
+    candidates = np.flatnonzero((stg < limit[segment]) & (stg >= start_stg))
+    order = candidates[np.argsort(stg[candidates], kind="stable")]
+    sorted_stg = stg[order]
+    rows = order[np.r_[sorted_stg[1:] != sorted_stg[:-1], True]]
+    kept_stg = stg[rows]
+
+    if rows.size:
+        missing = np.setdiff1d(np.arange(kept_stg[0], kept_stg[-1] + 1), kept_stg)
+    else:
+        missing = empty
+    superseded = np.ones(stg.size, dtype=bool)
+    superseded[rows] = False
+    superseded &= stg >= start_stg
+    overlap = np.intersect1d(stg[superseded], kept_stg)
+
+    return {
+        "rows": rows,
+        "stg": kept_stg,
+        "missing": missing,
+        "overlap": overlap,
+        "runs": np.unique(run_id[rows]),
+    }
+
+
+def _combined_formats(df: pd.DataFrame):
+    """Return ``(df, fmt_list, header_line)`` used to write ``summary_combined.txt``.
+
+    Integer columns are written as ``%7d`` and float columns as ``%15.6e``, so
+    a numeric table has rows of constant width; other columns fall back to
+    ``%s``. The columns of ``df`` are cast in place to the written dtype.
+    """
+    fmt_list = []
+    header_fmt_list = []
+    # Determine format for each column based on its dtype
+    for c in df.columns:
+        col = df[c]
+        if is_integer_dtype(col.dtype):
+            fmt_list.append('%7d')
+            header_fmt_list.append('%7s')
+            df[c] = col.astype('int64')
+        elif is_float_dtype(col.dtype):
+            fmt_list.append('%15.6e')
+            header_fmt_list.append('%15s')
+            df[c] = col.astype('float64')
         else:
-            df_out[col] = s_clean.where(s_clean.notna(), "")
+            fmt_list.append('%s')
+            header_fmt_list.append('%s')
+            df[c] = col.astype(str)
 
-    return df_out
+    header_line = ' '.join(fmt % name for fmt, name in zip(header_fmt_list, df.columns))
+    return df, fmt_list, header_line
+
+
+def _format_combined_rows(df: pd.DataFrame, fmt_list: list) -> bytes:
+    """Return the rows of ``df`` formatted as ``np.savetxt(fmt=fmt_list)`` does.
+
+    Numeric tables are formatted column by column with ``format_fixed_width``;
+    tables with string columns or values wider than their field are formatted
+    row by row.
+    """
+    body = format_fixed_width([df[c].to_numpy() for c in df.columns], fmt_list)
+    if body is None:
+        fmt = ' '.join(fmt_list) + '\n'
+        body = ''.join(fmt % tuple(row) for row in df.itertuples(index=False, name=None)).encode()
+    return body
+
+
+def _save_binary_table(path: Path, names: list, block: np.ndarray) -> None:
+    """Write a decoded table as a ``.npy`` structured array (see ``_block_to_records``)."""
+    records = _block_to_records(names, block)
+    with tempfile.NamedTemporaryFile("wb", dir=path.parent, suffix=".npy", delete=False) as tmp:
+        np.save(tmp, records)
+    os.chmod(tmp.name, 0o644)
+    os.replace(tmp.name, path)
 
 
 def set_plot_xtickers(
-    ax: plt.Axes,
+    ax: "matplotlib.axes.Axes",
     x_interval: float,
     x_minorTicks_num: int,
     major_tick_length: float = 6,
@@ -135,12 +416,15 @@ def set_plot_xtickers(
         bottom=True,
     )
 
+    # deferred: importing matplotlib is slow and may select a GUI backend
+    import matplotlib.ticker as ticker
+
     ax.xaxis.set_major_locator(ticker.MultipleLocator(x_interval))
     ax.xaxis.set_minor_locator(ticker.AutoMinorLocator(x_minorTicks_num))
 
 
 def set_plot_ytickers(
-    ax: plt.Axes,
+    ax: "matplotlib.axes.Axes",
     y_interval: float,
     y_minorTicks_num: int,
     major_tick_length: float = 6,
@@ -163,19 +447,24 @@ def set_plot_ytickers(
         right=True,
     )
 
+    # deferred: importing matplotlib is slow and may select a GUI backend
+    import matplotlib.ticker as ticker
+
     ax.yaxis.set_major_locator(ticker.MultipleLocator(y_interval))
     ax.yaxis.set_minor_locator(ticker.AutoMinorLocator(y_minorTicks_num))
 
-def find_nearest(arr: np.ndarray, x: float, *, descending: bool = False) -> tuple[np.ndarray, np.ndarray]:
+def find_nearest(arr: np.ndarray, x, *, descending: bool = False) -> tuple[np.ndarray, np.ndarray]:
     """Return the index and value nearest to ``x`` in ``arr``.
 
     Simpler, unified API: always returns ``(indices, values)`` where both are numpy arrays.
     For a single nearest element the returned arrays have length 1. The function expects the
     input to be sorted (ascending by default). Set ``descending=True`` for descending arrays.
+    ``x`` may also be an array of targets: all of them are located with one
+    ``np.searchsorted`` call and the returned arrays have one entry per target.
 
     Args:
         arr: 1-D array-like sorted array.
-        x: Target value.
+        x: Target value, or array of target values.
         descending: If True, treat ``arr`` as sorted in descending order.
 
     Raises:
@@ -185,31 +474,15 @@ def find_nearest(arr: np.ndarray, x: float, *, descending: bool = False) -> tupl
     if a.size == 0:
         raise ValueError("find_nearest: empty input array")
 
-    if descending:
-        a_proc = a[::-1]
-        pos = np.searchsorted(a_proc, x, side="left")
-        candidates = []
-        if pos - 1 >= 0:
-            candidates.append(pos - 1)
-        if pos < a_proc.size:
-            candidates.append(pos)
-        if not candidates:
-            raise ValueError("find_nearest: index not found")
-        best = min(candidates, key=lambda i: abs(a_proc[i] - x))
-        idx = int(a.size - 1 - best)
-        return np.array([idx], dtype=int), np.array([float(a[idx])], dtype=float)
-    else:
-        pos = np.searchsorted(a, x, side="left")
-        candidates = []
-        if pos - 1 >= 0:
-            candidates.append(pos - 1)
-        if pos < a.size:
-            candidates.append(pos)
-        if not candidates:
-            raise ValueError("find_nearest: index not found")
-        best = min(candidates, key=lambda i: abs(a[i] - x))
-        idx = int(best)
-        return np.array([idx], dtype=int), np.array([float(a[idx])], dtype=float)
+    xs = np.atleast_1d(np.asarray(x, dtype=float))
+    a_proc = a[::-1] if descending else a
+    pos = np.searchsorted(a_proc, xs, side="left")
+    left = np.maximum(pos - 1, 0)
+    right = np.minimum(pos, a.size - 1)
+    # ties go to the lower position, as the scalar search always did
+    best = np.where(np.abs(a_proc[left] - xs) <= np.abs(a_proc[right] - xs), left, right)
+    idx = a.size - 1 - best if descending else best
+    return idx.astype(int), a[idx].astype(float)
 
 
 def find_all_within(arr: np.ndarray, x: float, *, tol: float = 1e-3, descending: bool = False) -> tuple[np.ndarray, np.ndarray]:
@@ -243,16 +516,27 @@ def find_all_within(arr: np.ndarray, x: float, *, tol: float = 1e-3, descending:
     return ordered.astype(int), a[ordered]
 
 
-def find_first_greater(arr: np.ndarray, x: float, *, descending: bool = False) -> tuple[np.ndarray, np.ndarray]:
+def _found_or_missing(a: np.ndarray, idx: np.ndarray, found: np.ndarray, name: str, strict: bool):
+    if strict and not found.all():
+        raise ValueError(f"{name}: index not found")
+    idx = np.where(found, idx, -1).astype(int)
+    values = np.where(found, a[np.clip(idx, 0, a.size - 1)].astype(float), np.nan)
+    return idx, values
+
+
+def find_first_greater(arr: np.ndarray, x, *, descending: bool = False, strict: bool = True) -> tuple[np.ndarray, np.ndarray]:
     """Return the first index and value greater than ``x`` as arrays of length 1.
 
     Uses ``np.searchsorted`` for efficiency. For descending arrays the index is mapped back to
-    the original array ordering.
+    the original array ordering. ``x`` may also be an array of targets, in which
+    case the arrays have one entry per target.
 
     Args:
         arr: 1-D array-like sorted array.
-        x: Threshold value.
+        x: Threshold value, or array of threshold values.
         descending: If True, treat ``arr`` as sorted descending.
+        strict: If False, targets without a match get index -1 and value NaN
+            instead of raising.
 
     Raises:
         ValueError: if input empty or no value greater than ``x`` exists.
@@ -261,21 +545,17 @@ def find_first_greater(arr: np.ndarray, x: float, *, descending: bool = False) -
     if a.size == 0:
         raise ValueError("find_first_greater: empty input array")
 
+    xs = np.atleast_1d(x)
     if descending:
-        a_rev = a[::-1]
-        pos = np.searchsorted(a_rev, x, side="right")
-        if pos >= a_rev.size:
-            raise ValueError("find_first_greater: index not found")
-        idx = int(a.size - 1 - pos)
-        return np.array([idx], dtype=int), np.array([float(a[idx])], dtype=float)
+        pos = np.searchsorted(a[::-1], xs, side="right")
+        idx = a.size - 1 - pos
     else:
-        pos = np.searchsorted(a, x, side="right")
-        if pos >= a.size:
-            raise ValueError("find_first_greater: index not found")
-        return np.array([int(pos)], dtype=int), np.array([float(a[pos])], dtype=float)
+        pos = np.searchsorted(a, xs, side="right")
+        idx = pos
+    return _found_or_missing(a, idx, pos < a.size, "find_first_greater", strict)
 
 
-def find_first_less(arr: np.ndarray, x: float, *, descending: bool = True) -> tuple[np.ndarray, np.ndarray]:
+def find_first_less(arr: np.ndarray, x, *, descending: bool = True, strict: bool = True) -> tuple[np.ndarray, np.ndarray]:
     """Return the first index and value less than ``x``.
 
     This helper is primarily intended for descending arrays. It reuses
@@ -291,8 +571,10 @@ def find_first_less(arr: np.ndarray, x: float, *, descending: bool = True) -> tu
 
     Args:
         arr: 1-D array-like sorted array.
-        x: Threshold value.
+        x: Threshold value, or array of threshold values.
         descending: If True (default), treat ``arr`` as sorted descending.
+        strict: If False, targets without a match get index -1 and value NaN
+            instead of raising.
 
     Raises:
         ValueError: if input empty or no value less than ``x`` exists.
@@ -301,20 +583,232 @@ def find_first_less(arr: np.ndarray, x: float, *, descending: bool = True) -> tu
     if a.size == 0:
         raise ValueError("find_first_less: empty input array")
 
+    xs = np.atleast_1d(x)
     if descending:
-        # negate array and target, call existing function on ascending data
-        idxs, _ = find_first_greater(-a, -x, descending=False)
-        if idxs.size == 0:
-            raise ValueError("find_first_less: index not found")
-        return idxs, a[idxs]
+        # negate array and target, search the resulting ascending data
+        pos = np.searchsorted(-a, -xs, side="right")
+        return _found_or_missing(a, pos, pos < a.size, "find_first_less", strict)
     else:
         # ascending array: first element less than x is at pos-1
-        pos = np.searchsorted(a, x, side="left")
-        if pos == 0:
-            raise ValueError("find_first_less: index not found")
-        idx = int(pos - 1)
-        return np.array([idx], dtype=int), np.array([float(a[idx])], dtype=float)
+        pos = np.searchsorted(a, xs, side="left")
+        return _found_or_missing(a, pos - 1, pos > 0, "find_first_less", strict)
+
+
+def _searchsorted_rows(mat: np.ndarray, x: np.ndarray, ndv: np.ndarray, side: str = "left") -> np.ndarray:
+    """``np.searchsorted`` of ``x[i]`` in ``mat[i, :ndv[i]]`` for every (ascending) row at once.
+
+    A bisection over all rows together, so the number of array operations
+    grows with ``log2(n_zones)`` only.
+    """
+    rows = np.arange(mat.shape[0])
+    lo = np.zeros(mat.shape[0], dtype=np.int64)
+    hi = ndv.astype(np.int64).copy()
+    last = max(mat.shape[1] - 1, 0)
+    while True:
+        active = lo < hi
+        if not active.any():
+            return lo
+        mid = (lo + hi) // 2
+        v = mat[rows, np.minimum(mid, last)]
+        go_right = (v < x) if side == "left" else (v <= x)
+        lo = np.where(active & go_right, mid + 1, lo)
+        hi = np.where(active & ~go_right, mid, hi)
+
+
+def _row_layout(mat, x, ndv, descending):
+    """Return ``(m, xs, ndv, desc)`` with descending rows negated to ascending ones."""
+    mat = np.asarray(mat, dtype=float)
+    if mat.ndim != 2:
+        raise ValueError("expected a 2-D (rows, zones) array")
+    n_rows, n_zones = mat.shape
+    ndv = np.full(n_rows, n_zones, dtype=np.int64) if ndv is None else np.asarray(ndv, dtype=np.int64)
+    xs = np.broadcast_to(np.asarray(x, dtype=float), (n_rows,))
+    rows = np.arange(n_rows)
+    if descending is None:
+        # direction of every row from its first and last valid values
+        desc = mat[rows, 0] > mat[rows, np.maximum(ndv - 1, 0)]
+    else:
+        desc = np.broadcast_to(np.asarray(descending, dtype=bool), (n_rows,))
+    sign = np.where(desc, -1.0, 1.0)
+    return mat * sign[:, None], xs * sign, ndv, desc
+
+
+def find_nearest_rows(mat: np.ndarray, x, *, ndv=None, descending=None) -> tuple[np.ndarray, np.ndarray]:
+    """Row-wise ``find_nearest`` over a ``(rows, zones)`` matrix.
+
+    Args:
+        mat: 2-D array whose rows are sorted (e.g. stages x zones).
+        x: one target per row, or a scalar used for every row.
+        ndv: number of valid entries of every row (default: all).
+        descending: per-row (or global) sort direction; None detects it from
+            the first and last valid value of every row.
+
+    Returns:
+        ``(indices, values)`` with one entry per row; -1/NaN for empty rows.
+    """
+    m, xs, ndv, _ = _row_layout(mat, x, ndv, descending)
+    rows = np.arange(m.shape[0])
+    pos = _searchsorted_rows(m, xs, ndv, side="left")
+    left = np.maximum(pos - 1, 0)
+    right = np.minimum(pos, np.maximum(ndv - 1, 0))
+    best = np.where(np.abs(m[rows, left] - xs) <= np.abs(m[rows, right] - xs), left, right)
+    found = ndv > 0
+    idx = np.where(found, best, -1)
+    values = np.where(found, np.asarray(mat, dtype=float)[rows, np.maximum(idx, 0)], np.nan)
+    return idx.astype(int), values
+
+
+def _rows_greater_less(mat, x, ndv, descending, greater: bool):
+    m, xs, ndv, desc = _row_layout(mat, x, ndv, descending)
+    rows = np.arange(m.shape[0])
+    # on a negated (descending) row "greater" becomes "less" and vice versa
+    want_less = desc == greater
+    pos_right = _searchsorted_rows(m, xs, ndv, side="right")
+    pos_left = _searchsorted_rows(m, xs, ndv, side="left")
+    idx = np.where(want_less, pos_left - 1, pos_right)
+    found = np.where(want_less, pos_left > 0, pos_right < ndv)
+    idx = np.where(found, idx, -1)
+    values = np.where(found, np.asarray(mat, dtype=float)[rows, np.maximum(idx, 0)], np.nan)
+    return idx.astype(int), values
+
+
+def find_first_greater_rows(mat: np.ndarray, x, *, ndv=None, descending=None) -> tuple[np.ndarray, np.ndarray]:
+    """Row-wise ``find_first_greater``: the smallest value greater than ``x`` of every row.
+
+    Arguments as for ``find_nearest_rows``; rows without a match get -1/NaN.
+    """
+    return _rows_greater_less(mat, x, ndv, descending, greater=True)
+
+
+def find_first_less_rows(mat: np.ndarray, x, *, ndv=None, descending=None) -> tuple[np.ndarray, np.ndarray]:
+    """Row-wise ``find_first_less``: the largest value less than ``x`` of every row.
+
+    Arguments as for ``find_nearest_rows``; rows without a match get -1/NaN.
+    """
+    return _rows_greater_less(mat, x, ndv, descending, greater=False)
+
+
+def _parse_field(field: bytes) -> float:
+    """Decode one fixed-width number (Fortran ``D`` exponents allowed)."""
+    return float(field.replace(b"D", b"E").replace(b"d", b"e"))
+
+
+class _RowLocator:
+    """Find the records of a region ``[start, end)`` of a file by row number.
+
+    HOSHI writes every record of a run (or profile) with the same width, so the
+    byte offset of row ``k`` is ``start + k * row_len``. That layout is used
+    only when the line ends found at every ``stride``-th row agree with it, and
+    every read checks the line ends of the rows it returns. When the lines do
+    not all have the same length, a sparse index holding the offset of every
+    ``stride``-th line is built in one pass instead, and reads seek to the
+    nearest indexed line.
+    """
 
+    _chunk_size = 1 << 20
+
+    def __init__(self, path: Path, start: int, end: int, stride: int = 256):
+        self.path = path
+        self.start = start
+        self.end = end
+        self.stride = stride
+        self.offsets = None
+        with open_source(path, "rb") as f:
+            f.seek(start)
+            first = f.readline()[: end - start]
+            self.row_len = len(first)
+            if first.endswith(b"\n") and (end - start) % self.row_len == 0 and self._check_fixed(f):
+                self.nrows = (end - start) // self.row_len
+                return
+            self._build_index(f)
+
+    def _check_fixed(self, f) -> bool:
+        """Check the newlines of a fixed-width layout at every ``stride``-th row and the last row."""
+        nrows = (self.end - self.start) // self.row_len
+        rows = np.unique(np.r_[np.arange(self.stride, nrows, self.stride), nrows])
+        for k in rows.tolist():
+            f.seek(self.start + k * self.row_len - 1)
+            if f.read(1) != b"\n":
+                return False
+        return True
+
+    def _is_fixed_read(self, raw: bytes, i: int, j: int) -> bool:
+        """True if ``raw`` (rows ``[i, j)``, preceded by one byte when ``i > 0``) ends a line every ``row_len`` bytes."""
+        codes = np.frombuffer(raw, dtype=np.uint8)
+        if i > 0:
+            if codes.size == 0 or codes[0] != 10:
+                return False
+            codes = codes[1:]
+        if codes.size != (j - i) * self.row_len:
+            return False
+        ends = codes[self.row_len - 1 :: self.row_len]
+        return bool(np.all(ends == 10)) and int(np.count_nonzero(codes == 10)) == j - i
+
+    def _build_index(self, f) -> None:
+        offsets = [self.start]
+        n_lines = 0
+        pos = self.start
+        f.seek(self.start)
+        remaining = self.end - self.start
+        last = b"\n"
+        while remaining > 0:
+            chunk = f.read(min(self._chunk_size, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            newlines = np.flatnonzero(np.frombuffer(chunk, dtype=np.uint8) == 10)
+            # number of the line that starts after each newline
+            line_no = n_lines + 1 + np.arange(newlines.size)
+            offsets.extend((pos + newlines[line_no % self.stride == 0] + 1).tolist())
+            n_lines += newlines.size
+            pos += len(chunk)
+            last = chunk[-1:]
+        if offsets[-1] >= self.end:
+            offsets.pop()
+        self.offsets = np.array(offsets, dtype=np.int64)
+        self.nrows = n_lines + (1 if last != b"\n" else 0)
+        self.row_len = None
+        logging.debug(f"Indexed {self.nrows} variable-width lines of {self.path.name}.")
+
+    def read(self, f, i: int, j: int) -> bytes:
+        """Return the bytes of rows ``[i, j)``."""
+        i, j = max(i, 0), min(j, self.nrows)
+        if j <= i:
+            return b""
+        if self.offsets is None:
+            # read the byte before row i as well: it must end the previous line
+            offset = self.start + i * self.row_len - (1 if i > 0 else 0)
+            f.seek(offset)
+            raw = f.read(self.start + j * self.row_len - offset)
+            if self._is_fixed_read(raw, i, j):
+                return raw[1:] if i > 0 else raw
+            # the region is not fixed-width after all
+            self._build_index(f)
+            return self.read(f, i, j)
+        k = i // self.stride
+        k_end = -(-j // self.stride)
+        f.seek(self.offsets[k])
+        stop = self.offsets[k_end] if k_end < self.offsets.size else self.end
+        lines = f.read(stop - self.offsets[k]).splitlines(keepends=True)
+        return b"".join(lines[i - k * self.stride : j - k * self.stride])
+
+    def search(self, f, span: tuple, value: float, side: str = "left") -> int:
+        """Binary search rows sorted on the column at ``span`` like ``np.searchsorted``."""
+        a, b = span
+        fixed = self.offsets is None
+        lo, hi = 0, self.nrows
+        while lo < hi:
+            mid = (lo + hi) // 2
+            row = self.read(f, mid, mid + 1)
+            if fixed and self.offsets is not None:
+                # read() found lines of different widths and built the index
+                return self.search(f, span, value, side)
+            x = _parse_field(row[a:b])
+            if x < value or (side == "right" and x == value):
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
 
 
 class HoshiModel:
@@ -330,8 +824,25 @@ class HoshiModel:
         if not self.writestr_dir.exists():
             logging.info("No writestr directory found")
 
+    def lookup(self, refresh: bool = False, cache=False):
+        """Return the time/stage/profile ``ModelIndex`` of the model.
+
+        The index is built on the first call and kept on the instance; pass
+        ``refresh=True`` after the run has advanced.
+        """
+        index = getattr(self, "_lookup_index", None)
+        if index is None or refresh:
+            from .lookup import ModelIndex
+
+            history = self if isinstance(self, HoshiHistoryCombined) else None
+            index = ModelIndex(self, history=history, cache=cache)
+            self._lookup_index = index
+        return index
+
 
 class HoshiHistory(HoshiModel):
+    # read size used when scanning summary.txt for run headers
+    _scan_chunk_size = 1 << 20
 
     def __init__(self, path: str | Path):
         p = Path(path)
@@ -339,11 +850,11 @@ class HoshiHistory(HoshiModel):
         if p.is_dir():
             if str(path).endswith("summary") or p.name == "summary":
                 work_dir = p.parent
-                data_path = p / "summary.txt"
+                data_path = find_variant(p / "summary.txt")
             else:
                 work_dir = p
-                data_path = p / "summary" / "summary.txt"
-        elif p.is_file() and str(path).endswith("summary.txt"):
+                data_path = find_variant(p / "summary" / "summary.txt")
+        elif p.is_file() and source_name(p).endswith("summary.txt"):
             work_dir = p.parent.parent
             data_path = p
         else:
@@ -357,17 +868,13 @@ class HoshiHistory(HoshiModel):
         self.var_names = self._get_var_names()
 
     def _get_var_names(self) -> list:
-        with open(self.data_path, "r") as file:
+        with open_source(self.data_path, "r") as file:
             for line in file:
                 if line.startswith("#"):
                     header_line = line
                     break
 
-        cleaned_header = header_line.replace("#", "")
-        cleaned_header = re.sub(r"\d+:", " ", cleaned_header)
-        variable_names = cleaned_header.split()
-
-        return variable_names
+        return self._parse_header_names(header_line)
 
 # ...existing code...
     def _coerce_dtypes(self, df: pd.DataFrame, dtype=float, min_convert_frac: float = 0.99) -> pd.DataFrame:
@@ -381,95 +888,367 @@ class HoshiHistory(HoshiModel):
         return coerce_dtypes(df, dtype=dtype, min_convert_frac=min_convert_frac)
 # ...existing code...
 
+    def _scan_run_index(self) -> list:
+        """Scan ``summary.txt`` once and record the layout of every run.
+
+        The file is streamed in binary chunks; only the positions of ``#`` header
+        lines are located (with ``bytes.find``) and newlines are counted, so the
+        cost is a single pass over the file regardless of the number of runs.
+
+        Returns:
+            A list of dicts, one per run, with the keys returned by ``list_runs``
+            plus the byte offsets ``header_byte``, ``data_byte`` and ``end_byte``.
+        """
+        chunk_size = self._scan_chunk_size
+        header_pos = []  # (byte offset, line number) of every header line
+        n_newlines = 0
+        offset = 0
+        last_byte = b"\n"
+        with open_source(self.data_path, "rb") as f:
+            while True:
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    break
+                if chunk[:1] == b"#" and last_byte == b"\n":
+                    header_pos.append((offset, n_newlines))
+                idx = chunk.find(b"\n#")
+                while idx != -1:
+                    line_no = n_newlines + chunk.count(b"\n", 0, idx + 1)
+                    header_pos.append((offset + idx + 1, line_no))
+                    idx = chunk.find(b"\n#", idx + 1)
+                n_newlines += chunk.count(b"\n")
+                offset += len(chunk)
+                last_byte = chunk[-1:]
+
+            total_bytes = offset
+            total_lines = n_newlines + (1 if last_byte != b"\n" else 0)
+
+            runs = []
+            for i, (byte_pos, line_no) in enumerate(header_pos):
+                f.seek(byte_pos)
+                raw_header = f.readline()
+                header = raw_header.decode(errors="replace").rstrip("\r\n")
+                if i + 1 < len(header_pos):
+                    end_line = header_pos[i + 1][1] - 1
+                    end_byte = header_pos[i + 1][0]
+                else:
+                    end_line = total_lines - 1
+                    end_byte = total_bytes
+
+                runs.append(
+                    {
+                        "index": i + 1,
+                        "header": header,
+                        "start_line": line_no,
+                        "end_line": end_line,
+                        "var_names": self._parse_header_names(header),
+                        "header_byte": byte_pos,
+                        "data_byte": min(byte_pos + len(raw_header), end_byte),
+                        "end_byte": end_byte,
+                    }
+                )
+
+        return runs
+
+    @staticmethod
+    def _parse_header_names(header: str) -> list:
+        return header_spans(header)[0]
+
+    def _run_index(self) -> list:
+        """Return the cached run index, rebuilding it if the file has changed.
+
+        The index is keyed on the path, size and modification time of
+        ``self.data_path`` so an ``evol`` run appending to ``summary.txt`` (or a
+        change of ``data_path``) transparently triggers a rescan.
+        """
+        st = self.data_path.stat()
+        key = (str(self.data_path), st.st_size, st.st_mtime_ns)
+        if getattr(self, "_run_index_key", None) != key:
+            with phase("scan_runs", self.data_path, bytes=st.st_size) as rec:
+                self._run_index_cache = self._scan_run_index()
+                rec["rows"] = sum(run["end_line"] - run["start_line"] for run in self._run_index_cache)
+            self._run_index_key = key
+        return self._run_index_cache
+
     def _find_run_headers(self) -> list:
-        headers = []
-        with open(self.data_path, "r") as f:
-            for idx, line in enumerate(f):
-                if line.startswith("#"):
-                    headers.append((line.rstrip("\n"), idx))
-        return headers
+        return [(run["header"], run["start_line"]) for run in self._run_index()]
 
     def count_runs(self) -> int:
-        return len(self._find_run_headers())
+        return len(self._run_index())
 
     def list_runs(self) -> list:
-        headers = self._find_run_headers()
-        runs = []
-        if not headers:
-            return runs
-
-        with open(self.data_path, "r") as f:
-            all_lines = f.readlines()
-        total_lines = len(all_lines)
-
-        for i, (header, start_idx) in enumerate(headers):
-            if i + 1 < len(headers):
-                end_idx = headers[i + 1][1] - 1
-            else:
-                end_idx = total_lines - 1
-
-            cleaned_header = header.replace("#", "")
-            cleaned_header = re.sub(r"\d+:", " ", cleaned_header)
-            var_names = cleaned_header.split()
-
-            runs.append(
-                {
-                    "index": i + 1,
-                    "header": header,
-                    "start_line": start_idx,
-                    "end_line": end_idx,
-                    "var_names": var_names,
-                }
-            )
+        return [dict(run) for run in self._run_index()]
+
+    def _read_run_bytes(self, run: dict) -> bytes:
+        """Read the data lines of one run (without its header) from the file."""
+        with phase("read", self.data_path) as rec, open_source(self.data_path, "rb") as f:
+            f.seek(run["data_byte"])
+            raw = f.read(run["end_byte"] - run["data_byte"])
+            rec["bytes"] = len(raw)
+        return raw
+
+    @instrumented("HoshiHistory.read_run")
+    def read_run(
+        self,
+        run_index: int = -1,
+        dtype=float,
+        engine: str = "fast",
+        columns: list | None = None,
+    ) -> pd.DataFrame:
+        """Read one run of ``summary.txt`` into a DataFrame.
+
+        Args:
+            run_index: 1-based run number, or a negative index from the end.
+            dtype: preferred numeric dtype (see ``coerce_dtypes``).
+            engine: ``"fast"`` decodes the fixed-width records directly into
+                NumPy arrays; ``"legacy"`` uses ``pd.read_csv`` followed by
+                ``coerce_dtypes``. The fast engine falls back to the legacy one
+                when the run is not laid out in fixed-width columns.
+            columns: names of the columns to read (default: all). Only these
+                columns are decoded.
+        """
+        _check_engine(engine)
+        sel = self._select_run(run_index)
+        if sel is None:
+            return pd.DataFrame()
 
-        return runs
+        var_names = sel["var_names"]
+        columns = _check_columns(columns, var_names)
+        nrows = sel["end_line"] - sel["start_line"]
+        if nrows <= 0:
+            return pd.DataFrame(columns=columns or var_names)
 
-    def read_run(self, run_index: int = -1, dtype=float) -> pd.DataFrame:
-        runs = self.list_runs()
+        return self._decode_rows(self._read_run_bytes(sel), sel, columns, dtype=dtype, engine=engine)
+
+    def _select_run(self, run_index: int):
+        """Return the run dict for a 1-based (or negative) ``run_index``, or None."""
+        runs = self._run_index()
         if not runs:
             logging.error("No runs (header lines) found in summary file.")
-            return pd.DataFrame()
+            return None
 
         if run_index < 0:
-            sel = runs[run_index]
-        else:
-            if run_index < 1 or run_index > len(runs):
-                logging.error(
-                    f"run_index out of range. Must be between 1 and {len(runs)}"
-                )
-                return pd.DataFrame()
-            sel = runs[run_index - 1]
+            if -run_index > len(runs):
+                logging.error(f"run_index out of range. Must be between 1 and {len(runs)}")
+                return None
+            return runs[run_index]
+        if run_index < 1 or run_index > len(runs):
+            logging.error(
+                f"run_index out of range. Must be between 1 and {len(runs)}"
+            )
+            return None
+        return runs[run_index - 1]
 
+    def _decode_rows(self, raw: bytes, sel: dict, columns: list | None, dtype=float, engine: str = "fast") -> pd.DataFrame:
+        """Decode data lines of run ``sel`` with the selected engine."""
         var_names = sel["var_names"]
-        data_start = sel["start_line"] + 1
-        data_end = sel["end_line"]
-        nrows = data_end - data_start + 1
-        if nrows <= 0:
-            return pd.DataFrame(columns=var_names)
-
-        df = pd.read_csv(
-            self.data_path,
-            comment="#",
-            sep=r"\s+",
-            engine="python",
-            header=None,
-            names=var_names,
-            skiprows=data_start,
-            nrows=nrows,
-            dtype=str,
-            na_values=["", "NaN", "nan"],
-            keep_default_na=True,
-        )
+        if engine == "fast":
+            usecols = None if columns is None else [var_names.index(c) for c in columns]
+            block = _parse_fixed_width_block(raw, sel["header"], var_names, usecols=usecols)
+            if block is not None:
+                return _frame_from_decoded(columns or var_names, block, dtype=dtype)
+
+        with phase("read_csv", bytes=len(raw)) as rec:
+            df = pd.read_csv(
+                io.BytesIO(raw),
+                comment="#",
+                sep=r"\s+",
+                engine="python",
+                header=None,
+                names=var_names,
+                usecols=columns,
+                dtype=str,
+                na_values=["", "NaN", "nan"],
+                keep_default_na=True,
+            )
+            rec["rows"] = len(df)
 
         df = self._coerce_dtypes(df, dtype=dtype)
         return df
     
-    def _generate_combined_data(
+    def _run_locator(self, run: dict) -> _RowLocator:
+        """Return the (cached) row locator of one run."""
+        key = (getattr(self, "_run_index_key", None), run["index"])
+        locators = getattr(self, "_row_locators", {})
+        if key not in locators:
+            if any(k[0] != key[0] for k in locators):
+                locators = {}
+            locators[key] = _RowLocator(self.data_path, run["data_byte"], run["end_byte"])
+            self._row_locators = locators
+        return locators[key]
+
+    @instrumented("HoshiHistory.read_rows")
+    def read_rows(
         self,
-        save_flag: bool = False,
-        start_stg: int = 1,
-        ) -> pd.DataFrame:
-        
+        start: int | None = None,
+        stop: int | None = None,
+        run_index: int = -1,
+        columns: list | None = None,
+        dtype=float,
+        engine: str = "fast",
+    ) -> pd.DataFrame:
+        """Read rows ``start:stop`` (Python slice semantics) of one run.
+
+        Only these rows are read: the file is seeked to the computed byte offset
+        of ``start``, so the cost does not depend on the length of the run.
+
+        Args:
+            start, stop: row range within the run (negative values count from
+                the end, ``None`` means the start/end of the run).
+            run_index: 1-based run number, or a negative index from the end.
+            columns, dtype, engine: see ``read_run``.
+        """
+        _check_engine(engine)
+        sel = self._select_run(run_index)
+        if sel is None:
+            return pd.DataFrame()
+        columns = _check_columns(columns, sel["var_names"])
+        locator = self._run_locator(sel)
+        i, j, _ = slice(start, stop).indices(locator.nrows)
+        with open_source(self.data_path, "rb") as f:
+            raw = locator.read(f, i, j)
+        if not raw:
+            return pd.DataFrame(columns=columns or sel["var_names"])
+        return self._decode_rows(raw, sel, columns, dtype=dtype, engine=engine)
+
+    @instrumented("HoshiHistory.read_stages")
+    def read_stages(
+        self,
+        stg_min: int,
+        stg_max: int,
+        run_index: int | None = None,
+        columns: list | None = None,
+        dtype=float,
+        engine: str = "fast",
+    ) -> pd.DataFrame:
+        """Read the rows with ``stg_min <= stg <= stg_max``.
+
+        The rows are located by a binary search on ``stg`` over the computed
+        row offsets, so only the requested stages are read and decoded.
+
+        Args:
+            stg_min, stg_max: inclusive stage range.
+            run_index: read from this run only. By default all runs are used
+                and restarts are resolved like ``stitch_runs`` (the result
+                matches the same stages of ``_generate_combined_data``).
+            columns, dtype, engine: see ``read_run``.
+        """
+        _check_engine(engine)
+        if run_index is not None:
+            sel = self._select_run(run_index)
+            if sel is None:
+                return pd.DataFrame()
+            selected = [sel]
+        else:
+            selected = self._run_index()
+            if not selected:
+                logging.error("No runs (header lines) found in summary file.")
+                return pd.DataFrame()
+        names = selected[0]["var_names"]
+        columns = _check_columns(columns, names)
+        if any(run["var_names"] != names for run in selected) or "stg" not in names:
+            logging.error("read_stages requires runs with the same columns, including 'stg'.")
+            return pd.DataFrame()
+        usecols = None if columns is None else list(dict.fromkeys(["stg"] + columns))
+
+        pieces = []
+        with open_source(self.data_path, "rb") as f:
+            located = []
+            for run in selected:
+                locator = self._run_locator(run)
+                if locator.nrows == 0:
+                    continue
+                _, spans = header_spans(run["header"])
+                span = spans[names.index("stg")]
+                first_stg = _parse_field(locator.read(f, 0, 1)[span[0] : span[1]])
+                located.append((run, locator, span, first_stg))
+            # rows of a run are superseded from the first stage of any later run on
+            limit = np.inf
+            for run, locator, span, first_stg in reversed(located):
+                i = locator.search(f, span, stg_min, side="left")
+                j = locator.search(f, span, min(stg_max + 1, limit), side="left")
+                if j > i:
+                    df = self._decode_rows(locator.read(f, i, j), run, usecols, dtype=float, engine=engine)
+                    pieces.append((run["index"], df))
+                limit = min(limit, first_stg)
+        pieces.reverse()
+        out_names = columns or names
+        if not pieces:
+            return pd.DataFrame(columns=out_names)
+
+        with phase("concat", rows=sum(len(df) for _, df in pieces)):
+            frame = pd.concat([df for _, df in pieces], ignore_index=True)
+        block = _frame_to_block(frame)
+        if block is None:
+            logging.error("read_stages found non-numeric values; use read_run instead.")
+            return pd.DataFrame()
+        run_id = np.concatenate([np.full(len(df), idx) for idx, df in pieces])
+        frame_names = list(frame.columns)
+        report = stitch_runs(block[frame_names.index("stg")], run_id, start_stg=stg_min)
+        rows = block[:, report["rows"]]
+        return _frame_from_decoded(out_names, [rows[frame_names.index(n)] for n in out_names], dtype=dtype)
+
+    def _read_all_runs(self, workers: int | None = None):
+        """Decode every run of ``summary.txt``.
+
+        Consecutive runs sharing a header are decoded together in one
+        fixed-width pass (the ``#`` header lines separate the runs); several
+        such groups are decoded concurrently. Groups the fast engine cannot
+        decode fall back to ``read_run(engine="legacy")``.
+
+        Returns:
+            ``(names, block, run_id)`` with the ``(ncols, nrows)`` float block of
+            all runs in file order and the 1-based run number of every row, or
+            None if the runs do not all have the same columns.
+        """
+        runs = self._run_index()
+        names = runs[0]["var_names"]
+        if any(run["var_names"] != names for run in runs):
+            return None
+
+        groups = []
+        for run in runs:
+            if groups and groups[-1][-1]["header"] == run["header"]:
+                groups[-1].append(run)
+            else:
+                groups.append([run])
+
+        def decode(group):
+            with phase("read", self.data_path) as rec, open_source(self.data_path, "rb") as f:
+                f.seek(group[0]["header_byte"])
+                buf = f.read(group[-1]["end_byte"] - group[0]["header_byte"])
+                rec["bytes"] = len(buf)
+            _, spans = header_spans(group[0]["header"])
+            try:
+                with phase("parse_fixed_width", bytes=len(buf)) as rec:
+                    block, run_no = parse_fixed_width(buf, spans, return_groups=True)
+                    rec["rows"] = block.shape[1]
+                return block, run_no + (group[0]["index"] - 1)
+            except FixedWidthError as exc:
+                logging.debug(f"Fixed-width parsing failed ({exc}); using legacy engine.")
+            blocks, run_ids = [], []
+            for run in group:
+                block = _frame_to_block(self.read_run(run["index"], engine="legacy"))
+                if block is None:
+                    raise ValueError(f"Run {run['index']} has non-numeric columns.")
+                blocks.append(block)
+                run_ids.append(np.full(block.shape[1], run["index"]))
+            return np.concatenate(blocks, axis=1), np.concatenate(run_ids)
+
+        if len(groups) == 1:
+            decoded = [decode(groups[0])]
+        else:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                decoded = list(pool.map(decode, groups))
+        if len(decoded) == 1:
+            block, run_id = decoded[0]
+        else:
+            block = np.concatenate([b for b, _ in decoded], axis=1)
+            run_id = np.concatenate([r for _, r in decoded])
+        return names, block, run_id
+
+    def _stitch_legacy(self, start_stg: int = 1) -> pd.DataFrame:
+        """Previous backward-walking stitching algorithm, kept for comparison."""
         idx_run = self.count_runs()
         df_combined = self.read_run(idx_run)
         stg_list = df_combined['stg'].to_numpy(dtype=int)
@@ -488,7 +1267,8 @@ class HoshiHistory(HoshiModel):
                 logging.info(f"Found end index {end_idx} in run {idx_run}.")
                 cut_idx = np.where(stg == end_idx)[0][0]
                 df_cut = df.iloc[:cut_idx+2]
-                df_combined = pd.concat([df_cut, df_combined], ignore_index=True)
+                with phase("concat", rows=len(df_cut) + len(df_combined)):
+                    df_combined = pd.concat([df_cut, df_combined], ignore_index=True)
                 logging.info(f"Combined DataFrame now has {len(df_combined)} rows.")
                 stg_list = df_combined['stg'].to_numpy(dtype=int)
                 if stg_list[0] == start_stg:
@@ -498,89 +1278,798 @@ class HoshiHistory(HoshiModel):
                     end_idx = stg_list[0] - 1
         if idx_run == 0:
             logging.info(f"Processed all runs. The beginning of the combined data is stg {stg_list[0]}.")
-                
-        check_list = np.arange(stg_list[0], stg_list[-1]+1, dtype=int)
-        missing_stages = set(check_list) - set(stg_list)
-        if missing_stages:
-            logging.warning(f"Missing stages: {sorted(missing_stages)}")
+        return df_combined
+
+    @instrumented("HoshiHistory._generate_combined_data")
+    def _generate_combined_data(
+        self,
+        save_flag: bool = False,
+        start_stg: int = 1,
+        engine: str = "fast",
+        workers: int | None = None,
+        ) -> pd.DataFrame:
+        """Stitch the runs of ``summary.txt`` into one continuous history.
+
+        Every run is decoded once and restarts are resolved by ``stitch_runs``
+        (a restart at stage ``s`` replaces the rows ``stg >= s`` of earlier
+        runs). The gaps and overlaps found are stored as arrays in
+        ``self.stitch_report``.
+
+        Args:
+            save_flag: also write ``summary_combined.txt``.
+            start_stg: first stage of the combined history.
+            engine: ``"fast"``, or ``"legacy"`` for the previous backward walk
+                over the runs with ``read_run`` and ``pd.concat``.
+            workers: threads used to decode runs with different headers.
+        """
+        _check_engine(engine)
+        decoded = self._read_all_runs(workers=workers) if engine == "fast" else None
+        if decoded is None:
+            df_combined = self._stitch_legacy(start_stg=start_stg)
+            stg_all = df_combined["stg"].to_numpy(dtype=np.int64)
+            report = stitch_runs(stg_all, np.zeros(stg_all.size, dtype=np.int64), start_stg=stg_all[0])
+            report["rows"] = np.arange(stg_all.size)
+            report["stg"] = stg_all
         else:
+            names, block, run_id = decoded
+            with phase("stitch", rows=block.shape[1]):
+                report = stitch_runs(block[names.index("stg")], run_id, start_stg=start_stg)
+                df_combined = _frame_from_decoded(names, block[:, report["rows"]], dtype=float)
+        self.stitch_report = report
+
+        stg_list = report["stg"]
+        logging.info(f"Combined {len(stg_list)} rows from runs {report['runs'].tolist()}.")
+        if report["overlap"].size:
+            logging.info(f"{report['overlap'].size} stages were rewritten by restarts.")
+        if report["missing"].size:
+            logging.warning(f"Missing stages: {report['missing'].tolist()}")
+        elif stg_list.size:
             logging.info(f"No missing stages, data is continuous from {stg_list[0]} to {stg_list[-1]}.")
-        
+
         if save_flag:
             save_path = self.data_path.parent / "summary_combined.txt"
             
-            fmt_list = []
-            header_fmt_list = []
-            # Determine format for each column based on its dtype
-            for c in df_combined.columns:
-                col = df_combined[c]
-                if is_integer_dtype(col.dtype):
-                    fmt_list.append('%7d')
-                    header_fmt_list.append('%7s')
-                    df_combined[c] = col.astype('int64')
-                elif is_float_dtype(col.dtype):
-                    fmt_list.append('%15.6e')
-                    header_fmt_list.append('%15s')
-                    df_combined[c] = col.astype('float64')
-                else:
-                    fmt_list.append('%s')
-                    header_fmt_list.append('%s')
-                    df_combined[c] = col.astype(str)
-            
-            header_line = ' '.join(fmt % name for fmt, name in zip(header_fmt_list, df_combined.columns))
+            with phase("write_combined", save_path, rows=len(df_combined)) as rec:
+                df_combined, fmt_list, header_line = _combined_formats(df_combined)
+
+                with open(save_path, "wb") as f:
+                    f.write((header_line + "\n").encode())
+                    f.write(_format_combined_rows(df_combined, fmt_list))
+                    rec["bytes"] = f.tell()
 
-            with open(save_path, "w") as f:
-                f.write(header_line + "\n")
-                np.savetxt(f, df_combined.to_numpy(), fmt=fmt_list)
-                    
             logging.info(f"Combined data saved to {save_path}")
+
+        if decoded is None:
+            return self._coerce_dtypes(df_combined, dtype=float)
+        return df_combined
+
+    def follow(
+        self,
+        interval: float = 1.0,
+        from_start: bool = False,
+        profiles: bool = False,
+        idle_timeout: float | None = None,
+    ):
+        """Follow a running model, yielding what is appended to ``summary.txt``.
+
+        ``summary.txt`` is polled every ``interval`` seconds and only the bytes
+        appended since the previous poll are decoded; a partially written last
+        line is picked up once it is complete. Events are dicts with a ``kind``:
+
+        - ``"rows"``: ``records`` (NumPy structured array of the new complete
+          rows) and ``run`` (1-based run number);
+        - ``"run"``: a new ``#`` run header was written (``run``, ``header``);
+        - ``"profile"``: a new ``writestr/strXXXXX.txt`` appeared and its size
+          has settled (``str_num``, ``path``), only with ``profiles=True``;
+        - ``"reset"``: the file shrank and is followed again from the start.
+
+        Args:
+            interval: seconds between two polls.
+            from_start: also yield the rows already in the file.
+            profiles: watch the writestr directory for new profiles.
+            idle_timeout: stop after this many seconds without events
+                (default: follow forever).
+
+        Yields:
+            Event dicts, in file order.
+
+        Raises:
+            ValueError: if the summary is compressed (``summary.txt.gz``, ...).
+        """
+        follower = _SummaryFollower(self, from_start=from_start, profiles=profiles)
+        last_event = time.monotonic()
+        while True:
+            events = follower.poll()
+            yield from events
+            now = time.monotonic()
+            if events:
+                last_event = now
+            elif idle_timeout is not None and now - last_event >= idle_timeout:
+                return
+            time.sleep(interval)
+
+    async def afollow(
+        self,
+        interval: float = 1.0,
+        from_start: bool = False,
+        profiles: bool = False,
+        idle_timeout: float | None = None,
+    ):
+        """Asynchronous iterator version of ``follow`` (same arguments and events)."""
+        import asyncio
+
+        follower = _SummaryFollower(self, from_start=from_start, profiles=profiles)
+        last_event = time.monotonic()
+        while True:
+            events = follower.poll()
+            for event in events:
+                yield event
+            now = time.monotonic()
+            if events:
+                last_event = now
+            elif idle_timeout is not None and now - last_event >= idle_timeout:
+                return
+            await asyncio.sleep(interval)
+
+    # bookkeeping of update_combined(), kept next to summary_combined.txt
+    _combined_state_name = ".summary_combined.state.json"
+
+    @instrumented("HoshiHistory.update_combined")
+    def update_combined(self, start_stg: int = 1, cache=False) -> dict:
+        """Bring ``summary_combined.txt`` up to date with a growing ``summary.txt``.
+
+        The byte offset of ``summary.txt`` consumed so far, the header of the
+        run it belongs to and the layout of ``summary_combined.txt`` are kept in
+        a small state file next to them. Only the rows appended since then are
+        decoded: they are stitched like ``stitch_runs`` does (a restart at stage
+        ``s`` truncates the combined rows with ``stg >= s``) and written at the
+        end of ``summary_combined.txt``. A partial last line is left for the
+        next update. The combined file is regenerated from scratch when there
+        is no usable state, when ``summary.txt`` was rewritten or shrank, or
+        when the new rows have a different header.
+
+        Args:
+            start_stg: first stage of the combined history.
+            cache: a ``SidecarCache`` (or ``cache=`` argument as accepted by the
+                readers); its entry of ``summary_combined.txt`` is patched with
+                the new rows instead of being invalidated.
+
+        Returns:
+            dict with ``mode`` (``"full"``, ``"append"`` or ``"unchanged"``),
+            ``appended`` and ``truncated`` (numbers of rows) and ``rows`` (rows
+            of the combined history).
+        """
+        cache = resolve_cache(cache)
+        summary_path = find_variant(self.data_path.parent / "summary.txt")
+        combined_path = summary_path.parent / "summary_combined.txt"
+        state = self._load_combined_state(summary_path, combined_path, start_stg)
+        if state is None:
+            return self._rebuild_combined(summary_path, start_stg, cache)
+        if is_compressed(summary_path):
+            # archived outputs are not appended to: unchanged or regenerated
+            st = summary_path.stat()
+            if (state.get("summary_size"), state.get("summary_mtime_ns")) == (st.st_size, st.st_mtime_ns):
+                return {"mode": "unchanged", "appended": 0, "truncated": 0, "rows": state["n_rows"]}
+            return self._rebuild_combined(summary_path, start_stg, cache)
+
+        consumed = state["consumed_byte"]
+        with open_source(summary_path, "rb") as f:
+            f.seek(state["header_byte"])
+            if f.readline().decode(errors="replace").rstrip("\r\n") != state["header"]:
+                logging.info("summary.txt was rewritten; regenerating the combined data.")
+                return self._rebuild_combined(summary_path, start_stg, cache)
+            f.seek(consumed)
+            tail = f.read()
+        tail = tail[: tail.rfind(b"\n") + 1]
+        if not tail:
+            return {"mode": "unchanged", "appended": 0, "truncated": 0, "rows": state["n_rows"]}
+
+        headers = [m for m in re.finditer(rb"^#[^\n]*", tail, flags=re.M)]
+        if any(m.group().decode(errors="replace").rstrip("\r") != state["header"] for m in headers):
+            logging.info("New run with a different header; regenerating the combined data.")
+            return self._rebuild_combined(summary_path, start_stg, cache)
+
+        header = state["header"]
+        names, spans = header_spans(header)
+        try:
+            block, run_id = parse_fixed_width((header + "\n").encode() + tail, spans, return_groups=True)
+        except FixedWidthError as exc:
+            logging.info(f"Could not decode the new rows ({exc}); regenerating the combined data.")
+            return self._rebuild_combined(summary_path, start_stg, cache)
+
+        report = stitch_runs(block[names.index("stg")], run_id, start_stg=start_stg)
+        new_rows = block[:, report["rows"]]
+        if run_id.size:
+            # every run of the tail supersedes the combined rows from its first stage on
+            first = np.r_[True, run_id[1:] != run_id[:-1]]
+            restart = int(block[names.index("stg")][first].min())
+        else:
+            restart = None
+
+        cached = cache.load(combined_path) if cache is not None else None
+        df_new = _frame_from_decoded(names, new_rows, dtype=float)
+        df_new, fmt_list, _ = _combined_formats(df_new)
+        body = _format_combined_rows(df_new, fmt_list)
+
+        with open(combined_path, "r+b") as f:
+            header_len = len(f.readline())
+            row_len = state["row_len"]
+            n_rows = state["n_rows"]
+            keep = n_rows if restart is None else self._count_rows_below(f, header_len, row_len, n_rows, state["stg_span"], restart)
+            if keep is None or (df_new.shape[0] and len(body) != df_new.shape[0] * row_len):
+                logging.info("summary_combined.txt is not laid out as expected; regenerating it.")
+                keep = None
+            else:
+                f.seek(header_len + keep * row_len)
+                f.truncate()
+                f.write(body)
+        if keep is None:
+            return self._rebuild_combined(summary_path, start_stg, cache)
+
+        if cached is not None and cached[0] == names and cached[1].shape[1] == n_rows:
+            cache.store(combined_path, names, np.concatenate([cached[1][:, :keep], new_rows], axis=1))
+
+        last_header = consumed + headers[-1].start() if headers else state["header_byte"]
+        total = keep + df_new.shape[0]
+        self._save_combined_state(
+            summary_path, combined_path, state, consumed_byte=consumed + len(tail), header_byte=last_header, n_rows=total
+        )
+        logging.info(
+            f"Appended {df_new.shape[0]} rows to {combined_path.name} "
+            f"({n_rows - keep} rows rewritten by restarts)."
+        )
+        return {"mode": "append", "appended": int(df_new.shape[0]), "truncated": int(n_rows - keep), "rows": int(total)}
+
+    @staticmethod
+    def _count_rows_below(f, header_len: int, row_len: int, n_rows: int, stg_span: list, stg: int):
+        """Binary search the (stage ordered) combined file for the rows with ``stg`` below ``stg``."""
+        a, b = stg_span
+        lo, hi = 0, n_rows
+        while lo < hi:
+            mid = (lo + hi) // 2
+            f.seek(header_len + mid * row_len)
+            row = f.read(row_len)
+            try:
+                value = int(row[a:b])
+            except ValueError:
+                return None
+            if value < stg:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def _rebuild_combined(self, summary_path: Path, start_stg: int, cache) -> dict:
+        history = HoshiHistory(summary_path)
+        df = history._generate_combined_data(save_flag=True, start_stg=start_stg)
+        combined_path = summary_path.parent / "summary_combined.txt"
+        block = _frame_to_block(df)
+        if cache is not None and block is not None:
+            cache.store(combined_path, list(df.columns), block)
+
+        runs = history._run_index()
+        consumed = runs[-1]["end_byte"] if runs else 0
+        with open_source(summary_path, "rb") as f:
+            # leave a partial last line for the next update
+            f.seek(max(consumed - 1, 0))
+            if consumed and f.read(1) != b"\n":
+                f.seek(runs[-1]["header_byte"])
+                consumed = runs[-1]["header_byte"] + f.read(consumed - runs[-1]["header_byte"]).rfind(b"\n") + 1
+        state = {
+            "start_stg": start_stg,
+            "header": runs[-1]["header"] if runs else "",
+        }
+        self._save_combined_state(
+            summary_path,
+            combined_path,
+            state,
+            consumed_byte=consumed,
+            header_byte=runs[-1]["header_byte"] if runs else 0,
+            n_rows=len(df),
+        )
+        return {"mode": "full", "appended": len(df), "truncated": 0, "rows": len(df)}
+
+    def _save_combined_state(self, summary_path: Path, combined_path: Path, state: dict, **updates) -> None:
+        state = dict(state, **updates)
+        with open(combined_path, "rb") as f:
+            header = f.readline()
+            first = f.readline()
+        names, spans = header_spans(header.decode(errors="replace"))
+        st = combined_path.stat()
+        source = summary_path.stat()
+        state.update(
+            summary_size=source.st_size,
+            summary_mtime_ns=source.st_mtime_ns,
+            parser_version=PARSER_VERSION,
+            row_len=len(first),
+            stg_span=list(spans[names.index("stg")]) if "stg" in names else None,
+            combined_size=st.st_size,
+            combined_mtime_ns=st.st_mtime_ns,
+        )
+        state_path = summary_path.parent / self._combined_state_name
+        try:
+            tmp_path = state_path.with_suffix(".tmp")
+            with open(tmp_path, "w") as f:
+                json.dump(state, f)
+            os.replace(tmp_path, state_path)
+        except OSError as exc:
+            logging.warning(f"Could not write {state_path}: {exc}")
+
+    def _load_combined_state(self, summary_path: Path, combined_path: Path, start_stg: int):
+        """Return the state of the last ``update_combined`` if it is still usable."""
+        state_path = summary_path.parent / self._combined_state_name
+        try:
+            with open(state_path, "r") as f:
+                state = json.load(f)
+            st = combined_path.stat()
+            size = summary_path.stat().st_size
+            with open(combined_path, "rb") as f:
+                header_len = len(f.readline())
+            usable = (
+                state["parser_version"] == PARSER_VERSION
+                and state["start_stg"] == start_stg
+                and state["combined_size"] == st.st_size
+                and state["combined_mtime_ns"] == st.st_mtime_ns
+                and state["stg_span"] is not None
+                and (is_compressed(summary_path) or state["consumed_byte"] <= size)
+                # the combined rows must all have the same width to be truncated in place
+                and state["row_len"] > 0
+                and st.st_size - header_len == state["n_rows"] * state["row_len"]
+            )
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+        return state if usable else None
         
-        return self._coerce_dtypes(df_combined, dtype=float)
-        
 
-class HoshiHistoryCombined(HoshiHistory):
+class _SummaryFollower:
+    """Poll state of ``HoshiHistory.follow``.
+
+    Remembers the byte offset of ``summary.txt`` up to the last complete line
+    and the header of the current run, so every ``poll()`` only reads and
+    decodes what was appended since the previous one.
+    """
+
+    _profile_pattern = re.compile(r"str(\d+)\.txt$")
+
+    def __init__(self, history: "HoshiHistory", from_start: bool = False, profiles: bool = False):
+        if is_compressed(history.data_path):
+            # byte offsets of the plain file cannot be followed in a compressed stream
+            raise ValueError(
+                f"Cannot follow the compressed file {history.data_path}; "
+                "only a plain summary.txt written by a running model can be followed."
+            )
+        self.history = history
+        self.path = history.data_path
+        self.profiles = profiles
+        self.offset = 0
+        self.header = None
+        self.run = 0
+        if not from_start:
+            runs = history._run_index()
+            if runs:
+                self.header = runs[-1]["header"]
+                self.run = runs[-1]["index"]
+                self.offset = self._complete_end(runs[-1]["header_byte"], runs[-1]["end_byte"])
+        # profiles already present (or still being written) when following starts
+        self._profiles_seen = set() if from_start else set(self._list_profiles())
+        self._profiles_pending = {}
+
+    def _complete_end(self, start: int, end: int) -> int:
+        """Return the offset just after the last newline in ``[start, end)``."""
+        with open(self.path, "rb") as f:
+            f.seek(start)
+            return start + f.read(end - start).rfind(b"\n") + 1
+
+    def _list_profiles(self) -> dict:
+        writestr_dir = self.history.writestr_dir
+        if not self.profiles or not writestr_dir.is_dir():
+            return {}
+        found = {}
+        for entry in os.scandir(writestr_dir):
+            if self._profile_pattern.fullmatch(entry.name):
+                try:
+                    found[entry.name] = entry.stat().st_size
+                except OSError:
+                    continue
+        return found
+
+    def _decode(self, raw: bytes) -> np.ndarray:
+        names = self.history._parse_header_names(self.header)
+        block = _parse_fixed_width_block(raw, self.header, names)
+        if block is None:
+            df = pd.read_csv(
+                io.BytesIO(raw),
+                sep=r"\s+",
+                engine="python",
+                header=None,
+                names=names,
+                dtype=str,
+                na_values=["", "NaN", "nan"],
+                keep_default_na=True,
+            )
+            block = _frame_to_block(coerce_dtypes(df))
+            if block is None:
+                logging.warning(f"Skipping {len(df)} non-numeric rows of run {self.run}.")
+                return _block_to_records(names, np.empty((len(names), 0)))
+        return _block_to_records(names, block)
+
+    def poll(self) -> list:
+        """Return the events since the previous poll (see ``HoshiHistory.follow``)."""
+        events = []
+        try:
+            size = self.path.stat().st_size
+        except OSError:
+            size = 0
+        if size < self.offset:
+            logging.info(f"{self.path} shrank; following it from the beginning.")
+            events.append({"kind": "reset"})
+            self.offset, self.header, self.run = 0, None, 0
+        if size > self.offset:
+            with open(self.path, "rb") as f:
+                f.seek(self.offset)
+                tail = f.read(size - self.offset)
+            # a partially written last line is read again by the next poll
+            tail = tail[: tail.rfind(b"\n") + 1]
+            self.offset += len(tail)
+            pos = 0
+            for match in re.finditer(rb"^#[^\n]*\n", tail, flags=re.M):
+                self._emit_rows(tail[pos : match.start()], events)
+                self.header = match.group().decode(errors="replace").rstrip("\r\n")
+                self.run += 1
+                events.append({"kind": "run", "run": self.run, "header": self.header})
+                pos = match.end()
+            self._emit_rows(tail[pos:], events)
+
+        sizes = self._list_profiles()
+        for name in sorted(sizes):
+            if name in self._profiles_seen:
+                continue
+            # report a profile once its size stopped changing between two polls
+            if self._profiles_pending.get(name) == sizes[name] and sizes[name] > 0:
+                self._profiles_seen.add(name)
+                del self._profiles_pending[name]
+                str_num = int(self._profile_pattern.fullmatch(name).group(1))
+                events.append({"kind": "profile", "str_num": str_num, "path": self.history.writestr_dir / name})
+            else:
+                self._profiles_pending[name] = sizes[name]
+        return events
+
+    def _emit_rows(self, raw: bytes, events: list) -> None:
+        if not raw.strip():
+            return
+        if self.header is None:
+            n_rows = raw.count(b"\n")
+            logging.warning(f"Skipping {n_rows} rows found before the first header.")
+            return
+        records = self._decode(raw)
+        if len(records):
+            events.append({"kind": "rows", "run": self.run, "records": records})
+
+
+class _DecodedTable:
+    """Column access shared by the readers that load a whole table from a file.
+
+    Subclasses set ``data_path``, ``var_names``, ``engine``, ``cache`` and
+    ``dataframe`` and implement ``_parse_fast`` (fixed-width decoding of the
+    selected columns), ``_read_legacy`` (read_csv + ``coerce_dtypes``) and
+    ``_legacy_column``. The decoded ``(ncols, nrows)`` float block is kept so
+    that ``data()`` can hand out views instead of copies.
+    """
+
+    _cache_tag = ""
+
+    def _init_table(self, columns=None) -> None:
+        # position of every column name (the first one for repeated names)
+        self._var_index = {}
+        for i, name in enumerate(self.var_names):
+            self._var_index.setdefault(name, i)
+        self.columns = _check_columns(columns, self._var_index)
+        # decoded float table that data() returns views into, and its row names
+        self._block = None
+        self._block_index = {}
+        self._block_failed = False
+
+    def _set_block(self, names: list, block) -> None:
+        self._block = block
+        self._block_index = {name: i for i, name in enumerate(names)}
+
+    def _usecols(self, names: list | None = None):
+        names = self.columns if names is None else names
+        return None if names is None else [self._var_index[n] for n in names]
+
+    def _load_block(self):
+        """Decode the selected columns, going through the cache when enabled.
+
+        Returns ``(names, block)`` or None if the fast engine cannot decode the
+        file. A cache hit returns the full (memory-mapped) table; a miss with a
+        column projection decodes only those columns and is not stored.
+        """
+        if self.cache is not None:
+            with phase("cache_load", self.data_path):
+                hit = self.cache.load(self.data_path, tag=self._cache_tag)
+            if hit is not None and hit[0] == self.var_names:
+                logging.debug(f"Loaded {self.data_path} from cache.")
+                return hit
+        block = self._parse_fast(self._usecols())
+        if block is None:
+            return None
+        if self.columns is None and self.cache is not None:
+            with phase("cache_store", self.data_path, bytes=block.nbytes):
+                self.cache.store(self.data_path, self.var_names, block, tag=self._cache_tag)
+        return (self.columns or self.var_names), block
+
+    def _load_table(self) -> None:
+        """Load the selected columns into ``dataframe`` (full mode)."""
+        loaded = self._load_block() if self.engine == "fast" else None
+        if loaded is None:
+            self.dataframe = self._read_legacy(self.columns)
+            return
+        self._set_block(*loaded)
+        names = self.columns or self.var_names
+        rows = [self._block[self._block_index[name]] for name in names]
+        self.dataframe = _frame_from_decoded(names, rows, dtype=float)
+
+    def _data_block(self):
+        """Return the decoded block backing ``data()``, loading it on first use."""
+        if self._block is None and not self._block_failed:
+            if self.dataframe is not None:
+                block = _frame_to_block(self.dataframe)
+                if block is not None:
+                    self._set_block(list(self.dataframe.columns), block)
+            elif self.engine == "fast":
+                loaded = self._load_block()
+                if loaded is not None:
+                    self._set_block(*loaded)
+            # do not retry files the fast engine cannot decode
+            self._block_failed = self._block is None
+        return self._block
+
+    @instrumented("{cls}.data")
+    def data(self, var_name, dtype=float, structured: bool = False):
+        """Return one or several columns (variables) of the table.
+
+        With the fast engine the file is decoded once (also in quick mode) and
+        float columns are returned as read-only views into that table, which is
+        memory-mapped when loaded from the cache.
+
+        Args:
+            var_name: a column name, or a list of names to read in one pass.
+            dtype: ``float``, ``int`` or ``str``.
+            structured: for a list of names, return a NumPy structured array
+                instead of a dict of arrays.
+
+        Returns:
+            An array for a single name; a ``{name: array}`` dict (or structured
+            array) for a list of names. Unknown names are logged and skipped.
+        """
+        if not isinstance(var_name, str):
+            return self._data_many(list(var_name), dtype=dtype, structured=structured)
+
+        if var_name not in self._var_index:
+            logging.error(f"Variable name '{var_name}' not found in {self.data_path.name}.")
+            return np.array([])
+
+        if dtype in _NUMERIC_DTYPES and self._data_block() is not None and var_name in self._block_index:
+            return _block_column(self._block, self._block_index[var_name], dtype)
+
+        if self.dataframe is not None and var_name in self.dataframe.columns:
+            col_data = self.dataframe[var_name]
+            if dtype in (float, "float", "float64"):
+                return col_data.astype(float).to_numpy()
+            elif dtype in (int, "int", "int64"):
+                return col_data.astype(int).to_numpy()
+            else:
+                return col_data.to_numpy()
+
+        # outside the loaded projection (or not decodable): read just this column
+        if self.engine == "fast" and dtype in _NUMERIC_DTYPES:
+            block = self._parse_fast(self._usecols([var_name]))
+            if block is not None:
+                return _cast_decoded(block[0], dtype)
+        return self._legacy_column(var_name, dtype)
+
+    def _data_many(self, names: list, dtype=float, structured: bool = False):
+        unknown = [n for n in names if n not in self._var_index]
+        if unknown:
+            logging.error(f"Variable names {unknown} not found in {self.data_path.name}.")
+            names = [n for n in names if n in self._var_index]
+
+        result = None
+        if (
+            self._block is None
+            and self.dataframe is None
+            and self.cache is None
+            and self.engine == "fast"
+            and dtype in _NUMERIC_DTYPES
+        ):
+            # nothing loaded yet: decode only the requested columns, in one pass
+            block = self._parse_fast(self._usecols(names))
+            if block is not None:
+                result = {n: _cast_decoded(row, dtype) for n, row in zip(names, block)}
+        if result is None:
+            result = {n: self.data(n, dtype=dtype) for n in names}
+
+        if not structured:
+            return result
+        nrows = len(next(iter(result.values()))) if result else 0
+        out = np.empty(nrows, dtype=[(n, np.asarray(a).dtype) for n, a in result.items()])
+        for n, a in result.items():
+            out[n] = a
+        return out
+
+
+class HoshiHistoryCombined(_DecodedTable, HoshiHistory):
+    @instrumented("HoshiHistoryCombined")
     def __init__(
         self, 
         path: str | Path, 
         save_flag: bool = False,
         quick: bool = False,
+        engine: str = "fast",
+        cache=False,
+        columns: list | None = None,
+        incremental: bool = False,
+        binary: bool = False,
         ):
+        """Load the restart-stitched evolution history of a model.
+
+        Args:
+            path: model directory, ``summary`` directory or ``summary.txt``.
+            save_flag: write ``summary_combined.txt`` when it has to be generated.
+            quick: do not load the table; ``data()`` reads columns on demand.
+            engine: ``"fast"`` (fixed-width parser) or ``"legacy"`` (read_csv).
+            cache: opt-in binary cache of the decoded table (fast engine only):
+                ``True`` for the default location, a directory path, or a
+                ``SidecarCache``. See ``hoshi_workflow.hoshi_reader.cache``.
+            columns: names of the columns to load (default: all). Only these
+                columns are decoded and kept in ``dataframe``.
+            incremental: keep ``summary_combined.txt`` in sync with
+                ``summary.txt`` through ``update_combined`` (only the rows
+                appended since the last update are decoded) before loading it.
+            binary: load the table from ``summary_combined.npy`` (a structured
+                array with the same column names and dtypes) when it is newer
+                than the text files, and write it otherwise.
+        """
+        _check_engine(engine)
         super().__init__(path)
         new_path = self.data_path.parent / "summary_combined.txt"
         self.quick_mode = quick
+        self.engine = engine
+        self.cache = resolve_cache(cache) if engine == "fast" else None
+        self.dataframe = None
+        self._init_table(columns)
+        if incremental:
+            self.update_report = self.update_combined(cache=self.cache)
+        self.binary_path = new_path.with_suffix(".npy")
+        new_path = find_variant(new_path)
+        if binary and self._load_binary(new_path):
+            return
+        self._init_combined(new_path, save_flag, quick, engine)
+        if binary:
+            self._save_binary()
+
+    def _init_combined(self, new_path: Path, save_flag: bool, quick: bool, engine: str) -> None:
         self.data_path = new_path
         if not new_path.exists():
             logging.info("Generating combined summary data ...")
-            self.data_path = new_path.parent / "summary.txt"
-            self.dataframe = self._generate_combined_data(save_flag=save_flag)
+            self.data_path = find_variant(new_path.parent / "summary.txt")
+            hit = None
+            if self.cache is not None and not save_flag:
+                hit = self.cache.load(self.data_path, tag="combined")
+            if hit is not None and hit[0] == self.var_names:
+                logging.info("Loaded combined summary data from cache.")
+                self._set_block(*hit)
+                names = self.columns or self.var_names
+                rows = [self._block[self._block_index[name]] for name in names]
+                self.dataframe = _frame_from_decoded(names, rows, dtype=float)
+                return
+            self.dataframe = self._generate_combined_data(save_flag=save_flag, engine=engine)
             if save_flag:
                 self.data_path = new_path
                 logging.info(f"Combined summary data file created at {self.data_path}")
+            block = _frame_to_block(self.dataframe)
+            if self.cache is not None and block is not None and list(self.dataframe.columns) == self.var_names:
+                self.cache.store(self.data_path, self.var_names, block, tag="" if save_flag else "combined")
+            if self.columns is not None:
+                self.dataframe = self.dataframe[self.columns]
         else:
             if not quick:
                 logging.info("Loading existing combined summary data from file.")
-                self.dataframe = pd.read_csv(
-                    self.data_path,
-                    comment="#",
-                    sep=r"\s+",
-                    engine="python",
-                    header=0,
-                    names=self.var_names,
-                    dtype=str,
-                    na_values=["", "NaN", "nan"],
-                    keep_default_na=True,
-                )
-                self.dataframe = self._coerce_dtypes(self.dataframe, dtype=float)
+                self._load_table()
             else:
                 logging.info("Quick mode: skipping loading of combined summary data. To access data, use data() method which reads from file directly.")
                 self.dataframe = None
-        
-    def data(self, var_name: str, dtype=float) -> np.ndarray:
-        if var_name not in self.var_names:
-            logging.error(f"Variable name '{var_name}' not found in the combined data.")
-            return np.array([])
-        
-        if self.quick_mode or self.dataframe is None:
+
+    def _load_binary(self, text_path: Path) -> bool:
+        """Load ``summary_combined.npy`` if it is up to date; returns True on success."""
+        try:
+            mtime = self.binary_path.stat().st_mtime_ns
+        except OSError:
+            return False
+        sources = [self.data_path, text_path]
+        if any(p.exists() and p.stat().st_mtime_ns > mtime for p in sources):
+            logging.info(f"{self.binary_path.name} is older than the text files; ignoring it.")
+            return False
+        try:
+            records = np.load(self.binary_path, mmap_mode="r")
+        except (OSError, ValueError) as exc:
+            logging.warning(f"Could not read {self.binary_path}: {exc}")
+            return False
+        if list(records.dtype.names or ()) != self.var_names:
+            logging.info(f"{self.binary_path.name} has other columns than summary.txt; ignoring it.")
+            return False
+        names = self.columns or self.var_names
+        self.data_path = text_path if text_path.exists() else self.data_path
+        with phase("load_binary", self.binary_path, rows=records.size):
+            self.dataframe = pd.DataFrame({name: np.asarray(records[name]) for name in names})
+        logging.info(f"Loaded combined summary data from {self.binary_path.name}.")
+        return True
+
+    def _save_binary(self) -> None:
+        """Write the combined table to ``summary_combined.npy``."""
+        block = None
+        if self.columns is None and self.dataframe is not None:
+            block = _frame_to_block(self.dataframe)
+        elif self.data_path.name == "summary_combined.txt":
+            if self.columns is None and self._block is not None:
+                block = self._block
+            elif self.engine == "fast":
+                block = self._parse_fast()
+        if block is None or block.shape[0] != len(self.var_names):
+            logging.warning(f"Could not decode every column as numbers; not writing {self.binary_path.name}.")
+            return
+        try:
+            _save_binary_table(self.binary_path, self.var_names, block)
+        except OSError as exc:
+            logging.warning(f"Could not write {self.binary_path}: {exc}")
+            return
+        logging.info(f"Combined summary data saved to {self.binary_path}")
+
+    def refresh(self) -> dict:
+        """Fold the rows appended to ``summary.txt`` into the loaded history.
+
+        Runs ``update_combined`` (creating ``summary_combined.txt`` if needed)
+        and reloads the table when it changed. Returns the update report.
+        """
+        report = self.update_combined(cache=self.cache)
+        self.data_path = self.data_path.parent / "summary_combined.txt"
+        if report["mode"] != "unchanged" or self.dataframe is None and not self.quick_mode:
+            self._init_table(self.columns)
+            self.dataframe = None
+            if not self.quick_mode:
+                self._load_table()
+        return report
+
+    def _parse_fast(self, usecols: list | None = None):
+        """Decode ``summary_combined.txt`` with the fixed-width engine (None on failure)."""
+        with phase("read", self.data_path) as rec:
+            raw = read_source(self.data_path)
+            rec["bytes"] = len(raw)
+        split = raw.find(b"\n") + 1 if b"\n" in raw else len(raw)
+        header, body = raw[:split].decode(errors="replace"), raw[split:]
+        return _parse_fixed_width_block(body, header, self.var_names, usecols=usecols)
+
+    def _read_legacy(self, columns: list | None = None) -> pd.DataFrame:
+        with phase("read_csv", self.data_path) as rec:
+            df = pd.read_csv(
+                self.data_path,
+                comment="#",
+                sep=r"\s+",
+                engine="python",
+                header=0,
+                names=self.var_names,
+                usecols=columns,
+                dtype=str,
+                na_values=["", "NaN", "nan"],
+                keep_default_na=True,
+            )
+            rec["rows"] = len(df)
+        if columns is not None:
+            df = df[columns]
+        return self._coerce_dtypes(df, dtype=float)
+
+    def _legacy_column(self, var_name: str, dtype=float) -> np.ndarray:
+        with phase("read_csv", self.data_path) as rec:
             df = pd.read_csv(
                 self.data_path,
                 sep=r"\s+",
@@ -591,39 +2080,61 @@ class HoshiHistoryCombined(HoshiHistory):
                 na_values=["", "NaN", "nan"],
                 keep_default_na=True,
             )
-            return _clean_series_and_cast(df[var_name], dtype)
-        else:
-            col_data = self.dataframe[var_name]
-            if dtype in (float, "float", "float64"):
-                return col_data.astype(float).to_numpy()
-            elif dtype in (int, "int", "int64"):
-                return col_data.astype(int).to_numpy()
-            else:
-                return col_data.to_numpy()
+            rec["rows"] = len(df)
+        return _clean_series_and_cast(df[var_name], dtype)
+
 
+def _find_profile_pack(path: Path):
+    """Return the writestr container that serves the profile ``path``, or None."""
+    from .pack import find_pack
 
-class HoshiProfile(HoshiModel):
+    pack = find_pack(path.parent)
+    return pack if pack is not None and pack.serves(path) else None
+
+
+class HoshiProfile(_DecodedTable, HoshiModel):
+    # metadata line, blank line and column header precede the zone records
+    _n_header_lines = 3
+
+    @instrumented("HoshiProfile")
     def __init__(
         self, 
         path: str, 
         str_num: int,
         quick: bool = False,
+        engine: str = "fast",
+        cache=False,
+        columns: list | None = None,
         ):
+        """Load one writestr profile ``strXXXXX.txt``.
+
+        Args:
+            path: model directory, ``writestr`` directory or the profile file.
+            str_num: stage number of the profile.
+            quick: do not load the table; ``data()`` reads columns on demand.
+            engine: ``"fast"`` (fixed-width parser) or ``"legacy"`` (read_csv).
+            cache: opt-in binary cache of the decoded table (fast engine only):
+                ``True`` for the default location, a directory path, or a
+                ``SidecarCache``. See ``hoshi_workflow.hoshi_reader.cache``.
+            columns: names of the columns to load (default: all). Only these
+                columns are decoded and kept in ``dataframe``.
+        """
+        _check_engine(engine)
         p = Path(path)
         target = f"str{str_num:05d}.txt"
         # Determine work_dir and profile data_path
-        if p.is_file() and str(path).endswith(target):
+        if source_name(p) == target and (p.is_file() or _find_profile_pack(p) is not None):
             # path is the profile file inside work_dir/writestr/strXXXXX.txt
             work_dir = p.parent.parent
             data_path = p
         elif str(path).endswith("writestr"):
             # path is the writestr directory
             work_dir = p.parent
-            data_path = p / target
+            data_path = find_variant(p / target)
         elif p.is_dir() and (p / "evol").exists():
             # path is the model/work directory
             work_dir = p
-            data_path = p / "writestr" / target
+            data_path = find_variant(p / "writestr" / target)
         else:
             logging.error(
                 "Invalid path provided. Path should be either a directory or a profile file."
@@ -633,61 +2144,176 @@ class HoshiProfile(HoshiModel):
         # initialize base to set work_dir and related dirs
         super().__init__(work_dir)
         self.data_path = data_path
+        # the writestr container holding this profile, if it is read from one
+        self._pack = _find_profile_pack(data_path)
         self.var_names = self._get_var_names()
         self.quick_mode = quick
+        self.engine = engine
+        self.cache = resolve_cache(cache) if engine == "fast" and self._pack is None else None
+        self.dataframe = None
+        self._init_table(columns)
         if not quick:
-            df = pd.read_csv(
-                self.data_path,
-                comment="#",
-                sep=r"\s+",
-                engine="python",
-                header=0,
-                names=self.var_names,
-                dtype=str,
-                na_values=["", "NaN", "nan"],
-                keep_default_na=True,
-            )
-            self.dataframe = coerce_dtypes(df, dtype=float)
+            self._load_table()
         else:
-            self.dataframe = None
             logging.info("Quick mode: skipping loading of profile data. To access data, use data() method which reads from file directly.")
             return
 
     def _get_var_names(self) -> list:
-        with open(self.data_path, "r") as file:
+        if self._pack is not None:
+            return list(self._pack.entry(self.data_path.name)["columns"])
+        with open_source(self.data_path, "r") as file:
             for _ in range(2):
                 next(file)
             header_line = next(file)
 
-        cleaned_header = header_line.replace("#", "")
-        cleaned_header = re.sub(r"\d+:", " ", cleaned_header)
-        variable_names = cleaned_header.split()
+        return header_spans(header_line)[0]
+
+    def _zone_locator(self):
+        """Return ``(locator, header)`` of the zone records, cached per file version."""
+        st = self.data_path.stat()
+        key = (st.st_size, st.st_mtime_ns)
+        if getattr(self, "_zone_locator_key", None) != key:
+            with open(self.data_path, "rb") as f:
+                for _ in range(self._n_header_lines - 1):
+                    f.readline()
+                header = f.readline().decode(errors="replace")
+                start = f.tell()
+            self._zone_locator_cache = (_RowLocator(self.data_path, start, st.st_size), header)
+            self._zone_locator_key = key
+        return self._zone_locator_cache
+
+    def _read_sorted_range(self, var_name: str, lo, hi, columns: list | None, dtype=float) -> pd.DataFrame:
+        """Read the zones with ``lo <= var_name <= hi`` (``var_name`` increasing outwards)."""
+        columns = _check_columns(columns, self.var_names)
+        if var_name not in self.var_names:
+            raise ValueError(f"Unknown column {var_name!r}; available columns are {self.var_names}")
+        names = columns or self.var_names
+        lo = -np.inf if lo is None else lo
+        hi = np.inf if hi is None else hi
+
+        block, index = self._block, self._block_index
+        seekable = self._pack is None and not is_compressed(self.data_path)
+        if not seekable and not (block is not None and all(n in index for n in names + [var_name])):
+            # packed or compressed: decode the whole profile and slice it
+            block, index = self._parse_fast(), {n: i for i, n in enumerate(self.var_names)}
+        if block is not None and all(n in index for n in names + [var_name]):
+            # already decoded: slice the table in memory
+            key = block[index[var_name]]
+            i, j = np.searchsorted(key, lo, side="left"), np.searchsorted(key, hi, side="right")
+            return _frame_from_decoded(names, [block[index[n]][i:j] for n in names], dtype=dtype)
+
+        locator, header = self._zone_locator()
+        _, spans = header_spans(header)
+        span = spans[self._var_index[var_name]]
+        with open(self.data_path, "rb") as f:
+            i = locator.search(f, span, lo, side="left")
+            j = locator.search(f, span, hi, side="right")
+            raw = locator.read(f, i, j)
+        if not raw:
+            return pd.DataFrame(columns=names)
+        if self.engine == "fast":
+            rows = _parse_fixed_width_block(raw, header, self.var_names, usecols=self._usecols(names))
+            if rows is not None:
+                return _frame_from_decoded(names, rows, dtype=dtype)
+        with phase("read_csv", bytes=len(raw)) as rec:
+            df = pd.read_csv(
+                io.BytesIO(raw),
+                sep=r"\s+",
+                engine="python",
+                header=None,
+                names=self.var_names,
+                usecols=names,
+                dtype=str,
+                na_values=["", "NaN", "nan"],
+                keep_default_na=True,
+            )
+            rec["rows"] = len(df)
+        return coerce_dtypes(df[names], dtype=dtype)
 
-        return variable_names
+    @instrumented("HoshiProfile.read_zones")
+    def read_zones(self, j_min: int | None = None, j_max: int | None = None, columns: list | None = None, dtype=float) -> pd.DataFrame:
+        """Read the zones ``j_min <= j <= j_max`` only.
 
-    def data(self, var_name: str, dtype=float) -> np.ndarray:
-        if var_name not in self.var_names:
-            logging.error(f"Variable name '{var_name}' not found in the file.")
-            return np.array([])
+        Zones are located by a binary search on ``j`` over the computed record
+        offsets, so only the requested records are read from the file (or the
+        already loaded table is sliced).
+
+        Args:
+            j_min, j_max: inclusive zone range (``None`` for no bound).
+            columns: names of the columns to return (default: all).
+            dtype: preferred numeric dtype (see ``coerce_dtypes``).
+        """
+        return self._read_sorted_range("j", j_min, j_max, columns, dtype=dtype)
 
-        if self.quick_mode or self.dataframe is None:
+    @instrumented("HoshiProfile.read_mass_range")
+    def read_mass_range(
+        self,
+        m_min: float | None = None,
+        m_max: float | None = None,
+        columns: list | None = None,
+        dtype=float,
+        mass_col: str = "Mr",
+    ) -> pd.DataFrame:
+        """Read the zones with ``m_min <= Mr <= m_max`` (in the units of ``mass_col``).
+
+        Works like ``read_zones`` with a binary search on the mass coordinate,
+        which increases from the centre outwards.
+        """
+        return self._read_sorted_range(mass_col, m_min, m_max, columns, dtype=dtype)
+
+    def _parse_fast(self, usecols: list | None = None):
+        """Decode the zone records with the fixed-width engine (None on failure)."""
+        if self._pack is not None:
+            with phase("read_pack", self.data_path) as rec:
+                block = self._pack.read(self.data_path.name, usecols)
+                rec["bytes"] = block.nbytes
+            return block
+        with phase("read", self.data_path) as rec:
+            raw = read_source(self.data_path)
+            rec["bytes"] = len(raw)
+        pos = 0
+        for _ in range(self._n_header_lines):
+            start, pos = pos, raw.find(b"\n", pos) + 1 or len(raw)
+        header, body = raw[start:pos].decode(errors="replace"), raw[pos:]
+        return _parse_fixed_width_block(body, header, self.var_names, usecols=usecols)
+
+    def _read_legacy(self, columns: list | None = None) -> pd.DataFrame:
+        if self._pack is not None:
+            return _frame_from_decoded(columns or self.var_names, self._parse_fast(self._usecols(columns)))
+        with phase("read_csv", self.data_path) as rec:
             df = pd.read_csv(
                 self.data_path,
+                comment="#",
                 sep=r"\s+",
                 engine="python",
-                header=0,
+                header=None,
+                skiprows=self._n_header_lines,
+                names=self.var_names,
+                usecols=columns,
+                dtype=str,
+                na_values=["", "NaN", "nan"],
+                keep_default_na=True,
+            )
+            rec["rows"] = len(df)
+        if columns is not None:
+            df = df[columns]
+        return coerce_dtypes(df, dtype=float)
+
+    def _legacy_column(self, var_name: str, dtype=float) -> np.ndarray:
+        if self._pack is not None:
+            return _block_column(self._parse_fast([self._var_index[var_name]]), 0, dtype)
+        with phase("read_csv", self.data_path) as rec:
+            df = pd.read_csv(
+                self.data_path,
+                sep=r"\s+",
+                engine="python",
+                header=None,
+                skiprows=self._n_header_lines,
+                names=self.var_names,
                 usecols=[var_name],
                 dtype=str,
                 na_values=["", "NaN", "nan"],
                 keep_default_na=True,
             )
-            return _clean_series_and_cast(df[var_name], dtype)
-        else:
-            col_data = self.dataframe[var_name]
-            if dtype in (float, "float", "float64"):
-                return col_data.astype(float).to_numpy()
-            elif dtype in (int, "int", "int64"):
-                return col_data.astype(int).to_numpy()
-            else:
-                return col_data.to_numpy()
-
+            rec["rows"] = len(df)
+        return _clean_series_and_cast(df[var_name], dtype)
@@ -0,0 +1,247 @@
+"""Opt-in per-phase timing and memory instrumentation of the readers.
+
+The readers mark their phases (header scan, file read, fixed-width decoding,
+``read_csv``, ``coerce_dtypes``, stitching, ``pd.concat``, writing
+``summary_combined.txt``, ...) with ``phase``. Nothing is recorded unless
+instrumentation is enabled, either for a block of code::
+
+    with instrument() as report:
+        HoshiHistoryCombined(model_dir)
+    print(report)            # one line per phase, nested by call
+    report.summary()         # totals per phase name
+
+or for the whole process by setting the ``HOSHI_INSTRUMENT`` environment
+variable (``1``: time and memory, ``time``: time only); the records are then
+collected in ``environment_report()``.
+
+Every record holds the wall time, the bytes read or written and the rows
+parsed where the phase knows them, and, when memory tracking is on, the
+``tracemalloc`` peak above the memory in use when the phase started
+(including its sub-phases). Each record is also logged at DEBUG level.
+
+Phases running in worker threads (e.g. the run groups decoded concurrently
+by ``_generate_combined_data``) are recorded without a parent; their memory
+peaks are approximate because ``tracemalloc`` tracks the whole process.
+"""
+
+from contextlib import contextmanager
+import functools
+import logging
+import os
+import threading
+import time
+import tracemalloc
+
+ENV_VAR = "HOSHI_INSTRUMENT"
+
+# reports collecting records, innermost last
+_reports: list = []
+# per-thread stack of the open phases
+_local = threading.local()
+_env_report = None
+
+
+class InstrumentReport:
+    """Records of the instrumented reader phases.
+
+    Attributes:
+        records: one dict per finished phase, in completion order (sub-phases
+            before their parent), with ``phase``, ``parent``, ``depth``,
+            ``path``, ``seconds``, ``bytes``, ``rows`` and ``peak_bytes``
+            (None when not known or not tracked).
+        memory: whether ``tracemalloc`` peaks are recorded.
+        log: whether records are logged at DEBUG level.
+    """
+
+    def __init__(self, memory: bool = True, log: bool = True):
+        self.memory = memory
+        self.log = log
+        self.records = []
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __repr__(self) -> str:
+        return f"InstrumentReport({len(self.records)} records, memory={self.memory})"
+
+    def __str__(self) -> str:
+        lines = [f"{'phase':40s} {'ms':>10s} {'MB':>9s} {'rows':>10s} {'peak MB':>9s}"]
+        for rec in sorted(self.records, key=lambda r: r["start"]):
+            name = "  " * rec["depth"] + rec["phase"]
+            lines.append(
+                f"{name:40s} {rec['seconds'] * 1e3:10.1f} {_fmt(rec['bytes'], 1e6):>9s} "
+                f"{_fmt(rec['rows'], 1):>10s} {_fmt(rec['peak_bytes'], 1e6):>9s}"
+            )
+        return "\n".join(lines)
+
+    def add(self, record: dict) -> None:
+        with self._lock:
+            self.records.append(record)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.records = []
+
+    def summary(self) -> dict:
+        """Return ``{phase: totals}`` with the ``calls``, total ``seconds``,
+        ``bytes`` and ``rows`` and the largest ``peak_bytes`` of every phase name.
+        """
+        out = {}
+        for rec in self.records:
+            tot = out.setdefault(rec["phase"], {"calls": 0, "seconds": 0.0, "bytes": 0, "rows": 0, "peak_bytes": None})
+            tot["calls"] += 1
+            tot["seconds"] += rec["seconds"]
+            tot["bytes"] += rec["bytes"] or 0
+            tot["rows"] += rec["rows"] or 0
+            if rec["peak_bytes"] is not None:
+                tot["peak_bytes"] = max(tot["peak_bytes"] or 0, rec["peak_bytes"])
+        return out
+
+    def to_frame(self):
+        """Return the records as a pandas DataFrame."""
+        import pandas as pd
+
+        return pd.DataFrame(self.records, columns=["phase", "parent", "depth", "path", "start", "seconds", "bytes", "rows", "peak_bytes"])
+
+
+def _fmt(value, scale: float) -> str:
+    if value is None:
+        return "-"
+    return f"{value / scale:.1f}" if scale != 1 else str(value)
+
+
+def environment_report() -> InstrumentReport | None:
+    """Return the report filled while ``HOSHI_INSTRUMENT`` is set (None before any record)."""
+    return _env_report
+
+
+def _active_report() -> InstrumentReport | None:
+    global _env_report
+    if _reports:
+        return _reports[-1]
+    mode = os.environ.get(ENV_VAR, "")
+    if mode in ("", "0"):
+        return None
+    memory = mode.lower() != "time"
+    if _env_report is None or _env_report.memory != memory:
+        _env_report = InstrumentReport(memory=memory)
+    if memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    return _env_report
+
+
+@contextmanager
+def instrument(memory: bool = True, log: bool = True):
+    """Record the reader phases run inside the ``with`` block.
+
+    Args:
+        memory: also record ``tracemalloc`` peaks (slows allocation-heavy
+            phases down; tracing is started for the block if it is off).
+        log: log every record at DEBUG level.
+
+    Yields:
+        The ``InstrumentReport`` that collects the records.
+    """
+    report = InstrumentReport(memory=memory, log=log)
+    started = memory and not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    _reports.append(report)
+    try:
+        yield report
+    finally:
+        _reports.remove(report)
+        if started:
+            tracemalloc.stop()
+
+
+class _Null(dict):
+    """Record handed out when instrumentation is off; updates are discarded."""
+
+    def __setitem__(self, key, value) -> None:
+        pass
+
+
+_NULL = _Null()
+
+
+@contextmanager
+def phase(name: str, path=None, **counts):
+    """Mark a reader phase.
+
+    Yields a record dict; the phase may set its ``bytes`` and ``rows`` entries
+    (or pass them as keyword arguments). When instrumentation is off the
+    record is a throwaway and nothing is measured.
+    """
+    report = _active_report()
+    if report is None:
+        yield _NULL
+        return
+
+    stack = getattr(_local, "stack", None)
+    if stack is None:
+        stack = _local.stack = []
+    parent = stack[-1] if stack else None
+    rec = {
+        "phase": name,
+        "parent": parent["phase"] if parent else None,
+        "depth": len(stack),
+        "path": str(path) if path is not None else None,
+        "start": time.perf_counter(),
+        "seconds": 0.0,
+        "bytes": counts.get("bytes"),
+        "rows": counts.get("rows"),
+        "peak_bytes": None,
+    }
+    tracing = report.memory and tracemalloc.is_tracing()
+    if tracing:
+        current, peak = tracemalloc.get_traced_memory()
+        if parent is not None:
+            parent["_peak"] = max(parent.get("_peak", 0), peak)
+        tracemalloc.reset_peak()
+        rec["_base"] = current
+    stack.append(rec)
+    try:
+        yield rec
+    finally:
+        stack.pop()
+        rec["seconds"] = time.perf_counter() - rec["start"]
+        if tracing:
+            peak = max(tracemalloc.get_traced_memory()[1], rec.pop("_peak", 0))
+            rec["peak_bytes"] = max(peak - rec.pop("_base"), 0)
+            if parent is not None:
+                parent["_peak"] = max(parent.get("_peak", 0), peak)
+        report.add(rec)
+        if report.log:
+            logging.debug(
+                f"[instrument] {'  ' * rec['depth']}{name}: {rec['seconds'] * 1e3:.1f} ms"
+                f", bytes={rec['bytes']}, rows={rec['rows']}, peak={_fmt(rec['peak_bytes'], 1e6)} MB"
+                + (f" ({rec['path']})" if rec["path"] else "")
+            )
+
+
+def instrumented(name: str):
+    """Decorator recording a reader method as a phase (with ``self.data_path``).
+
+    ``{cls}`` in ``name`` is replaced by the class name of the instance.
+    """
+
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            if not _reports and os.environ.get(ENV_VAR, "") in ("", "0"):
+                return func(self, *args, **kwargs)
+            with phase(name.format(cls=type(self).__name__)) as rec:
+                result = func(self, *args, **kwargs)
+                path = getattr(self, "data_path", None)
+                rec["path"] = str(path) if path is not None else None
+                # rows of the returned table, or of the table a constructor loaded
+                table = result if result is not None else getattr(self, "dataframe", None)
+                if hasattr(table, "__len__") and not isinstance(table, dict):
+                    rec["rows"] = len(table)
+            return result
+
+        return wrapper
+
+    return decorate
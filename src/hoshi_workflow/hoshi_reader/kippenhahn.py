@@ -0,0 +1,224 @@
+"""Kippenhahn diagrams from the writestr profiles of a model.
+
+``kippenhahn`` regrids profile quantities (energy generation, entropy,
+convective flags, ...) onto a uniform raster of a history quantity (the age by
+default) against mass or radius, ready for ``imshow``/``pcolormesh``::
+
+    history = HoshiHistoryCombined(model_dir, quick=True)
+    khd = kippenhahn(history, variables=["epn", "cv"], cache=True)
+    plt.imshow(np.log10(khd.values["epn"]), origin="lower", aspect="auto", extent=khd.extent)
+
+Every column of the raster shows the profile nearest in ``x``, so only as many
+profiles as there are columns are read, and the regridding is done for all of
+them at once with array operations. With ``cache`` the raster is stored
+next to ``summary.txt`` so restyling a plot does not read the profiles again.
+"""
+
+import hashlib
+import json
+import logging
+
+import numpy as np
+
+from .cache import resolve_cache
+from .catalog import ProfileCatalog
+from .series import HoshiProfileSeries
+
+# names accepted for the vertical axis
+Y_COLUMNS = {"mass": "Mr", "radius": "Radius"}
+
+
+class KippenhahnRaster:
+    """Result of ``kippenhahn``.
+
+    Attributes:
+        x: ``(nx,)`` centres of the raster columns (history quantity).
+        y: ``(ny,)`` centres of the raster rows (mass or radius).
+        values: ``{name: (ny, nx) array}``; NaN outside the star.
+        stages: ``(nx,)`` stage of the profile shown in every column.
+        surface: ``(nx,)`` outermost ``y`` of that profile.
+        extent: ``(x0, x1, y0, y1)`` edges for ``imshow``.
+    """
+
+    def __init__(self, x, y, values: dict, stages, surface):
+        self.x = np.asarray(x)
+        self.y = np.asarray(y)
+        self.values = values
+        self.stages = np.asarray(stages)
+        self.surface = np.asarray(surface)
+
+    def __repr__(self) -> str:
+        return f"KippenhahnRaster(nx={self.x.size}, ny={self.y.size}, values={list(self.values)})"
+
+    @property
+    def extent(self) -> tuple:
+        dx = (self.x[-1] - self.x[0]) / max(self.x.size - 1, 1) / 2
+        dy = (self.y[-1] - self.y[0]) / max(self.y.size - 1, 1) / 2
+        return (self.x[0] - dx, self.x[-1] + dx, self.y[0] - dy, self.y[-1] + dy)
+
+    def _to_arrays(self) -> dict:
+        arrays = {"x": self.x, "y": self.y, "stages": self.stages, "surface": self.surface}
+        arrays.update({f"value:{name}": v for name, v in self.values.items()})
+        return arrays
+
+    @classmethod
+    def _from_arrays(cls, arrays: dict) -> "KippenhahnRaster":
+        values = {k.split(":", 1)[1]: v for k, v in arrays.items() if k.startswith("value:")}
+        return cls(arrays["x"], arrays["y"], values, arrays["stages"], arrays["surface"])
+
+
+def _uniform(lo: float, hi: float, n: int) -> np.ndarray:
+    return np.linspace(lo, hi, n) if n > 1 else np.array([(lo + hi) / 2])
+
+
+def regrid_profiles(y: np.ndarray, values: np.ndarray, ndv: np.ndarray, grid: np.ndarray, flag: bool = False) -> np.ndarray:
+    """Interpolate profiles given on their own zones onto a common grid.
+
+    All profiles are handled at once: the rows are shifted into disjoint
+    ranges so a single ``np.searchsorted`` locates every grid point.
+
+    Args:
+        y: ``(n_profiles, n_zones)`` increasing coordinate (NaN beyond ``ndv``).
+        values: ``(n_profiles, n_zones)`` quantity to regrid.
+        ndv: number of valid zones of every profile.
+        grid: ``(n_grid,)`` increasing target coordinates.
+        flag: take the value of the zone containing each grid point instead of
+            interpolating linearly (for integer flags such as ``cv``).
+
+    Returns:
+        ``(n_profiles, n_grid)`` array; grid points below the first zone take its
+        value, points above the last zone are NaN.
+    """
+    n_prof, n_zones = y.shape
+    ndv = np.asarray(ndv, dtype=np.int64)
+    g0, g1 = grid[0], grid[-1]
+    scale = (g1 - g0) if g1 > g0 else 1.0
+    # normalised coordinates of every row shifted into [4 i - 1, 4 i + 2]
+    valid = np.arange(n_zones) < ndv[:, None]
+    yn = np.where(valid, np.clip((y - g0) / scale, -1.0, 2.0), 2.0)
+    offset = 4.0 * np.arange(n_prof)[:, None]
+    keys = (yn + offset).ravel()
+    targets = ((grid - g0) / scale)[None, :] + offset
+    pos = np.searchsorted(keys, targets.ravel(), side="left").reshape(n_prof, -1)
+    idx = pos - np.arange(n_prof)[:, None] * n_zones
+
+    rows = np.arange(n_prof)[:, None]
+    inside = idx < ndv[:, None]
+    hi = np.minimum(idx, n_zones - 1)
+    if flag:
+        out = values[rows, hi].astype(np.float64)
+    else:
+        lo = np.maximum(idx - 1, 0)
+        y_lo, y_hi = y[rows, lo], y[rows, hi]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            w = np.where(y_hi > y_lo, (grid[None, :] - y_lo) / (y_hi - y_lo), 0.0)
+        w = np.where(idx == 0, 1.0, w)
+        out = values[rows, lo] * (1.0 - w) + values[rows, hi] * w
+    out[~inside] = np.nan
+    return out
+
+
+def kippenhahn(
+    history,
+    variables=("epn", "entropy", "cv"),
+    stages=None,
+    x: str = "time",
+    y: str = "mass",
+    nx: int = 400,
+    ny: int = 300,
+    x_range: tuple | None = None,
+    y_range: tuple | None = None,
+    log_x: bool = False,
+    flags=("cv",),
+    catalog: ProfileCatalog | None = None,
+    workers: int | None = None,
+    cache=False,
+) -> KippenhahnRaster:
+    """Regrid profile quantities onto a uniform ``(x, y)`` raster.
+
+    Args:
+        history: a ``HoshiHistoryCombined`` providing ``x`` for every stage.
+        variables: profile columns to regrid.
+        stages: profiles to use (default: every profile of the catalog that
+            has a row in ``history``).
+        x: history column of the horizontal axis (``"time"``, ``"stg"``, ...).
+        y: ``"mass"`` (``Mr``), ``"radius"`` (``Radius``) or a profile column.
+        nx, ny: raster size.
+        x_range, y_range: raster limits (default: range of the data).
+        log_x: use ``log10(x)`` for the horizontal axis.
+        flags: variables taken from the zone containing each raster cell
+            instead of being interpolated.
+        catalog: an existing ``ProfileCatalog`` of the model.
+        workers: threads used to read the profiles.
+        cache: store/reuse the raster (``cache=`` argument as for the readers).
+
+    Returns:
+        A ``KippenhahnRaster``.
+    """
+    variables = list(variables)
+    y_col = Y_COLUMNS.get(y, y)
+    catalog = catalog if catalog is not None else ProfileCatalog(history, workers=workers)
+
+    columns = history.data(["stg", x])
+    hist_stg = np.asarray(columns["stg"], dtype=np.int64)
+    hist_x = np.asarray(columns[x], dtype=np.float64)
+    prof_stg = catalog.stg if stages is None else np.intersect1d(catalog.stg, np.asarray(stages))
+    pos = np.searchsorted(hist_stg, prof_stg).clip(max=max(hist_stg.size - 1, 0))
+    known = hist_stg[pos] == prof_stg if hist_stg.size else np.zeros(prof_stg.size, dtype=bool)
+    if not known.all():
+        logging.warning(f"{int((~known).sum())} profiles have no row in the history; skipping them.")
+    prof_stg, prof_x = prof_stg[known], hist_x[pos[known]]
+    if log_x:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            prof_x = np.log10(prof_x)
+    finite = np.isfinite(prof_x)
+    prof_stg, prof_x = prof_stg[finite], prof_x[finite]
+    if prof_stg.size == 0:
+        raise ValueError("kippenhahn: no profile to show")
+    order = np.argsort(prof_x, kind="stable")
+    prof_stg, prof_x = prof_stg[order], prof_x[order]
+
+    x0, x1 = x_range if x_range is not None else (prof_x[0], prof_x[-1])
+    x_grid = _uniform(x0, x1, nx)
+    # nearest profile of every column
+    right = np.searchsorted(prof_x, x_grid).clip(1, max(prof_x.size - 1, 1))
+    left = right - 1
+    if prof_x.size > 1:
+        nearest = np.where(np.abs(prof_x[left] - x_grid) <= np.abs(prof_x[right] - x_grid), left, right)
+    else:
+        nearest = np.zeros(nx, dtype=np.int64)
+    used, column = np.unique(prof_stg[nearest], return_inverse=True)
+
+    store, tag = resolve_cache(cache), None
+    if store is not None:
+        rows = np.searchsorted(catalog.stg, used)
+        entries = [(catalog.names[i], int(catalog.stg[i])) for i in rows]
+        params = [variables, x, y_col, nx, ny, list(map(float, (x0, x1))), y_range, log_x, list(flags), entries]
+        stats = [(catalog.names[i], int(catalog.mtime_ns[i])) for i in rows]
+        digest = hashlib.sha1(json.dumps([params, stats], default=str).encode()).hexdigest()[:16]
+        tag = f"kippenhahn-{digest}"
+        hit = store.load_arrays(history.data_path, tag)
+        if hit is not None:
+            logging.info("Loaded Kippenhahn raster from cache.")
+            return KippenhahnRaster._from_arrays(hit)
+
+    series = HoshiProfileSeries(
+        catalog.writestr_dir, stages=used, columns=[y_col] + [v for v in variables if v != y_col],
+        workers=workers, catalog=catalog,
+    )
+    y_prof = series.var(y_col)
+    surface = y_prof[np.arange(len(series)), series.ndv - 1]
+    if y_range is not None:
+        y0, y1 = y_range
+    else:
+        y0, y1 = min(0.0, float(np.nanmin(y_prof))), float(np.nanmax(surface))
+    y_grid = _uniform(y0, y1, ny)
+
+    values = {}
+    for name in variables:
+        regridded = regrid_profiles(y_prof, series.var(name), series.ndv, y_grid, flag=name in flags)
+        values[name] = regridded[column].T
+    raster = KippenhahnRaster(x_grid, y_grid, values, used[column], surface[column])
+    if store is not None:
+        store.store_arrays(history.data_path, raster._to_arrays(), tag)
+    return raster
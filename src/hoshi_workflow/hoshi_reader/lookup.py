@@ -0,0 +1,125 @@
+"""Conversions between age, stage number and writestr profile of a model.
+
+``ModelIndex`` is built once from the ``stg`` and ``time`` columns of the
+combined history and from the profile catalog, and then answers batched
+conversions with binary searches::
+
+    index = HoshiModel(model_dir).lookup()
+    index.stage_at_time([1e13, 2e14])          # nearest stages
+    index.profile_at_time_to_end(3.15e13)      # profile ~1 Myr before the end
+    index.profile_path(index.profile_at_stage(2400))
+
+Besides the age (``time``, in the units of the summary) the index carries the
+reversed "time until end" axis ``time[-1] - time`` used for late phases in the
+khd plots.
+"""
+
+import logging
+
+import numpy as np
+
+from .cache import resolve_cache
+from .catalog import ProfileCatalog
+from .hoshi_reader import HoshiHistoryCombined, find_nearest
+
+
+class ModelIndex:
+    """Sorted lookup tables of a model's history and profiles.
+
+    Args:
+        model: a ``HoshiModel`` (or subclass) or a model directory.
+        history: an existing ``HoshiHistoryCombined`` of the model.
+        catalog: an existing ``ProfileCatalog`` of the model.
+        cache: store/reuse the ``stg``/``time`` columns (``cache=`` argument as
+            for the readers), keyed on ``summary.txt``.
+
+    Attributes:
+        stg, time: stages and ages of the combined history, sorted by stage.
+        time_to_end: ``time[-1] - time`` (decreasing).
+        profile_stg, profile_time: stages and ages of the available profiles.
+        catalog: the ``ProfileCatalog`` used for the profile paths.
+
+    All conversion methods take a scalar or an array and return an array.
+    """
+
+    def __init__(self, model, history: HoshiHistoryCombined | None = None, catalog: ProfileCatalog | None = None, cache=False):
+        if history is None:
+            history = HoshiHistoryCombined(getattr(model, "work_dir", model), quick=True, cache=cache)
+        self.catalog = catalog if catalog is not None else ProfileCatalog(history)
+
+        store = resolve_cache(cache)
+        source = history.data_path.parent / "summary.txt"
+        hit = store.load_arrays(source, "lookup") if store is not None else None
+        if hit is not None:
+            logging.info("Loaded stage/time index from cache.")
+            stg, time = hit["stg"], hit["time"]
+        else:
+            columns = history.data(["stg", "time"])
+            stg = np.asarray(columns["stg"], dtype=np.int64)
+            time = np.asarray(columns["time"], dtype=np.float64)
+            if store is not None:
+                store.store_arrays(source, {"stg": stg, "time": time}, "lookup")
+        if np.any(np.diff(stg) <= 0):
+            order = np.argsort(stg, kind="stable")
+            stg, time = stg[order], time[order]
+        if np.any(np.diff(time) < 0):
+            logging.warning("The age does not increase with the stage; time lookups may be inexact.")
+        self.stg = stg
+        self.time = time
+        self.time_to_end = time[-1] - time if time.size else time.copy()
+
+        self.profile_stg = self.catalog.stg
+        # prefer the history age of a profile; fall back to its header
+        self.profile_time = self.catalog.time.copy()
+        known = np.isin(self.profile_stg, stg)
+        self.profile_time[known] = time[np.searchsorted(stg, self.profile_stg[known])]
+
+    def __repr__(self) -> str:
+        return f"ModelIndex({self.stg.size} stages, {self.profile_stg.size} profiles)"
+
+    @staticmethod
+    def _nearest(arr: np.ndarray, x, descending: bool = False) -> np.ndarray:
+        if arr.size == 0:
+            raise ValueError("lookup: empty index")
+        idx, _ = find_nearest(arr, x, descending=descending)
+        return idx
+
+    def time_at_stage(self, stg) -> np.ndarray:
+        """Age of every stage in ``stg`` (NaN for stages not in the history)."""
+        stg = np.atleast_1d(np.asarray(stg, dtype=np.int64))
+        if self.stg.size == 0:
+            return np.full(stg.size, np.nan)
+        pos = np.searchsorted(self.stg, stg).clip(max=self.stg.size - 1)
+        return np.where(self.stg[pos] == stg, self.time[pos], np.nan)
+
+    def time_to_end_at_stage(self, stg) -> np.ndarray:
+        """Time until the last stage for every stage in ``stg``."""
+        return self.time[-1] - self.time_at_stage(stg) if self.time.size else self.time_at_stage(stg)
+
+    def stage_at_time(self, t) -> np.ndarray:
+        """Stage whose age is closest to every ``t``."""
+        return self.stg[self._nearest(self.time, t)]
+
+    def stage_at_time_to_end(self, dt) -> np.ndarray:
+        """Stage closest to every ``dt`` on the time-until-end axis."""
+        return self.stg[self._nearest(self.time_to_end, dt, descending=True)]
+
+    def profile_at_stage(self, stg) -> np.ndarray:
+        """Stage of the profile closest to every stage in ``stg``."""
+        return self.profile_stg[self._nearest(self.profile_stg, stg)]
+
+    def profile_at_time(self, t) -> np.ndarray:
+        """Stage of the profile whose age is closest to every ``t``."""
+        return self.profile_stg[self._nearest(self.profile_time, t)]
+
+    def profile_at_time_to_end(self, dt) -> np.ndarray:
+        """Stage of the profile closest to every ``dt`` on the time-until-end axis."""
+        if self.time.size == 0:
+            raise ValueError("lookup: empty index")
+        return self.profile_at_time(self.time[-1] - np.asarray(dt, dtype=float))
+
+    def profile_path(self, stg):
+        """Path of the profile of stage ``stg`` (a list for an array of stages)."""
+        if np.ndim(stg) == 0:
+            return self.catalog.path(int(stg))
+        return [self.catalog.path(int(s)) for s in np.asarray(stg).ravel()]
@@ -0,0 +1,296 @@
+"""Single-file container for the writestr profiles of a model.
+
+``pack_writestr`` converts the ``strXXXXX.txt`` files of a writestr directory
+into one ``writestr.pack`` file next to it. The container holds, for every
+profile, its decoded ``(ncols, nzones)`` float64 table (optionally compressed
+with ``zlib``, ``lzma`` or ``bz2``, one block per profile) and a JSON index
+with the header fields (stage, age, time step, number of zones, columns)
+and the byte offset of every block::
+
+    b"HOSHIPK1" | block 0 | block 1 | ... | index (JSON) | index offset (<Q) | b"HOSHIPK1"
+
+A profile is read by seeking to its block, so one stage is decoded without
+touching the others; uncompressed blocks are laid out column after column so
+a column subset reads only those columns.
+
+``HoshiProfile``, ``ProfileCatalog`` and the multi-profile readers built on
+them read from the container transparently: a profile found in the pack is
+served from it unless its text file has changed since it was packed.
+Compressed text profiles (``str02468.txt.gz``, ...) are packed under their
+plain name.
+"""
+
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import bz2
+import itertools
+import json
+import logging
+import lzma
+import os
+import struct
+import tempfile
+import zlib
+
+import numpy as np
+
+from .catalog import _PROFILE_NAME, read_profile_header
+from .compression import open_source, source_name, variant_rank
+from .hoshi_reader import HoshiModel, HoshiProfile, _frame_to_block
+
+PACK_SUFFIX = ".pack"
+PACK_MAGIC = b"HOSHIPK1"
+PACK_VERSION = 1
+
+_CODECS = {
+    "none": (lambda raw, level: raw, lambda raw: raw),
+    "zlib": (lambda raw, level: zlib.compress(raw, level), zlib.decompress),
+    "lzma": (lambda raw, level: lzma.compress(raw, preset=level), lzma.decompress),
+    "bz2": (lambda raw, level: bz2.compress(raw, max(level, 1)), bz2.decompress),
+}
+_TRAILER = struct.Struct("<Q8s")
+
+# open containers, keyed on path and file version
+_open_packs: dict = {}
+
+
+def pack_path(writestr_dir: str | Path) -> Path:
+    """Return the container path of a writestr directory (``writestr.pack`` next to it)."""
+    writestr_dir = Path(writestr_dir)
+    return writestr_dir.with_name(writestr_dir.name + PACK_SUFFIX)
+
+
+class ProfilePack:
+    """Read access to a ``writestr.pack`` container.
+
+    Attributes:
+        path: container file.
+        entries: per-profile dicts (``name``, ``stg``, ``ndv``, ``time``,
+            ``dtime``, ``columns``, ``header``, ``offset``, ``nbytes``,
+            ``codec``, ``shape`` and ``size``/``mtime_ns`` of the packed file).
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            if f.read(len(PACK_MAGIC)) != PACK_MAGIC:
+                raise ValueError(f"{self.path} is not a profile pack")
+            f.seek(-_TRAILER.size, os.SEEK_END)
+            end = f.tell()
+            offset, magic = _TRAILER.unpack(f.read(_TRAILER.size))
+            if magic != PACK_MAGIC or not len(PACK_MAGIC) <= offset <= end:
+                raise ValueError(f"{self.path} is truncated")
+            f.seek(offset)
+            index = json.loads(f.read(end - offset))
+        if index.get("version") != PACK_VERSION:
+            raise ValueError(f"{self.path} has unsupported version {index.get('version')}")
+        self.entries = index["entries"]
+        self._by_name = {e["name"]: e for e in self.entries}
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __contains__(self, name: str) -> bool:
+        return source_name(name) in self._by_name
+
+    def __repr__(self) -> str:
+        return f"ProfilePack({str(self.path)!r}, {len(self)} profiles)"
+
+    def entry(self, name: str) -> dict:
+        try:
+            return self._by_name[source_name(name)]
+        except KeyError:
+            raise KeyError(f"{name} is not in {self.path}") from None
+
+    def serves(self, path: Path) -> bool:
+        """True if the profile ``path`` should be read from the pack.
+
+        That is when it is packed and its text file is gone or unchanged.
+        """
+        entry = self._by_name.get(source_name(path))
+        if entry is None:
+            return False
+        try:
+            st = path.stat()
+        except OSError:
+            return True
+        return st.st_size == entry["size"] and st.st_mtime_ns == entry["mtime_ns"]
+
+    def read(self, name: str, usecols: list | None = None) -> np.ndarray:
+        """Return the ``(len(usecols), nzones)`` float block of one profile."""
+        entry = self.entry(name)
+        ncols, nrows = entry["shape"]
+        with open(self.path, "rb") as f:
+            if entry["codec"] == "none" and usecols is not None:
+                out = np.empty((len(usecols), nrows), dtype=np.float64)
+                for k, j in enumerate(usecols):
+                    f.seek(entry["offset"] + j * nrows * 8)
+                    out[k] = np.frombuffer(f.read(nrows * 8), dtype="<f8")
+                return out
+            f.seek(entry["offset"])
+            raw = f.read(entry["nbytes"])
+        block = np.frombuffer(_CODECS[entry["codec"]][1](raw), dtype="<f8").reshape(ncols, nrows)
+        return block[usecols] if usecols is not None else block.copy()
+
+
+def find_pack(writestr_dir: str | Path) -> ProfilePack | None:
+    """Return the container of a writestr directory, or None if there is none.
+
+    Open containers are reused until the file changes.
+    """
+    path = pack_path(writestr_dir)
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    key = (st.st_size, st.st_mtime_ns)
+    cached = _open_packs.get(path)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+    try:
+        pack = ProfilePack(path)
+    except (OSError, ValueError) as exc:
+        logging.warning(f"Ignoring profile pack {path}: {exc}")
+        return None
+    _open_packs[path] = (key, pack)
+    return pack
+
+
+def _encode_profile(path: Path) -> tuple:
+    """Decode one text profile; returns ``(header dict, block)`` (block None on failure)."""
+    header = read_profile_header(path)
+    with open_source(path, "r") as f:
+        lines = [f.readline() for _ in range(HoshiProfile._n_header_lines)]
+    header["header"] = lines[-1].rstrip("\r\n")
+    profile = HoshiProfile(path, int(_PROFILE_NAME.fullmatch(path.name).group(1)))
+    block = profile._block
+    if block is None and profile.dataframe is not None:
+        block = _frame_to_block(profile.dataframe)
+    return header, block
+
+
+def _pack_profile(path: Path, compress, level: int) -> tuple:
+    """Decode and compress one profile; returns ``(header, raw, shape)`` (raw None on failure)."""
+    header, block = _encode_profile(path)
+    if block is None:
+        return header, None, None
+    raw = compress(np.ascontiguousarray(block, dtype="<f8").tobytes(), level)
+    return header, raw, list(block.shape)
+
+
+def _writestr_files(writestr_dir: Path) -> list:
+    """Return the ``(stage, path)`` of every profile, one file per stage.
+
+    When a stage exists both plain and compressed the variant is chosen like
+    ``find_variant`` does: the plain file first, then the codecs in order.
+    """
+    best = {}
+    for name in os.listdir(writestr_dir):
+        m = _PROFILE_NAME.fullmatch(name)
+        if not m:
+            continue
+        stg, path = int(m.group(1)), writestr_dir / name
+        order = variant_rank(path)
+        if stg not in best or order < best[stg][0]:
+            best[stg] = (order, path)
+    return sorted((stg, path) for stg, (_, path) in best.items())
+
+
+def _write_profiles(f, files: list, codec: str, level: int, workers: int | None) -> tuple[list, list]:
+    """Compress ``files`` on a thread pool and append them to ``f`` in stage order.
+
+    A bounded window of profiles is in flight. Returns the index entries and
+    the paths of the packed files.
+    """
+    compress = _CODECS[codec][0]
+    workers = workers or min(32, (os.cpu_count() or 1) + 4)
+    entries, packed = [], []
+    todo = iter(files)
+    pending = deque()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for _, path in itertools.islice(todo, 2 * workers):
+            pending.append((path, pool.submit(_pack_profile, path, compress, level)))
+        try:
+            while pending:
+                path, future = pending.popleft()
+                header, raw, shape = future.result()
+                item = next(todo, None)
+                if item is not None:
+                    pending.append((item[1], pool.submit(_pack_profile, item[1], compress, level)))
+                if raw is None:
+                    logging.warning(f"{path.name} has non-numeric columns; leaving it out of the pack.")
+                    continue
+                st = path.stat()
+                header.update(
+                    name=source_name(path),
+                    offset=f.tell(),
+                    nbytes=len(raw),
+                    codec=codec,
+                    shape=shape,
+                    size=st.st_size,
+                    mtime_ns=st.st_mtime_ns,
+                )
+                f.write(raw)
+                entries.append(header)
+                packed.append(path)
+        finally:
+            # on failure, drop the profiles that have not started yet
+            for _, future in pending:
+                future.cancel()
+    return entries, packed
+
+
+def pack_writestr(
+    model,
+    out: str | Path | None = None,
+    codec: str = "zlib",
+    level: int = 6,
+    workers: int | None = None,
+    remove: bool = False,
+) -> Path:
+    """Pack the ``strXXXXX.txt`` profiles of a model into one container file.
+
+    Args:
+        model: a ``HoshiModel``, a model directory or a writestr directory.
+        out: container path (default: ``writestr.pack`` next to the directory).
+        codec: ``"none"``, ``"zlib"``, ``"lzma"`` or ``"bz2"`` (per profile).
+        level: compression level of the codec.
+        workers: threads used to decode and compress the profiles (at most
+            twice as many profiles are held in memory at a time).
+        remove: delete the text files once they are in the container.
+
+    Returns:
+        The path of the container. Profiles the fast parser cannot decode to
+        numbers are logged and left out (and kept on disk).
+    """
+    if codec not in _CODECS:
+        raise ValueError(f"Unknown codec {codec!r}; expected one of {list(_CODECS)}")
+    if isinstance(model, HoshiModel):
+        writestr_dir = model.writestr_dir
+    else:
+        p = Path(model)
+        writestr_dir = p if p.name == "writestr" else p / "writestr"
+    out = Path(out) if out is not None else pack_path(writestr_dir)
+    files = _writestr_files(writestr_dir)
+
+    tmp = tempfile.NamedTemporaryFile("wb", dir=out.parent, suffix=PACK_SUFFIX, delete=False)
+    try:
+        with tmp:
+            tmp.write(PACK_MAGIC)
+            entries, packed = _write_profiles(tmp, files, codec, level, workers)
+            index_offset = tmp.tell()
+            tmp.write(json.dumps({"version": PACK_VERSION, "entries": entries}).encode())
+            tmp.write(_TRAILER.pack(index_offset, PACK_MAGIC))
+        os.chmod(tmp.name, 0o644)
+        os.replace(tmp.name, out)
+    except BaseException:
+        # a failed or interrupted run must not leave a half-written pack behind
+        os.unlink(tmp.name)
+        raise
+    logging.info(f"Packed {len(entries)} profiles from {writestr_dir} into {out} ({out.stat().st_size / 1e6:.1f} MB).")
+
+    if remove:
+        for path in packed:
+            path.unlink()
+    return out
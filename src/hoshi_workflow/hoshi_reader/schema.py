@@ -0,0 +1,99 @@
+"""Column dtypes decided once per header and reused by ``coerce_dtypes``.
+
+Every run header of a ``summary.txt`` and every writestr header of a model
+is the same, so the type of each column only has to be inferred once.
+``coerce_dtypes`` records, per normalized header (the column names) and
+``min_convert_frac``, the decision it took for every column:
+
+* ``kind``: ``"int"`` (the integer columns ``stg``, ``jcma``, ``nmlo``,
+  ``ndv``), ``"float"`` or ``"str"``;
+* ``plain``: whether the column parsed with a plain ``float`` conversion,
+  i.e. without the Fortran rewriting of ``D`` exponents, missing ``E``,
+  thousands separators and placeholders.
+
+On later calls with the same header, numeric columns are decoded directly
+with the recorded method, cast to the recorded kind and only validated (the
+fraction of converted entries is checked against ``min_convert_frac``); a
+column that no longer validates is inferred again and its entry updated.
+Text columns are only cleaned, without decoding numbers; they are inferred
+again when an evenly spaced sample of the entries parses as numbers.
+
+The registry serves ``coerce_dtypes``, i.e. the ``read_csv`` paths
+(``engine="legacy"`` and the fallbacks of the fast engine). The fast engine
+decodes fixed-width blocks with ``parse_fixed_width`` and does not use it.
+"""
+
+import threading
+
+from .fixed_width import header_spans
+
+
+def normalize_header(header) -> tuple:
+    """Return the registry key of a header: its column names as a tuple.
+
+    Accepts a header line (``# 1:stg 2:jcma ...``) or a sequence of names.
+    """
+    if isinstance(header, str):
+        return tuple(header_spans(header)[0])
+    return tuple(str(name) for name in header)
+
+
+class SchemaRegistry:
+    """Per-header column decisions of ``coerce_dtypes``.
+
+    Attributes:
+        hits, misses: number of lookups that found / did not find a schema.
+    """
+
+    def __init__(self):
+        self._schemas = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._schemas)
+
+    def __repr__(self) -> str:
+        return f"SchemaRegistry({len(self)} headers, hits={self.hits}, misses={self.misses})"
+
+    def lookup(self, header, min_convert_frac: float = 0.99) -> dict | None:
+        """Return ``{column: (kind, plain)}`` for a header, or None if unknown."""
+        schema = self._schemas.get((normalize_header(header), min_convert_frac))
+        if schema is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return schema
+
+    def record(self, header, min_convert_frac: float, decisions: dict) -> None:
+        """Store (or update) the decisions of the columns of a header."""
+        key = (normalize_header(header), min_convert_frac)
+        with self._lock:
+            schema = dict(self._schemas.get(key, {}))
+            schema.update(decisions)
+            self._schemas[key] = schema
+
+    def clear(self) -> None:
+        with self._lock:
+            self._schemas = {}
+        self.hits = self.misses = 0
+
+
+# registry used by coerce_dtypes unless told otherwise
+default_registry = SchemaRegistry()
+
+
+def resolve_schema(schema) -> SchemaRegistry | None:
+    """Normalize a ``schema=`` argument to a registry or None.
+
+    ``True`` selects the module-wide ``default_registry``; ``False``/``None``
+    disables the registry; a ``SchemaRegistry`` is used as is.
+    """
+    if schema is None or schema is False:
+        return None
+    if schema is True:
+        return default_registry
+    if isinstance(schema, SchemaRegistry):
+        return schema
+    raise ValueError(f"schema must be a bool or a SchemaRegistry, got {schema!r}")
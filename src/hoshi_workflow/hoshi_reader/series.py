@@ -0,0 +1,214 @@
+"""Load many writestr profiles of a model at once.
+
+``iter_profiles`` streams the profiles one at a time with a bounded prefetch
+window, for reductions over more profiles than fit in memory.
+``HoshiProfileSeries`` decodes a selection of ``strXXXXX.txt`` profiles with a
+thread or process pool and packs the requested variables into one
+preallocated ``(stages, zones, variables)`` float array. Profiles with fewer
+zones than the largest one are padded with NaN and flagged in ``mask``.
+"""
+
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+import itertools
+import logging
+import time
+
+import numpy as np
+
+from .catalog import ProfileCatalog
+from .hoshi_reader import HoshiProfile, _frame_to_block
+
+
+def _load_profile_columns(path: Path, stg: int, columns: list, engine: str = "fast", cache=False):
+    """Decode ``columns`` of one profile; returns the ``(ncols, nzones)`` block.
+
+    Module-level so that it can run in a process pool.
+    """
+    profile = HoshiProfile(path, stg, columns=columns, engine=engine, cache=cache)
+    if profile._block is not None:
+        return np.stack([profile._block[profile._block_index[name]] for name in columns])
+    block = _frame_to_block(profile.dataframe[columns])
+    if block is None:
+        raise ValueError(f"{path.name} has non-numeric values in {columns}")
+    return block
+
+
+def _select_stages(catalog: ProfileCatalog, stages=None) -> np.ndarray:
+    """Return the catalog indices of ``stages`` (all profiles for None), sorted by stage."""
+    if stages is None:
+        return np.arange(len(catalog))
+    stages = np.unique(np.asarray(stages, dtype=np.int64))
+    if not len(catalog):
+        found = np.zeros(stages.size, dtype=bool)
+        sel = np.zeros(stages.size, dtype=np.int64)
+    else:
+        sel = np.searchsorted(catalog.stg, stages).clip(max=len(catalog) - 1)
+        found = catalog.stg[sel] == stages
+    if not found.all():
+        logging.warning(f"No profiles for stages {stages[~found].tolist()}; skipping them.")
+    return sel[found]
+
+
+def iter_profiles(
+    model,
+    stages=None,
+    columns: list | None = None,
+    prefetch: int = 4,
+    workers: int | None = None,
+    engine: str = "fast",
+    cache=False,
+    catalog: ProfileCatalog | None = None,
+):
+    """Yield the profiles of a model one at a time, in stage order.
+
+    The next ``prefetch`` profiles are decoded on a background thread pool
+    while the current one is processed, and no more than that are ever held,
+    so reductions over thousands of profiles run in constant memory (about
+    ``prefetch + 1`` profiles).
+
+    Args:
+        model: a ``HoshiModel``, model directory or writestr directory.
+        stages: stages to read (default: every profile of the catalog).
+        columns: variables to decode (default: all).
+        prefetch: number of profiles decoded ahead of the consumer.
+        workers: threads of the pool (default: ``prefetch``).
+        engine, cache: passed on to ``HoshiProfile``.
+        catalog: an existing ``ProfileCatalog`` of the model.
+
+    Yields:
+        ``(stg, HoshiProfile)`` pairs.
+    """
+    if prefetch < 0:
+        raise ValueError("prefetch must be >= 0")
+    catalog = catalog if catalog is not None else ProfileCatalog(model)
+    sel = iter(_select_stages(catalog, stages).tolist())
+
+    def load(i):
+        stg = int(catalog.stg[i])
+        return stg, HoshiProfile(catalog.writestr_dir / catalog.names[i], stg, columns=columns, engine=engine, cache=cache)
+
+    pending = deque()
+    with ThreadPoolExecutor(max_workers=workers or max(prefetch, 1)) as pool:
+        try:
+            for i in itertools.islice(sel, max(prefetch, 1)):
+                pending.append(pool.submit(load, i))
+            while pending:
+                item = pending.popleft().result()
+                i = next(sel, None) if prefetch else None
+                if i is not None:
+                    pending.append(pool.submit(load, i))
+                yield item
+                if not prefetch:
+                    i = next(sel, None)
+                    if i is not None:
+                        pending.append(pool.submit(load, i))
+        finally:
+            # the consumer stopped early: drop what has not started yet
+            for future in pending:
+                future.cancel()
+
+
+class HoshiProfileSeries:
+    """Profiles of several stages packed into one ``(stages, zones, vars)`` array.
+
+    Args:
+        model: a ``HoshiModel``, model directory or writestr directory.
+        stages: stages to load (default: every profile of the catalog). Stages
+            without a profile are logged and skipped.
+        columns: variables to load (default: all columns of the first profile).
+        workers: size of the pool.
+        executor: ``"thread"`` or ``"process"``.
+        engine: ``"fast"`` or ``"legacy"`` (see ``HoshiProfile``).
+        cache: ``cache=`` argument passed on to ``HoshiProfile``.
+        catalog: an existing ``ProfileCatalog`` of the model.
+
+    Attributes:
+        stages: loaded stages (sorted).
+        time: age of every loaded profile.
+        columns: variable names along the last axis of ``data``.
+        data: float array ``(n_stages, n_zones, n_vars)``, NaN beyond ``ndv``.
+        ndv: number of zones of every profile.
+        mask: boolean ``(n_stages, n_zones)`` array, True for existing zones.
+        stats: ``files``, ``bytes``, ``seconds``, ``files_per_s`` and ``mb_per_s``
+            of the load.
+    """
+
+    def __init__(
+        self,
+        model,
+        stages=None,
+        columns: list | None = None,
+        workers: int | None = None,
+        executor: str = "thread",
+        engine: str = "fast",
+        cache=False,
+        catalog: ProfileCatalog | None = None,
+    ):
+        if executor not in ("thread", "process"):
+            raise ValueError(f"Unknown executor {executor!r}; expected 'thread' or 'process'")
+        self.catalog = catalog if catalog is not None else ProfileCatalog(model, workers=workers)
+        cat = self.catalog
+
+        sel = _select_stages(cat, stages)
+        self.stages = cat.stg[sel]
+        self.time = cat.time[sel]
+        if columns is None:
+            columns = cat.schemas[cat.schema[sel[0]]] if sel.size else []
+        self.columns = list(columns)
+
+        paths = [cat.writestr_dir / cat.names[i] for i in sel]
+        n_zones = int(cat.ndv[sel].max()) if sel.size else 0
+        self.data = np.full((sel.size, max(n_zones, 0), len(self.columns)), np.nan)
+        self.ndv = np.zeros(sel.size, dtype=np.int64)
+
+        pool_cls = ThreadPoolExecutor if executor == "thread" else ProcessPoolExecutor
+        t0 = time.perf_counter()
+        with pool_cls(max_workers=workers) as pool:
+            futures = [
+                pool.submit(_load_profile_columns, path, int(stg), self.columns, engine, cache)
+                for path, stg in zip(paths, self.stages)
+            ]
+            for i, future in enumerate(futures):
+                self._store(i, future.result())
+                # release the decoded block once it has been copied
+                futures[i] = None
+        elapsed = time.perf_counter() - t0
+
+        n_bytes = int(cat.sizes[sel].sum())
+        self.mask = np.arange(self.data.shape[1]) < self.ndv[:, None]
+        self.stats = {
+            "files": len(paths),
+            "bytes": n_bytes,
+            "seconds": elapsed,
+            "files_per_s": len(paths) / elapsed if elapsed > 0 else float("inf"),
+            "mb_per_s": n_bytes / 1e6 / elapsed if elapsed > 0 else float("inf"),
+        }
+        logging.info(
+            f"Loaded {len(paths)} profiles ({n_bytes / 1e6:.1f} MB) in {elapsed:.2f} s: "
+            f"{self.stats['files_per_s']:.1f} files/s, {self.stats['mb_per_s']:.1f} MB/s"
+        )
+
+    def _store(self, i: int, block: np.ndarray) -> None:
+        n = block.shape[1]
+        if n > self.data.shape[1]:
+            # the metadata line announced fewer zones than the file holds
+            logging.warning(f"Stage {self.stages[i]} has {n} zones; growing the zone axis.")
+            grown = np.full((self.data.shape[0], n, self.data.shape[2]), np.nan)
+            grown[:, : self.data.shape[1]] = self.data
+            self.data = grown
+        self.data[i, :n, :] = block.T
+        self.ndv[i] = n
+
+    def __len__(self) -> int:
+        return self.stages.size
+
+    def __repr__(self) -> str:
+        return f"HoshiProfileSeries({len(self)} stages, {self.data.shape[1]} zones, columns={self.columns})"
+
+    def var(self, name: str) -> np.ndarray:
+        """Return the ``(n_stages, n_zones)`` array of one variable (a view)."""
+        if name not in self.columns:
+            raise ValueError(f"Unknown column {name!r}; loaded columns are {self.columns}")
+        return self.data[:, :, self.columns.index(name)]
@@ -2,7 +2,6 @@ import logging
 import re
 
 import numpy as np
-import pandas as pd
 
 # regular expression to parse isotope labels.
 # all isotope labels used in following are expected to be in the form "ElementSymbolMassNumber",
@@ -40,6 +39,8 @@ class Nomoto2013Yields:
         else:
             raise ValueError("mass must be int, float or str")
 
+        import pandas as pd  # deferred: only needed to read the yields table
+
         df = pd.read_csv(
             file_path,
             sep="\t",  # tab-separated, for tsv files
@@ -26,3 +26,36 @@ def test_hoshi_reader_imports():
     assert hasattr(mod, "HoshiHistory")
     assert hasattr(mod, "HoshiHistoryCombined")
     assert hasattr(mod, "HoshiProfile")
+
+
+def test_lazy_imports_skip_pandas_and_matplotlib():
+    # subpackages load on first access; parse_name needs neither pandas nor matplotlib
+    import subprocess
+    import sys
+
+    code = (
+        "import sys, hoshi_workflow as hw;"
+        "assert 'hoshi_workflow.hoshi_reader' not in sys.modules;"
+        "hw.parse_name;"
+        "assert 'pandas' not in sys.modules, 'pandas';"
+        "hw.hoshi_reader.HoshiHistory;"
+        "assert 'matplotlib' not in sys.modules, 'matplotlib';"
+        "assert 'hoshi_reader' in dir(hw);"
+        "assert sorted(hw.__all__) == sorted(hw._subpackages + list(hw._reexports))"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+def test_subpackage_import_errors_are_not_masked():
+    # a dependency missing inside a subpackage is reported as such
+    import subprocess
+    import sys
+
+    code = (
+        "import sys; sys.modules['pandas'] = None;"
+        "import hoshi_workflow as hw\n"
+        "try:\n    hw.hoshi_reader\n"
+        "except ImportError as exc:\n    assert exc.name == 'pandas', exc\n"
+        "else:\n    raise AssertionError('no ImportError')"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
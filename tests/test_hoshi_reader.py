@@ -1,6 +1,7 @@
 import importlib
 from pathlib import Path
 
+import numpy as np
 import pytest
 import pandas as pd
 
@@ -78,3 +79,747 @@ def test_hoshi_profile_read(example_model_dir):
     mass = profile.data("Mr")
 
 
+
+
+def test_history_run_index_single_scan(example_model_dir, tmp_path, monkeypatch):
+    """run index matches a line-by-line scan and is rebuilt when the file grows"""
+    src = example_model_dir / "summary" / "summary.txt"
+    summary = tmp_path / "summary" / "summary.txt"
+    summary.parent.mkdir()
+    summary.write_bytes(src.read_bytes())
+
+    # small chunks make header lines straddle chunk boundaries
+    monkeypatch.setattr(hr.HoshiHistory, "_scan_chunk_size", 97)
+    history = hr.HoshiHistory(summary)
+
+    lines = summary.read_text().splitlines()
+    header_lines = [i for i, line in enumerate(lines) if line.startswith("#")]
+    runs = history.list_runs()
+    assert [r["start_line"] for r in runs] == header_lines
+    assert runs[-1]["end_line"] == len(lines) - 1
+
+    with open(summary, "rb") as f:
+        for run in runs:
+            f.seek(run["header_byte"])
+            assert f.readline().startswith(b"#")
+
+    n_runs = history.count_runs()
+    last = history.read_run(n_runs)
+    with open(summary, "a") as f:
+        f.write(lines[header_lines[-1]] + "\n")
+        f.write(lines[-1] + "\n")
+    assert history.count_runs() == n_runs + 1
+    assert len(history.read_run(n_runs)) == len(last)
+    assert len(history.read_run(n_runs + 1)) == 1
+
+
+def test_fast_engine_matches_legacy(example_model_dir):
+    """fixed-width engine gives the same frames as the read_csv based reader"""
+    history = hr.HoshiHistory(example_model_dir / "summary")
+    for run_index in range(1, history.count_runs() + 1):
+        fast = history.read_run(run_index)
+        legacy = history.read_run(run_index, engine="legacy")
+        pd.testing.assert_frame_equal(fast, legacy, rtol=1e-15)
+
+    writestr = example_model_dir / "writestr"
+    fast = hr.HoshiProfile(writestr, 2468)
+    legacy = hr.HoshiProfile(writestr, 2468, engine="legacy")
+    pd.testing.assert_frame_equal(fast.dataframe, legacy.dataframe, rtol=1e-15)
+    assert len(fast.dataframe) == 1024 and fast.data("j")[0] == 1
+
+    quick = hr.HoshiProfile(writestr, 2468, quick=True)
+    assert quick.data("cv", dtype=int).dtype == np.int64
+    np.testing.assert_allclose(quick.data("Dens"), fast.data("Dens"), rtol=0)
+
+
+def test_fixed_width_fortran_numbers_and_fallback():
+    """Fortran exponents and blanks decode; misaligned records are rejected"""
+    from hoshi_workflow.hoshi_reader.fixed_width import (
+        FixedWidthError,
+        header_spans,
+        parse_fixed_width,
+    )
+
+    header = "# 1:stg      2:time    3:eta_B4:omgs[d-1]"
+    names, spans = header_spans(header)
+    assert names == ["stg", "time", "eta_B", "omgs[d-1]"]
+    assert spans[-1] == (30, 41)
+
+    rows = [
+        ("1", "1.500D+05", "1.0E+00", "2.000-105"),
+        ("2", "2.500E+05", "", "3.000E-01"),
+    ]
+    body = "".join(
+        "".join(v.rjust(stop - start) for v, (start, stop) in zip(row, spans)) + "\n"
+        for row in rows
+    )
+    block = parse_fixed_width(body.encode(), spans)
+    np.testing.assert_array_equal(block[0], [1, 2])
+    np.testing.assert_allclose(block[1], [1.5e5, 2.5e5])
+    assert block[2, 0] == 1.0 and np.isnan(block[2, 1])
+    np.testing.assert_allclose(block[3], [2.0e-105, 0.3])
+
+    with pytest.raises(FixedWidthError):
+        parse_fixed_width(b"      1  2.5000000000E+05 1.0 2.0\n", spans)
+
+
+def test_decode_numbers_and_coerce_dtypes():
+    """vectorized decoding handles Fortran spellings, placeholders and int columns"""
+    from hoshi_workflow.hoshi_reader.fixed_width import decode_numbers
+    from hoshi_workflow.hoshi_reader.hoshi_reader import coerce_dtypes
+
+    values, nonempty = decode_numbers(
+        np.array([b" 1.0D+05", b"1.0-105", b"   ", b"---", b"N/A", b"1,000", b"-2.5+03"])
+    )
+    np.testing.assert_allclose(values[[0, 1, 5, 6]], [1.0e5, 1.0e-105, 1000.0, -2500.0])
+    assert np.isnan(values[2:5]).all()
+    assert nonempty.tolist() == [True, True, False, False, False, True, True]
+
+    df = pd.DataFrame(
+        {
+            "stg": ["1", "", "3"],
+            "ndv": ["1024", "1024", "1024"],
+            "time": ["1.0d+00", "2.5-101", "NaN"],
+            "label": ["a", "b", "1"],
+        }
+    )
+    out = coerce_dtypes(df)
+    assert str(out["stg"].dtype) == "Int64" and out["stg"].isna().sum() == 1
+    assert out["ndv"].dtype == np.int64
+    np.testing.assert_allclose(out["time"].to_numpy()[:2], [1.0, 2.5e-101])
+    assert not pd.api.types.is_numeric_dtype(out["label"])
+
+
+def test_sidecar_cache_roundtrip_and_eviction(example_model_dir, tmp_path):
+    """cached blocks are reused, invalidated on change and evicted by size"""
+    writestr = tmp_path / "model" / "writestr"
+    writestr.mkdir(parents=True)
+    profile_path = writestr / "str02468.txt"
+    profile_path.write_bytes((example_model_dir / "writestr" / "str02468.txt").read_bytes())
+
+    cache = hr.SidecarCache(tmp_path / "cache")
+    first = hr.HoshiProfile(writestr, 2468, cache=cache)
+    array_path, meta_path = cache.entry_paths(profile_path)
+    assert array_path.exists() and meta_path.exists()
+
+    names, block = cache.load(profile_path)
+    assert names == first.var_names
+    assert isinstance(block, np.memmap) and block.shape == (len(names), 1024)
+
+    second = hr.HoshiProfile(writestr, 2468, cache=cache)
+    pd.testing.assert_frame_equal(first.dataframe, second.dataframe)
+    quick = hr.HoshiProfile(writestr, 2468, quick=True, cache=cache)
+    np.testing.assert_array_equal(quick.data("Temp"), first.data("Temp"))
+
+    # a modified source no longer matches its entry
+    with open(profile_path, "a") as f:
+        f.write("\n")
+    assert cache.load(profile_path) is None
+
+    # files the cache did not write are never evicted
+    foreign = [tmp_path / "cache" / name for name in ("mine.json", "mine.npy", ".profile_catalog.json")]
+    foreign[0].write_text('{"key": "x"}')
+    np.save(foreign[1], np.zeros(1000))
+    foreign[2].write_text("{}")
+    cache.evict(max_bytes=0)
+    assert not array_path.exists() and not meta_path.exists()
+    assert all(path.exists() for path in foreign)
+
+    # default location: a sidecar directory next to the profile
+    hr.HoshiProfile(writestr, 2468, cache=True)
+    assert (writestr / ".hoshi_cache" / "str02468.txt.npy").exists()
+
+
+def test_profile_data_returns_views_of_one_parse(example_model_dir, monkeypatch):
+    """quick-mode data() decodes the file once and returns read-only views"""
+    calls = []
+    parse = hr.HoshiProfile._parse_fast
+
+    def counting_parse(self, *args, **kwargs):
+        calls.append(args)
+        return parse(self, *args, **kwargs)
+
+    monkeypatch.setattr(hr.HoshiProfile, "_parse_fast", counting_parse)
+    profile = hr.HoshiProfile(example_model_dir / "writestr", 2468, quick=True)
+    species = [profile.data(f"X({el})") for el in ("p", "He", "C", "N", "O", "Ne", "Mg", "Si", "Fe")]
+    assert len(calls) == 1
+    assert all(not x.flags.writeable and x.base is not None for x in species)
+
+    full = hr.HoshiProfile(example_model_dir / "writestr", 2468)
+    dens = full.data("Dens")
+    assert np.shares_memory(dens, full.data("Dens"))
+    np.testing.assert_array_equal(dens, full.dataframe["Dens"].to_numpy())
+    assert full.data("j", dtype=int).dtype == np.int64
+
+
+def test_column_projection_and_batched_data(example_model_dir):
+    """columns= decodes only the projection and data() accepts a list of names"""
+    writestr = example_model_dir / "writestr"
+    full = hr.HoshiProfile(writestr, 2468)
+    names = ["Mr", "Dens", "Temp"]
+
+    for engine in ("fast", "legacy"):
+        proj = hr.HoshiProfile(writestr, 2468, columns=names, engine=engine)
+        assert list(proj.dataframe.columns) == names
+        pd.testing.assert_frame_equal(proj.dataframe, full.dataframe[names], rtol=1e-15)
+
+    quick = hr.HoshiProfile(writestr, 2468, quick=True)
+    batch = quick.data(names)
+    assert list(batch) == names
+    for name in names:
+        np.testing.assert_array_equal(batch[name], full.data(name))
+
+    rec = full.data(names, structured=True)
+    assert rec.dtype.names == tuple(names) and len(rec) == 1024
+    np.testing.assert_array_equal(rec["Temp"], full.data("Temp"))
+
+    # columns outside the projection are still readable on demand
+    proj = hr.HoshiProfile(writestr, 2468, columns=["Mr"])
+    np.testing.assert_array_equal(proj.data("Lum"), full.data("Lum"))
+    with pytest.raises(ValueError):
+        hr.HoshiProfile(writestr, 2468, columns=["not_a_column"])
+
+    history = hr.HoshiHistory(example_model_dir / "summary")
+    run = history.read_run(columns=["time", "stg"])
+    assert list(run.columns) == ["time", "stg"] and run["stg"].dtype == np.int64
+
+
+def test_stitch_runs_last_writer_wins():
+    """restarts supersede later stages of earlier runs; gaps/overlaps are arrays"""
+    stg = np.array([0, 1, 2, 3, 4, 5, 3, 4, 5, 6, 9, 10])
+    run_id = np.array([1, 1, 1, 1, 1, 1, 2, 2, 2, 2, 3, 3])
+    report = hr.stitch_runs(stg, run_id, start_stg=1)
+
+    np.testing.assert_array_equal(report["stg"], [1, 2, 3, 4, 5, 6, 9, 10])
+    np.testing.assert_array_equal(run_id[report["rows"]], [1, 1, 2, 2, 2, 2, 3, 3])
+    np.testing.assert_array_equal(report["missing"], [7, 8])
+    np.testing.assert_array_equal(report["overlap"], [3, 4, 5])
+    np.testing.assert_array_equal(report["runs"], [1, 2, 3])
+
+
+def test_generate_combined_matches_legacy_walk(example_model_dir):
+    """single-pass stitching reproduces the backward walk over the runs"""
+    history = hr.HoshiHistory(example_model_dir / "summary")
+    fast = history._generate_combined_data()
+    report = history.stitch_report
+    legacy = history._generate_combined_data(engine="legacy")
+
+    # the backward walk kept the superseded copy of the first restarted stage
+    legacy = legacy.drop_duplicates("stg", keep="last").reset_index(drop=True)
+    pd.testing.assert_frame_equal(fast, legacy, rtol=1e-15)
+    assert report["missing"].size == 0
+    assert report["runs"].tolist() == [7, 9]
+
+
+def test_update_combined_appends_and_rewinds(example_model_dir, tmp_path):
+    """incremental updates of a growing summary.txt match a full regeneration"""
+    source = (example_model_dir / "summary" / "summary.txt").read_bytes()
+    runs = hr.HoshiHistory(example_model_dir / "summary").list_runs()
+    summary = tmp_path / "summary" / "summary.txt"
+    summary.parent.mkdir()
+    cache = hr.SidecarCache()
+
+    # cut inside run 7 (mid-line), then append the restart at stage 2401
+    summary.write_bytes(source[: runs[6]["data_byte"] + 355 * 500 + 100])
+    assert hr.HoshiHistory(summary).update_combined(cache=cache)["mode"] == "full"
+    summary.write_bytes(source[: runs[8]["data_byte"] + 356 * 50])
+    report = hr.HoshiHistory(summary).update_combined(cache=cache)
+    assert report["mode"] == "append" and report["rows"] == 2450
+    summary.write_bytes(source)
+    assert hr.HoshiHistory(summary).update_combined(cache=cache)["appended"] == 84
+
+    combined = tmp_path / "summary" / "summary_combined.txt"
+    incremental = combined.read_bytes()
+    # the patched cache entry matches the updated file
+    names, block = cache.load(combined)
+    assert block.shape == (len(names), 2534)
+    hr.HoshiHistory(summary)._generate_combined_data(save_flag=True)
+    assert combined.read_bytes() == incremental
+
+    history = hr.HoshiHistoryCombined(tmp_path, incremental=True)
+    assert history.update_report["mode"] == "full"
+    assert history.refresh()["mode"] == "unchanged"
+    np.testing.assert_array_equal(history.data("stg"), np.arange(1, 2535))
+
+
+def test_follow_yields_appended_rows_runs_and_profiles(example_model_dir, tmp_path):
+    """polling decodes only new complete rows and reports new runs and profiles"""
+    source = (example_model_dir / "summary" / "summary.txt").read_bytes()
+    runs = hr.HoshiHistory(example_model_dir / "summary").list_runs()
+    summary = tmp_path / "summary" / "summary.txt"
+    summary.parent.mkdir()
+    (tmp_path / "writestr").mkdir()
+
+    # ten complete rows of run 7 plus a partially written one
+    summary.write_bytes(source[: runs[6]["data_byte"] + 356 * 10 + 5])
+    follower = hr.hoshi_reader._SummaryFollower(hr.HoshiHistory(tmp_path), profiles=True)
+    assert follower.poll() == []
+
+    summary.write_bytes(source[: runs[7]["end_byte"]])
+    profile = tmp_path / "writestr" / "str00100.txt"
+    profile.write_bytes((example_model_dir / "writestr" / "str02468.txt").read_bytes())
+    events = follower.poll()
+    assert [(e["kind"], e["run"]) for e in events] == [("rows", 7), ("run", 8), ("rows", 8)]
+    np.testing.assert_array_equal(events[0]["records"]["stg"], np.arange(11, 2469))
+    assert events[0]["records"].dtype["stg"] == np.int64
+    # the profile is reported once its size has settled
+    assert follower.poll() == [{"kind": "profile", "str_num": 100, "path": profile}]
+
+    summary.write_bytes(source)
+    kinds = [e["kind"] for e in hr.HoshiHistory(tmp_path).follow(interval=0, from_start=True, idle_timeout=0)]
+    assert kinds.count("run") == 9 and kinds.count("rows") == 9
+
+    # compressed summaries are archives: following them is refused
+    import gzip
+
+    summary.unlink()
+    (tmp_path / "summary" / "summary.txt.gz").write_bytes(gzip.compress(source))
+    with pytest.raises(ValueError, match="compressed"):
+        next(hr.HoshiHistory(tmp_path).follow(interval=0, idle_timeout=0))
+
+
+def test_random_access_rows_stages_and_zones(example_model_dir, tmp_path):
+    """seek-based range reads match slices of the fully decoded tables"""
+    history = hr.HoshiHistory(example_model_dir / "summary")
+    combined = history._generate_combined_data()
+    stages = history.read_stages(2390, 2410, columns=["time", "stg"])
+    expected = combined[(combined["stg"] >= 2390) & (combined["stg"] <= 2410)][["time", "stg"]]
+    pd.testing.assert_frame_equal(stages, expected.reset_index(drop=True))
+    pd.testing.assert_frame_equal(history.read_rows(-3, run_index=7), history.read_run(7).iloc[-3:].reset_index(drop=True))
+
+    profile = hr.HoshiProfile(example_model_dir / "writestr", 2468, quick=True)
+    loaded = hr.HoshiProfile(example_model_dir / "writestr", 2468)
+    zones = profile.read_zones(1, 50)
+    assert zones["j"].tolist() == list(range(1, 51))
+    pd.testing.assert_frame_equal(zones, loaded.dataframe.iloc[:50])
+    core = profile.read_mass_range(1.0, 2.0, columns=["Mr", "Temp"])
+    pd.testing.assert_frame_equal(core, loaded.read_mass_range(1.0, 2.0, columns=["Mr", "Temp"]))
+    assert core["Mr"].between(1.0, 2.0).all()
+
+    # lines of different widths go through the sparse line index
+    lines = [f"{i:>{1 + i % 5}d}\n".encode() for i in range(1000)]
+    path = tmp_path / "ragged.txt"
+    path.write_bytes(b"".join(lines))
+    locator = hr.hoshi_reader._RowLocator(path, 0, path.stat().st_size, stride=16)
+    with open(path, "rb") as f:
+        assert locator.nrows == 1000
+        assert locator.read(f, 100, 137) == b"".join(lines[100:137])
+        assert locator.search(f, (0, 5), 990) == 990
+
+    # a short and a long row that cancel out are not taken for a fixed-width layout
+    lines = [f"{i:6d}\n".encode() for i in range(1000)]
+    lines[40], lines[45] = b"    40\n"[1:], b"     45\n"
+    path.write_bytes(b"".join(lines))
+    locator = hr.hoshi_reader._RowLocator(path, 0, path.stat().st_size)
+    with open(path, "rb") as f:
+        assert locator.nrows == 1000
+        assert locator.read(f, 42, 44) == b"".join(lines[42:44])
+        assert locator.offsets is not None
+        assert locator.search(f, (0, 6), 43) == 43
+    # the sampled line ends catch the shifted rows when a sample falls among them
+    assert hr.hoshi_reader._RowLocator(path, 0, path.stat().st_size, stride=4).offsets is not None
+
+
+def test_profile_catalog_reads_headers_and_persists(example_model_dir, tmp_path):
+    """the catalog indexes profile headers and only rescans changed files"""
+    writestr = tmp_path / "writestr"
+    writestr.mkdir()
+    body = (example_model_dir / "writestr" / "str02468.txt").read_text().splitlines(keepends=True)
+    for stg, time in [(100, 1.5e13), (2468, 2.8321e14), (300, 4.0e13)]:
+        meta = f"# nstg= {stg:6d}  ndv= 1024 time= {time:12.4E} dtime=   1.0351E-01\n"
+        (writestr / f"str{stg:05d}.txt").write_text(meta + "".join(body[1:]))
+
+    catalog = hr.ProfileCatalog(hr.HoshiModel(tmp_path))
+    assert catalog.stg.tolist() == [100, 300, 2468]
+    assert catalog.ndv.tolist() == [1024] * 3 and len(catalog.schemas) == 1
+    assert catalog.nearest_time(3.0e13) == 300
+    assert catalog.between_stages(200, 2500).tolist() == [300, 2468]
+    assert catalog.between_stages(100, 300).tolist() == [100, 300]
+    assert catalog.between_stages(301, 2467).tolist() == [] and catalog.between_stages(500, 200).tolist() == []
+    assert catalog.path(2468) == writestr / "str02468.txt"
+    assert "Mr" in catalog.columns(100)
+
+    # the persisted index is reused; only new profiles are read
+    (writestr / "str00400.txt").write_text((writestr / "str00300.txt").read_text().replace("nstg=    300", "nstg=    400"))
+    again = hr.ProfileCatalog(tmp_path)
+    assert (writestr / ".profile_catalog.json").exists()
+    assert again.refresh() == 0 and again.stg.tolist() == [100, 300, 400, 2468]
+
+
+def test_profile_series_packs_stages_with_ndv_mask(example_model_dir, tmp_path):
+    """profiles with different zone counts are padded and masked"""
+    writestr = tmp_path / "writestr"
+    writestr.mkdir()
+    lines = (example_model_dir / "writestr" / "str02468.txt").read_text().splitlines(keepends=True)
+    for stg, ndv in [(100, 1000), (200, 1024)]:
+        meta = f"# nstg= {stg:6d}  ndv= {ndv:4d} time=   2.8321E+14 dtime=   1.0351E-01\n"
+        (writestr / f"str{stg:05d}.txt").write_text(meta + "".join(lines[1 : 3 + ndv]))
+
+    reference = hr.HoshiProfile(example_model_dir / "writestr", 2468)
+    for executor in ("thread", "process"):
+        series = hr.HoshiProfileSeries(tmp_path, columns=["Mr", "Temp"], executor=executor, workers=2)
+        assert series.data.shape == (2, 1024, 2)
+        assert series.ndv.tolist() == [1000, 1024] and series.mask.sum() == 2024
+        np.testing.assert_array_equal(series.var("Temp")[1], reference.data("Temp"))
+        np.testing.assert_array_equal(series.var("Mr")[0, :1000], reference.data("Mr")[:1000])
+        assert np.isnan(series.var("Mr")[0, 1000:]).all()
+        assert series.stats["files"] == 2 and series.stats["mb_per_s"] > 0
+
+
+def test_iter_profiles_streams_with_bounded_prefetch(example_model_dir, tmp_path):
+    """profiles are yielded in stage order and early exit stops the pool"""
+    writestr = tmp_path / "writestr"
+    writestr.mkdir()
+    text = (example_model_dir / "writestr" / "str02468.txt").read_text()
+    for stg in (30, 10, 20, 40):
+        (writestr / f"str{stg:05d}.txt").write_text(text.replace("nstg=   2468", f"nstg= {stg:6d}"))
+
+    seen = [(stg, p.data("Temp").max()) for stg, p in hr.iter_profiles(tmp_path, columns=["Temp"], prefetch=2)]
+    assert [stg for stg, _ in seen] == [10, 20, 30, 40]
+    assert all(t == seen[0][1] for _, t in seen)
+
+    stream = hr.iter_profiles(tmp_path, stages=[20, 40, 50], prefetch=0)
+    stg, profile = next(stream)
+    assert stg == 20 and list(profile.dataframe.columns) == profile.var_names
+    stream.close()
+
+
+def test_kippenhahn_raster_regrids_and_caches(example_model_dir, tmp_path, monkeypatch):
+    """columns show the nearest profile, regridded onto the mass grid"""
+    khd = importlib.import_module("hoshi_workflow.hoshi_reader.kippenhahn")
+
+    (tmp_path / "summary").mkdir()
+    (tmp_path / "summary" / "summary.txt").write_bytes((example_model_dir / "summary" / "summary.txt").read_bytes())
+    (tmp_path / "writestr").mkdir()
+    text = (example_model_dir / "writestr" / "str02468.txt").read_text()
+    for stg in (100, 1000):
+        (tmp_path / "writestr" / f"str{stg:05d}.txt").write_text(text.replace("nstg=   2468", f"nstg= {stg:6d}"))
+
+    history = hr.HoshiHistoryCombined(tmp_path, quick=True)
+    raster = hr.kippenhahn(history, variables=["entropy", "cv"], nx=20, ny=30, y_range=(0.0, 19.0), cache=True)
+    assert raster.values["entropy"].shape == (30, 20)
+    assert raster.stages[0] == 100 and raster.stages[-1] == 1000
+    profile = hr.HoshiProfile(tmp_path / "writestr", 100)
+    expected = np.interp(raster.y, profile.data("Mr"), profile.data("entropy"))
+    np.testing.assert_allclose(raster.values["entropy"][:, 0], expected, rtol=1e-12)
+    assert set(np.unique(raster.values["cv"])) <= set(np.unique(profile.data("cv")))
+
+    # a second call with the same arguments does not read the profiles
+    monkeypatch.setattr(khd, "HoshiProfileSeries", None)
+    again = hr.kippenhahn(history, variables=["entropy", "cv"], nx=20, ny=30, y_range=(0.0, 19.0), cache=True)
+    np.testing.assert_array_equal(again.values["entropy"], raster.values["entropy"])
+    assert again.extent == raster.extent
+
+
+def test_convective_zones_csr_and_core_mass(example_model_dir):
+    """runs of cv == 1 become CSR intervals with mass/radius boundaries"""
+    cv = np.array([[1, 1, 0, 1, 0], [0, 0, 0, 0, 0], [0, 1, 1, 1, 1]])
+    mass = np.tile(np.arange(1.0, 6.0), (3, 1))
+    zones = hr.ConvectiveZones.from_profiles([10, 20, 30], [1.0, 2.0, 3.0], cv, mass, mass * 10, ndv=[5, 5, 4])
+    assert zones.indptr.tolist() == [0, 2, 2, 3]
+    assert zones.zone_lo.tolist() == [0, 3, 1] and zones.zone_hi.tolist() == [2, 4, 4]
+    np.testing.assert_array_equal(zones.core_mass(), [2.0, 0.0, 0.0])
+    np.testing.assert_array_equal(zones.envelope_mass(), [0.0, 0.0, 3.0])
+    np.testing.assert_array_equal(zones.convective_mass(), [3.0, 0.0, 3.0])
+    assert zones.intervals(30)["r_bot"].tolist() == [10.0]
+
+    # against a zone-by-zone loop over a real profile
+    model = hr.ConvectiveZones.from_model(example_model_dir)
+    profile = hr.HoshiProfile(example_model_dir / "writestr", 2468)
+    flags = profile.data("cv") == 1
+    starts = [j for j in range(flags.size) if flags[j] and (j == 0 or not flags[j - 1])]
+    assert model.intervals(2468)["zone_lo"].tolist() == starts
+    np.testing.assert_array_equal(model.m_top, profile.data("Mr")[model.zone_hi - 1])
+
+
+def test_find_functions_accept_arrays_and_search_rows():
+    rng = np.random.default_rng(0)
+    a = np.sort(rng.uniform(0, 10, 50))
+    xs = rng.uniform(-1, 11, 200)
+    idx, values = hr.find_nearest(a, xs)
+    for i, x in enumerate(xs):
+        scalar_idx, _ = hr.find_nearest(a, x)
+        assert abs(a[idx[i]] - x) == abs(a[scalar_idx[0]] - x)
+    assert np.array_equal(values, a[idx])
+    idx_desc, _ = hr.find_nearest(a[::-1], xs, descending=True)
+    assert np.array_equal(a[::-1][idx_desc], a[idx])
+
+    idx, values = hr.find_first_greater(a, xs, strict=False)
+    expected = [a[a > x].min() if (a > x).any() else np.nan for x in xs]
+    assert np.allclose(values, expected, equal_nan=True)
+    assert np.all(idx[np.isnan(values)] == -1)
+    with pytest.raises(ValueError):
+        hr.find_first_greater(a, xs)
+    _, values = hr.find_first_less(a[::-1], xs, strict=False)
+    expected = [a[a < x].max() if (a < x).any() else np.nan for x in xs]
+    assert np.allclose(values, expected, equal_nan=True)
+
+    # rows of different direction and valid length, padded with NaN
+    mat = np.full((3, 50), np.nan)
+    mat[0] = a
+    mat[1, :30] = a[:30][::-1]
+    mat[2, :10] = a[:10]
+    ndv = np.array([50, 30, 10])
+    x = np.array([5.0, 2.0, 100.0])
+    idx, values = hr.find_nearest_rows(mat, x, ndv=ndv)
+    for r in range(3):
+        row = mat[r, : ndv[r]]
+        assert values[r] == row[np.argmin(np.abs(row - x[r]))]
+    _, greater = hr.find_first_greater_rows(mat, x, ndv=ndv)
+    _, less = hr.find_first_less_rows(mat, x, ndv=ndv)
+    for r in range(3):
+        row = mat[r, : ndv[r]]
+        assert np.allclose(greater[r], row[row > x[r]].min() if (row > x[r]).any() else np.nan, equal_nan=True)
+        assert less[r] == row[row < x[r]].max()
+
+
+def test_model_lookup_converts_time_stage_and_profiles(example_model_dir):
+    model = hr.HoshiModel(example_model_dir)
+    index = model.lookup()
+    assert model.lookup() is index
+    history = hr.HoshiHistoryCombined(example_model_dir, quick=True)
+    stg, time = history.data("stg"), history.data("time")
+
+    picks = np.array([0, 100, 1500, stg.size - 1])
+    assert np.array_equal(index.time_at_stage(stg[picks]), time[picks])
+    assert np.isnan(index.time_at_stage(10**6)[0])
+    found = index.stage_at_time(time[picks])
+    assert np.array_equal(index.time_at_stage(found), time[picks])
+    dt = time[-1] - time[picks]
+    assert np.array_equal(index.time_to_end_at_stage(index.stage_at_time_to_end(dt)), dt)
+
+    assert index.profile_at_stage([1, 5000]).tolist() == [2468, 2468]
+    assert index.profile_at_time_to_end(0.0)[0] == 2468
+    assert index.profile_path(2468).name == "str02468.txt"
+
+
+def test_combined_writer_matches_savetxt_and_binary_roundtrip(example_model_dir, tmp_path):
+    """the column-wise writer reproduces np.savetxt; summary_combined.npy reloads the table"""
+    import io
+    from hoshi_workflow.hoshi_reader.fixed_width import format_fixed_width
+
+    rng = np.random.default_rng(3)
+    ints = rng.integers(-99999, 999999, 5000)
+    floats = rng.normal(size=5000) * 10.0 ** rng.integers(-150, 150, 5000)
+    floats[:9] = [0.0, -0.0, np.nan, np.inf, -np.inf, 1.2345675, 9.9999995, 1e-310, 1e100]
+    expected = io.StringIO()
+    np.savetxt(expected, np.column_stack([ints, floats]), fmt=["%7d", "%15.6e"])
+    assert format_fixed_width([ints, floats], ["%7d", "%15.6e"]) == expected.getvalue().encode()
+    assert format_fixed_width([np.array([12345678])], ["%7d"]) is None
+
+    summary = tmp_path / "summary" / "summary.txt"
+    summary.parent.mkdir()
+    summary.write_bytes((example_model_dir / "summary" / "summary.txt").read_bytes())
+    history = hr.HoshiHistoryCombined(tmp_path, save_flag=True, binary=True)
+    df, fmt_list, header = hr.hoshi_reader._combined_formats(history.dataframe.copy())
+    expected = io.StringIO()
+    expected.write(header + "\n")
+    np.savetxt(expected, df.to_numpy(), fmt=fmt_list)
+    assert (tmp_path / "summary" / "summary_combined.txt").read_bytes() == expected.getvalue().encode()
+
+    assert history.binary_path.exists()
+    reloaded = hr.HoshiHistoryCombined(tmp_path, binary=True)
+    pd.testing.assert_frame_equal(reloaded.dataframe, history.dataframe)
+    assert reloaded.dataframe["stg"].dtype == np.int64
+
+
+def test_format_fixed_width_fields_without_spare_column():
+    """HOSHI-style ES fields with no leading blank are written column-wise unless a value overflows"""
+    import io
+    from hoshi_workflow.hoshi_reader.fixed_width import format_fixed_width
+
+    rng = np.random.default_rng(5)
+    floats = rng.normal(size=2000) * 10.0 ** rng.integers(-95, 96, 2000)
+    # 1e100 needs the whole field, NaN/inf and the rounding ties go through Python
+    floats[:6] = [1e100, -1.0, np.nan, -np.inf, 9.9999995, -0.0]
+    for fmt in ("%13.6e", "%14.6e"):
+        expected = io.StringIO()
+        np.savetxt(expected, floats[:, None], fmt=fmt)
+        assert format_fixed_width([floats], [fmt]) == expected.getvalue().encode()
+    # a negative value with a 3-digit exponent does not fit 13 characters
+    assert format_fixed_width([np.array([1.0, -1e100])], ["%13.6e"]) is None
+    assert format_fixed_width([np.array([-1e100])], ["%14.6e"]) is not None
+
+
+@pytest.mark.parametrize("codec", ["none", "zlib"])
+def test_pack_writestr_is_read_transparently(example_model_dir, tmp_path, codec):
+    """profiles are served from writestr.pack once the text files are gone"""
+    writestr = tmp_path / "writestr"
+    writestr.mkdir()
+    (tmp_path / "evol").mkdir()
+    text = (example_model_dir / "writestr" / "str02468.txt").read_bytes()
+    (writestr / "str02468.txt").write_bytes(text)
+    (writestr / "str02470.txt").write_bytes(text.replace(b"nstg=   2468", b"nstg=   2470"))
+    expected = hr.HoshiProfile(writestr, 2468).dataframe
+    zones = hr.HoshiProfile(writestr, 2468).read_zones(10, 20, columns=["j", "Mr"])
+
+    path = hr.pack_writestr(tmp_path, codec=codec, remove=True)
+    assert path == tmp_path / "writestr.pack"
+    assert not list(writestr.glob("str*.txt"))
+    assert len(hr.ProfilePack(path)) == 2
+
+    profile = hr.HoshiProfile(writestr, 2468)
+    pd.testing.assert_frame_equal(profile.dataframe, expected)
+    quick = hr.HoshiProfile(tmp_path, 2468, quick=True)
+    assert np.array_equal(quick.data("Mr"), expected["Mr"].to_numpy())
+    pd.testing.assert_frame_equal(quick.read_zones(10, 20, columns=["j", "Mr"]), zones)
+
+    catalog = hr.ProfileCatalog(tmp_path)
+    assert catalog.stg.tolist() == [2468, 2470]
+    series = hr.HoshiProfileSeries(tmp_path, columns=["Mr"], catalog=catalog)
+    assert np.array_equal(series.var("Mr")[1, : series.ndv[1]], expected["Mr"].to_numpy())
+
+    # a text file written after packing takes precedence
+    (writestr / "str02470.txt").write_bytes(text.replace(b"nstg=   2468", b"nstg=  2470 "))
+    assert hr.HoshiProfile(writestr, 2470)._pack is None
+    assert hr.HoshiProfile(writestr, 2468)._pack is not None
+
+    # a stage present plain and compressed is packed once, from the plain file
+    import gzip
+
+    (writestr / "str02470.txt.gz").write_bytes(gzip.compress(b"not a profile"))
+    path = hr.pack_writestr(writestr, codec=codec, workers=1)
+    entries = hr.ProfilePack(path).entries
+    assert [e["name"] for e in entries] == ["str02470.txt"]
+    assert entries[0]["stg"] == 2470
+
+    # a failed run leaves the previous pack and no partial file behind
+    (writestr / "str02472.txt").write_bytes(b"\xff" * 10)
+    (writestr / "str02470.txt.gz").unlink()
+    with pytest.raises(Exception):
+        hr.pack_writestr(writestr, codec=codec, workers=1)
+    assert sorted(p.name for p in tmp_path.iterdir() if p.suffix == ".pack") == ["writestr.pack"]
+    assert len(hr.ProfilePack(path)) == 1
+
+
+def test_compressed_outputs_are_read_transparently(example_model_dir, tmp_path):
+    """summary.txt.gz and strXXXXX.txt.xz are found and decoded like the plain files"""
+    import gzip
+    import lzma
+
+    summary = (example_model_dir / "summary" / "summary.txt").read_bytes()
+    profile = (example_model_dir / "writestr" / "str02468.txt").read_bytes()
+    (tmp_path / "summary").mkdir()
+    (tmp_path / "writestr").mkdir()
+    (tmp_path / "evol").mkdir()
+    (tmp_path / "summary" / "summary.txt.gz").write_bytes(gzip.compress(summary))
+    (tmp_path / "writestr" / "str02468.txt.xz").write_bytes(lzma.compress(profile))
+
+    plain = hr.HoshiHistory(example_model_dir / "summary")
+    history = hr.HoshiHistory(tmp_path)
+    assert history.data_path.name == "summary.txt.gz"
+    assert history.list_runs() == plain.list_runs()
+    pd.testing.assert_frame_equal(history.read_run(7), plain.read_run(7))
+    pd.testing.assert_frame_equal(history.read_rows(100, 110, run_index=7), plain.read_rows(100, 110, run_index=7))
+
+    expected = plain._generate_combined_data()
+    combined = hr.HoshiHistoryCombined(tmp_path)
+    pd.testing.assert_frame_equal(combined.dataframe, expected)
+    assert hr.HoshiHistory(tmp_path).update_combined()["mode"] == "full"
+    assert hr.HoshiHistory(tmp_path).update_combined()["mode"] == "unchanged"
+
+    reference = hr.HoshiProfile(example_model_dir / "writestr", 2468)
+    packed = hr.HoshiProfile(tmp_path, 2468)
+    assert packed.data_path.name == "str02468.txt.xz"
+    pd.testing.assert_frame_equal(packed.dataframe, reference.dataframe)
+    pd.testing.assert_frame_equal(packed.read_zones(5, 9), reference.read_zones(5, 9))
+    assert hr.ProfileCatalog(tmp_path, persist=False).stg.tolist() == [2468]
+    # a plain file next to its compressed copy is catalogued once, as the plain file
+    (tmp_path / "writestr" / "str02468.txt").write_bytes(profile)
+    (tmp_path / "writestr" / "str02468.txt.gz").write_bytes(gzip.compress(profile))
+    catalog = hr.ProfileCatalog(tmp_path, persist=False)
+    assert catalog.stg.tolist() == [2468]
+    assert catalog.path(2468) == tmp_path / "writestr" / "str02468.txt"
+    assert hr.HoshiProfileSeries(tmp_path, columns=["Mr"]).data.shape[0] == 1
+
+    results = hr.benchmark_codecs(example_model_dir / "writestr" / "str02468.txt", repeat=1)
+    assert [r["codec"] for r in results] == ["plain", ".gz", ".xz", ".bz2"]
+    assert all(r["ratio"] > 1 for r in results[1:])
+
+
+def test_instrument_records_reader_phases(example_model_dir, monkeypatch, caplog):
+    """phases are recorded (nested, with bytes/rows/peaks) only while instrumentation is on"""
+    import logging
+
+    history = hr.HoshiHistory(example_model_dir / "summary")
+    with caplog.at_level(logging.DEBUG), hr.instrument() as report:
+        history.read_run(7, engine="legacy")
+    phases = {rec["phase"]: rec for rec in report.records}
+    assert {"HoshiHistory.read_run", "scan_runs", "read", "read_csv", "coerce_dtypes"} <= set(phases)
+    top = phases["HoshiHistory.read_run"]
+    assert top["depth"] == 0 and top["rows"] == phases["read_csv"]["rows"] > 0
+    assert phases["read_csv"]["parent"] == "HoshiHistory.read_run"
+    assert phases["read"]["bytes"] == phases["read_csv"]["bytes"] > 0
+    assert top["peak_bytes"] >= phases["coerce_dtypes"]["peak_bytes"] > 0
+    assert report.summary()["read_csv"]["calls"] == 1
+    assert "coerce_dtypes" in str(report)
+    assert any("[instrument]" in r.message and "read_csv" in r.message for r in caplog.records)
+
+    hr.HoshiProfile(example_model_dir / "writestr", 2468)
+    assert len(report) == len(phases)
+
+    monkeypatch.setenv("HOSHI_INSTRUMENT", "time")
+    hr.HoshiProfile(example_model_dir / "writestr", 2468)
+    env = hr.environment_report()
+    assert [rec["phase"] for rec in env.records][-1] == "HoshiProfile"
+    assert all(rec["peak_bytes"] is None for rec in env.records)
+
+
+def test_schema_registry_reuses_column_decisions(example_model_dir, monkeypatch):
+    """coerce_dtypes decides column types once per header and re-infers columns that change"""
+    from hoshi_workflow.hoshi_reader.hoshi_reader import coerce_dtypes
+
+    registry = hr.SchemaRegistry()
+    df = pd.DataFrame({"stg": ["1", "2"], "time": ["1.0D+00", "2.5-101"], "Teff": ["3.5E+03", "nan"], "label": ["a", "b"]})
+    first = coerce_dtypes(df, schema=registry)
+    assert registry.lookup(df.columns) == {
+        "stg": ("int", True),
+        "time": ("float", False),
+        "Teff": ("float", True),
+        "label": ("str", False),
+    }
+    second = coerce_dtypes(df, schema=registry)
+    assert registry.hits == 2 and registry.misses == 1
+    pd.testing.assert_frame_equal(first, second)
+    pd.testing.assert_frame_equal(first, coerce_dtypes(df, schema=False))
+
+    # a known text column is only cleaned: the numeric decoding is skipped
+    real_decode = hr.hoshi_reader._decode
+    monkeypatch.setattr(hr.hoshi_reader, "_decode", lambda *a, **k: pytest.fail("text column decoded"))
+    pd.testing.assert_frame_equal(coerce_dtypes(df, schema=registry), first)
+    monkeypatch.setattr(hr.hoshi_reader, "_decode", real_decode)
+
+    changed = df.assign(Teff=["x", "y"], label=["1", "2"])
+    out = coerce_dtypes(changed, schema=registry)
+    assert not pd.api.types.is_numeric_dtype(out["Teff"]) and out["label"].tolist() == [1.0, 2.0]
+    assert registry.lookup(df.columns)["Teff"] == ("str", False)
+
+    history = hr.HoshiHistory(example_model_dir / "summary")
+    legacy = [history.read_run(i, engine="legacy") for i in (1, 2)]
+    assert importlib.import_module("hoshi_workflow.hoshi_reader.schema").default_registry.lookup(history.var_names)
+    pd.testing.assert_frame_equal(legacy[1], history.read_run(2))
+
+
+def test_header_tokenizer_anchors_on_column_markers(tmp_path):
+    """names ending in digits or running together keep their columns and spans"""
+    from hoshi_workflow.hoshi_reader.fixed_width import header_spans
+
+    header = "#    1:stg       2:Lnu23:eta_B4:omgs[d-1]"
+    names, spans = header_spans(header)
+    assert names == ["stg", "Lnu2", "eta_B", "omgs[d-1]"]
+    assert spans == [(0, 10), (10, 23), (23, 30), (30, 41)]
+    assert header_spans("#   a   b  c") == (["a", "b", "c"], [(0, 5), (5, 9), (9, 12)])
+
+    summary = tmp_path / "summary" / "summary.txt"
+    summary.parent.mkdir()
+    header = "#    1:stg       2:Lnu2 3:eta_B4:omgs[d-1]"
+    rows = "".join(f"{s:7d}{s * 1.5:11.3E}{-s:7.1f}{s * 0.1:11.3E}\n" for s in range(1, 4))
+    summary.write_text(header + "\n" + rows)
+    history = hr.HoshiHistory(summary)
+    assert history.var_names == ["stg", "Lnu2", "eta_B", "omgs[d-1]"]
+    np.testing.assert_allclose(history.read_run(1)["omgs[d-1]"], [0.1, 0.2, 0.3])
+    pd.testing.assert_frame_equal(history.read_run(1), history.read_run(1, engine="legacy"))
+
+    combined = hr.HoshiHistoryCombined(summary, quick=True)
+    assert combined._var_index == {"stg": 0, "Lnu2": 1, "eta_B": 2, "omgs[d-1]": 3}
+    np.testing.assert_allclose(combined.data("Lnu2"), [1.5, 3.0, 4.5])